@@ -7,24 +7,309 @@ Supports business hours vs personal hours patterns
 
 import sys
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-
-# Try to use zoneinfo (Python 3.9+), fall back to pytz if needed
-try:
-    from zoneinfo import ZoneInfo
-    HAS_ZONEINFO = True
-except ImportError:
+import gzip
+import os
+import random
+import hashlib
+import importlib.util
+import calendar
+import queue
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from bisect import bisect_right
+from itertools import accumulate, groupby, islice
+from typing import Any, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Timezone lookups live in scripts/time_core.py beside this file, loaded by path on first use
+TIME_CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "time_core.py")
+
+# NumPy is optional; bulk generation falls back to the random module without it.
+# It is imported inside the functions that use it, so runs that never reach them skip its import cost.
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+AMOUNT_VARIANCE = 0.3
+BUSINESS_SHARE = 0.7
+# Hours used when a day has no business or personal hours (6 AM - 11 PM inclusive)
+FALLBACK_HOURS = (6, 24)
+
+# Transaction categories, mirroring convex/mock_data.ts
+BUSINESS_CATEGORIES = (
+    {"name": "Revenue", "merchants": ("Client Payment", "Invoice Payment", "Service Revenue"), "avgAmount": 2500, "isIncome": True},
+    {"name": "Service Revenue", "merchants": ("Consulting Fee", "Project Payment", "Retainer"), "avgAmount": 1500, "isIncome": True},
+    {"name": "Product Sales", "merchants": ("Product Sale", "Online Sale", "Wholesale"), "avgAmount": 500, "isIncome": True},
+    {"name": "Office Supplies", "merchants": ("Staples", "Office Depot", "Amazon Business"), "avgAmount": 75, "isIncome": False},
+    {"name": "Software & Subscriptions", "merchants": ("Adobe", "Microsoft", "Slack", "Zoom"), "avgAmount": 120, "isIncome": False},
+    {"name": "Marketing & Advertising", "merchants": ("Google Ads", "Facebook Ads", "LinkedIn Ads"), "avgAmount": 500, "isIncome": False},
+    {"name": "Meals & Entertainment", "merchants": ("Restaurant", "Catering", "Client Dinner"), "avgAmount": 85, "isIncome": False},
+    {"name": "Travel", "merchants": ("Airline", "Hotel", "Uber Business"), "avgAmount": 350, "isIncome": False},
+    {"name": "Professional Services", "merchants": ("Legal Services", "Accounting", "Consulting"), "avgAmount": 400, "isIncome": False},
+    {"name": "Rent", "merchants": ("Office Rent", "Co-working Space"), "avgAmount": 2000, "isIncome": False},
+    {"name": "Utilities", "merchants": ("Electric", "Internet", "Phone"), "avgAmount": 200, "isIncome": False},
+    {"name": "Insurance", "merchants": ("Business Insurance", "Liability Insurance"), "avgAmount": 300, "isIncome": False},
+)
+
+PERSONAL_CATEGORIES = (
+    {"name": "Salary", "merchants": ("Payroll Deposit", "Direct Deposit", "Salary"), "avgAmount": 4500, "isIncome": True},
+    {"name": "Other Income", "merchants": ("Freelance", "Side Hustle", "Investment"), "avgAmount": 500, "isIncome": True},
+    {"name": "Groceries", "merchants": ("Whole Foods", "Trader Joe's", "Safeway", "Kroger"), "avgAmount": 85, "isIncome": False},
+    {"name": "Restaurants", "merchants": ("Chipotle", "Starbucks", "McDonald's", "Subway"), "avgAmount": 28, "isIncome": False},
+    {"name": "Gas", "merchants": ("Shell", "Chevron", "BP", "Exxon"), "avgAmount": 55, "isIncome": False},
+    {"name": "Entertainment", "merchants": ("Netflix", "Spotify", "AMC Theaters", "iTunes"), "avgAmount": 40, "isIncome": False},
+    {"name": "Shopping", "merchants": ("Amazon", "Target", "Walmart", "Costco"), "avgAmount": 130, "isIncome": False},
+    {"name": "Utilities", "merchants": ("PG&E", "Comcast", "AT&T", "Water District"), "avgAmount": 160, "isIncome": False},
+    {"name": "Healthcare", "merchants": ("CVS Pharmacy", "Walgreens", "Kaiser", "LabCorp"), "avgAmount": 90, "isIncome": False},
+    {"name": "Transportation", "merchants": ("Uber", "Lyft", "BART", "Parking"), "avgAmount": 35, "isIncome": False},
+)
+
+# Arrival profiles: relative intensity per local hour (24 weights) for business and personal
+# transactions, optionally per weekday, and relative daily volume Mon-Sun. Hours outside a
+# day's business/personal hours never get transactions, whatever their weight.
+_LUNCH_EVENING = (0, 0, 0, 0, 0, 0, 0.3, 0.6, 0.9, 0.8, 0.8, 1.2, 2.0, 1.6, 0.9, 0.8, 0.9, 1.3, 1.8, 2.0, 1.5, 0.9, 0.5, 0)
+_LATE_WEEKEND = (0, 0, 0, 0, 0, 0, 0.1, 0.2, 0.4, 0.8, 1.2, 1.5, 1.8, 1.8, 1.6, 1.5, 1.5, 1.6, 1.8, 1.9, 1.7, 1.3, 0.8, 0)
+ARRIVAL_PROFILES = {
+    # The classic pattern: 70% business hours on weekdays, hours uniform within each pool
+    "uniform": {"businessShare": BUSINESS_SHARE},
+    "peaks": {
+        "businessShare": BUSINESS_SHARE,
+        "business": (0, 0, 0, 0, 0, 0, 0, 0, 0, 0.9, 1.2, 1.3, 0.8, 1.0, 1.2, 1.1, 0.7, 0, 0, 0, 0, 0, 0, 0),
+        "personal": _LUNCH_EVENING,
+        "days": (1.0, 1.0, 1.0, 1.05, 1.2, 0.9, 0.7),
+    },
+    "weekend": {
+        "businessShare": 0.5,
+        "personal": {"weekday": _LUNCH_EVENING, "weekend": _LATE_WEEKEND},
+        "days": (0.8, 0.8, 0.8, 0.9, 1.1, 1.6, 1.4),
+    },
+}
+DEFAULT_ARRIVAL_PROFILE = "uniform"
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+# Outcomes of one arrival draw: business, personal and fallback pools times 24 hours
+ARRIVAL_POOLS = 3
+ARRIVAL_OUTCOMES = ARRIVAL_POOLS * 24
+# Day weights are kept as integers so rows split across runs exactly
+DAY_WEIGHT_SCALE = 1000
+# Per-day alias tables kept for generate_transaction_times: (profile, type, day pattern) keys
+ARRIVAL_TABLE_CACHE_SIZE = 256
+
+# Streaming output: transactions generated per run of days, lines written in batches
+STREAM_CHUNK_ROWS = 1 << 18
+WRITE_BATCH_LINES = 1 << 14
+GZIP_LEVEL = 6
+# Joined batches queued per writer thread; bounds memory when disk or compression lags
+WRITER_QUEUE_BATCHES = 8
+# Shard tasks queued per worker process; bounds memory while keeping workers busy
+SHARDS_IN_FLIGHT = 4
+
+TRANSACTION_COLUMNS = ("amount", "date", "dateTimestamp", "merchant", "category", "isBusiness", "transactionType")
+
+
+# Hour pools shared by every day record instead of rebuilt per day
+BUSINESS_HOURS = tuple(range(9, 17))   # 9 AM - 5 PM
+PERSONAL_HOURS = tuple(range(6, 23))   # 6 AM - 11 PM
+NO_HOURS = ()
+
+# Calendar tables kept in memory per process, and on disk when this variable names a directory
+CALENDAR_CACHE_ENV = "MOCK_CALENDAR_CACHE"
+CALENDAR_CACHE_VERSION = 1
+CALENDAR_MEMO_SIZE = 64
+
+
+@lru_cache(maxsize=None)
+def _time_core():
+    """scripts/time_core.py, loaded on the first timezone lookup"""
+    spec = importlib.util.spec_from_file_location("time_core", TIME_CORE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _local_epoch_ms(day: date, hour: int, tz) -> int:
+    """Epoch milliseconds of a local wall-clock hour"""
+    return int(_time_core().localize(datetime(day.year, day.month, day.day, hour), tz).timestamp() * 1000)
+
+
+def _shift_months(day: date, months: int) -> date:
+    """The same day of the month, months calendar months earlier (clamped to the month's length)"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+class CalendarTable:
+    """
+    Local calendar of a range of days, built once per (timezone, start, end).
+
+    Columns are tuples indexed by day: "YYYY-MM-DD" keys, weekdays and the
+    epoch milliseconds of the 24 wall-clock hours. bounds holds each day's
+    local midnight plus the midnight after the last day, so DST days are
+    23 or 25 hours long and timestamps map to days and calendar months by
+    bisect. Only days whose length is not 24 hours need datetime
+    arithmetic; the hours of every other day are midnight + n * HOUR_MS.
+    """
+
+    def __init__(self, timezone_name: Optional[str], start_day: date, bounds: Sequence[int], dst_slots: Dict[int, Sequence[int]]):
+        self.timezone = timezone_name
+        self.bounds = tuple(bounds)
+        first = start_day.toordinal()
+        self.first_ordinal = first
+        self.days = tuple(date.fromordinal(first + i).isoformat() for i in range(len(self.bounds) - 1))
+        self.weekdays = tuple((start_day.weekday() + i) % 7 for i in range(len(self.days)))
+        self.dst_slots = {int(i): tuple(slots) for i, slots in dst_slots.items()}
+        self.slots = tuple(
+            self.dst_slots.get(i) or tuple(range(midnight, midnight + DAY_MS, HOUR_MS))
+            for i, midnight in enumerate(self.bounds[:-1])
+        )
+        self.months = []
+        self.month_offsets = []
+        for offset, day in enumerate(self.days):
+            if not self.months or self.months[-1] != day[:7]:
+                self.months.append(day[:7])
+                self.month_offsets.append(offset)
+        self.month_bounds = [self.bounds[offset] for offset in self.month_offsets]
+
+    @classmethod
+    def build(cls, timezone_name: Optional[str], start_day: date, end_day: date) -> "CalendarTable":
+        tz = _time_core().resolve_timezone(timezone_name)
+        first = start_day.toordinal()
+        bounds = [_local_epoch_ms(date.fromordinal(ordinal), 0, tz) for ordinal in range(first, end_day.toordinal() + 2)]
+        dst_slots = {
+            i: [_local_epoch_ms(date.fromordinal(first + i), hour, tz) for hour in range(24)]
+            for i in range(len(bounds) - 1)
+            if bounds[i + 1] - bounds[i] != DAY_MS
+        }
+        return cls(timezone_name, start_day, bounds, dst_slots)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def index(self, day_key: str) -> int:
+        """Position of a "YYYY-MM-DD" day in the table"""
+        return date.fromisoformat(day_key).toordinal() - self.first_ordinal
+
+    def day_of(self, timestamp: int) -> int:
+        """Position of the local day holding an epoch-ms timestamp"""
+        return bisect_right(self.bounds, timestamp) - 1
+
+    def month_of(self, timestamp: int) -> str:
+        """Local "YYYY-MM" month holding an epoch-ms timestamp"""
+        return self.months[max(bisect_right(self.month_bounds, timestamp) - 1, 0)]
+
+    def records(
+        self,
+        include_business_hours: bool = True,
+        include_personal_hours: bool = True,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> List[Dict]:
+        """iter_dates records for days [start, stop), all sharing the module's hour tuples"""
+        tz = _time_core().resolve_timezone(self.timezone)
+        personal_hours = PERSONAL_HOURS if include_personal_hours else NO_HOURS
+        records = []
+        for i in range(start, len(self.days) if stop is None else stop):
+            day_of_week = self.weekdays[i]
+            midnight = self.bounds[i]
+            local = datetime.fromtimestamp(midnight / 1000, tz)
+            records.append({
+                "date": self.days[i],
+                "timestamp": midnight,
+                "iso": local.isoformat(),
+                "day_of_week": day_of_week,
+                "is_weekend": day_of_week >= 5,
+                "business_hours": BUSINESS_HOURS if include_business_hours and day_of_week < 5 else NO_HOURS,
+                "personal_hours": personal_hours,
+            })
+        return records
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": CALENDAR_CACHE_VERSION,
+            "timezone": self.timezone,
+            "start": self.days[0],
+            "end": self.days[-1],
+            "bounds": list(self.bounds),
+            "dstSlots": {str(i): list(slots) for i, slots in self.dst_slots.items()},
+        }
+
+    @classmethod
+    def from_json(cls, document: Dict[str, Any]) -> "CalendarTable":
+        return cls(document["timezone"], date.fromisoformat(document["start"]), document["bounds"], document["dstSlots"])
+
+
+def _calendar_cache_path(cache_dir: str, timezone_name: Optional[str], start_day: date, end_day: date) -> str:
+    zone = (timezone_name or "local").replace("/", "_")
+    return os.path.join(cache_dir, f"calendar-v{CALENDAR_CACHE_VERSION}-{zone}-{start_day}-{end_day}.json")
+
+
+@lru_cache(maxsize=CALENDAR_MEMO_SIZE)
+def calendar_table(timezone_name: Optional[str], start_day: date, end_day: date) -> CalendarTable:
+    """
+    Memoized CalendarTable for start_day through end_day in a timezone.
+
+    When the MOCK_CALENDAR_CACHE environment variable names a directory the
+    table is also stored there as JSON, so later runs and worker processes
+    load it instead of rebuilding it. The system local zone is never
+    stored on disk, as it depends on the machine.
+    """
+    cache_dir = os.environ.get(CALENDAR_CACHE_ENV)
+    if not cache_dir or _time_core().resolve_timezone(timezone_name) is None:
+        return CalendarTable.build(timezone_name, start_day, end_day)
+    path = _calendar_cache_path(cache_dir, timezone_name, start_day, end_day)
     try:
-        from backports.zoneinfo import ZoneInfo
-        HAS_ZONEINFO = True
-    except ImportError:
-        try:
-            import pytz
-            HAS_ZONEINFO = False
-        except ImportError:
-            print("Error: Requires Python 3.9+ with zoneinfo or pytz package", file=sys.stderr)
-            sys.exit(1)
+        with open(path, 'r') as f:
+            return CalendarTable.from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        pass
+    table = CalendarTable.build(timezone_name, start_day, end_day)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Written under a per-process name and renamed, so concurrent runs never read a partial file
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'w') as f:
+        json.dump(table.to_json(), f)
+    os.replace(partial, path)
+    return table
+
+
+def _date_range_bounds(
+    months: int,
+    timezone_name: Optional[str],
+    end_date: Optional[str] = None
+) -> Tuple[datetime, datetime]:
+    """Start (the same day, months calendar months earlier) and now, or local midnight of end_date"""
+    tz = _time_core().resolve_timezone(timezone_name)
+    if timezone_name and timezone_name != "local" and tz is None:
+        print(f"Warning: Unknown timezone '{timezone_name}'. Using system timezone.", file=sys.stderr)
+    now = datetime.now(tz)
+    if end_date:
+        # A pinned end makes the day list, and so seeded output, independent of when the run happens
+        now = _time_core().localize(datetime.combine(date.fromisoformat(end_date), datetime.min.time()), tz)
+
+    # Same wall-clock time on the start day, localized on its own so a DST change in between does not shift it
+    start = _time_core().localize(datetime.combine(_shift_months(now.date(), months), now.time()), tz)
+    return start, now
+
+
+def iter_dates(
+    start_date: datetime,
+    end_date: datetime,
+    include_business_hours: bool = True,
+    include_personal_hours: bool = True,
+    timezone_name: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    Yield one date record per day from start_date through end_date.
+
+    Records come from the memoized calendar table of the range, so
+    timestamps are the DST-correct local midnight of each day and the
+    hour lists are shared tuples:
+    business hours 9 AM - 5 PM on Mon-Fri, personal hours 6 AM - 11 PM daily.
+    """
+    timezone_name = timezone_name or _time_core().timezone_name(start_date)
+    table = calendar_table(timezone_name, start_date.date(), end_date.date())
+    yield from table.records(include_business_hours, include_personal_hours)
 
 
 def generate_date_ranges(
@@ -45,58 +330,10 @@ def generate_date_ranges(
     Returns:
         Dictionary with date ranges, timestamps, and transaction time patterns
     """
-    # Get current time in specified timezone
-    if timezone_name:
-        try:
-            if HAS_ZONEINFO:
-                tz = ZoneInfo(timezone_name)
-                now = datetime.now(tz)
-            else:
-                tz = pytz.timezone(timezone_name)
-                now = datetime.now(tz)
-        except (ValueError, pytz.exceptions.UnknownTimeZoneError) as e:
-            print(f"Warning: Unknown timezone '{timezone_name}'. Using system timezone.", file=sys.stderr)
-            now = datetime.now()
-    else:
-        now = datetime.now()
-    
-    # Calculate start date (months ago)
-    start_date = now - timedelta(days=months * 30)
+    start_date, now = _date_range_bounds(months, timezone_name)
     
     # Generate date ranges
-    dates = []
-    current_date = start_date
-    
-    while current_date <= now:
-        # Business hours: 9 AM - 5 PM (9:00 - 17:00)
-        # Personal hours: 6 AM - 11 PM (6:00 - 23:00)
-        
-        # Determine transaction times based on day of week
-        day_of_week = current_date.weekday()  # 0 = Monday, 6 = Sunday
-        
-        # Business transactions: Monday-Friday, 9 AM - 5 PM
-        if include_business_hours and day_of_week < 5:  # Mon-Fri
-            business_hours = list(range(9, 17))  # 9 AM to 5 PM
-        else:
-            business_hours = []
-        
-        # Personal transactions: All days, 6 AM - 11 PM
-        if include_personal_hours:
-            personal_hours = list(range(6, 23))  # 6 AM to 11 PM
-        else:
-            personal_hours = []
-        
-        dates.append({
-            "date": current_date.strftime("%Y-%m-%d"),
-            "timestamp": int(current_date.timestamp() * 1000),  # Milliseconds
-            "iso": current_date.isoformat(),
-            "day_of_week": day_of_week,
-            "is_weekend": day_of_week >= 5,
-            "business_hours": business_hours,
-            "personal_hours": personal_hours,
-        })
-        
-        current_date += timedelta(days=1)
+    dates = list(iter_dates(start_date, now, include_business_hours, include_personal_hours, timezone_name))
     
     return {
         "start_date": start_date.strftime("%Y-%m-%d"),
@@ -112,7 +349,8 @@ def generate_date_ranges(
 def generate_transaction_times(
     date_info: Dict,
     transaction_type: str = "mixed",
-    count: int = 1
+    count: int = 1,
+    profile: Any = None
 ) -> List[Dict]:
     """
     Generate specific transaction times for a given date.
@@ -121,44 +359,29 @@ def generate_transaction_times(
         date_info: Date information from generate_date_ranges
         transaction_type: "business", "personal", or "mixed"
         count: Number of transactions to generate
+        profile: Arrival profile (see load_arrival_profile); default "uniform".
+                 Tables of named (or file) profiles are built once per process
     
     Returns:
         List of transaction time dictionaries with timestamps
     """
-    import random
-    
     transactions = []
     base_date = datetime.fromisoformat(date_info["iso"].replace("Z", "+00:00"))
+    # Hours come from the day's alias table, so weighted profiles cost the same as uniform ones
+    if profile is None or isinstance(profile, str):
+        prob, alias = _day_arrival_table(profile, transaction_type, _day_pattern(date_info))
+    else:
+        _, probs, aliases = _arrival_tables([date_info], load_arrival_profile(profile), transaction_type)
+        prob, alias = probs[0], aliases[0]
     
     for i in range(count):
-        hour = None
         minute = random.randint(0, 59)
         second = random.randint(0, 59)
         
-        if transaction_type == "business":
-            # Business hours only
-            if date_info["business_hours"]:
-                hour = random.choice(date_info["business_hours"])
-        elif transaction_type == "personal":
-            # Personal hours only
-            if date_info["personal_hours"]:
-                hour = random.choice(date_info["personal_hours"])
-        else:
-            # Mixed: prefer business hours on weekdays, personal hours on weekends
-            if not date_info["is_weekend"] and date_info["business_hours"]:
-                # 70% business hours, 30% personal hours on weekdays
-                if random.random() < 0.7:
-                    hour = random.choice(date_info["business_hours"])
-                else:
-                    hour = random.choice(date_info["personal_hours"])
-            else:
-                # Weekend: all personal hours
-                if date_info["personal_hours"]:
-                    hour = random.choice(date_info["personal_hours"])
-        
-        if hour is None:
-            # Fallback to any hour if no hours available
-            hour = random.randint(6, 23)
+        outcome = random.randrange(ARRIVAL_OUTCOMES)
+        if random.random() >= prob[outcome]:
+            outcome = alias[outcome]
+        hour = outcome % 24
         
         transaction_time = base_date.replace(
             hour=hour,
@@ -179,6 +402,1342 @@ def generate_transaction_times(
     return transactions
 
 
+def hour_slot_epochs(dates: List[Dict], timezone_name: Optional[str] = None) -> List[Tuple[int, ...]]:
+    """
+    Epoch milliseconds of every local wall-clock hour (0-23) of each day.
+
+    Read from the memoized calendar table of the dates' span, so bulk
+    generation adds minutes and seconds to a table lookup instead of
+    calling datetime.replace per transaction.
+    """
+    keys = [date_info["date"] for date_info in dates]
+    table = calendar_table(timezone_name, date.fromisoformat(min(keys)), date.fromisoformat(max(keys)))
+    return [table.slots[table.index(key)] for key in keys]
+
+
+def _category_table(categories: Sequence[Dict]) -> Tuple[List[List[str]], List[str], List[int], List[int], List[float], List[bool]]:
+    """Flatten categories into per-category columns plus one merchant list"""
+    labels, merchants, offsets, counts, averages, incomes = [], [], [], [], [], []
+    for category in categories:
+        # One shared list per category; rows reference it instead of copying
+        labels.append([category["name"]])
+        offsets.append(len(merchants))
+        counts.append(len(category["merchants"]))
+        merchants.extend(category["merchants"])
+        averages.append(category["avgAmount"])
+        incomes.append(category["isIncome"])
+    return labels, merchants, offsets, counts, averages, incomes
+
+
+def load_arrival_profile(profile: Any = None) -> Dict[str, Any]:
+    """
+    Resolve an arrival profile into per-weekday tables.
+
+    profile is a name from ARRIVAL_PROFILES, a path to a JSON file or a
+    dict with optional "businessShare", "business" and "personal" (24
+    hourly weights, a {"weekday", "weekend"} pair of them, or one per day
+    keyed "mon".."sun") and "days" (7 relative daily volumes, Mon-Sun).
+    Missing weights are flat. Resolved profiles are returned unchanged.
+
+    Returns:
+        Dict with name, businessShare, business and personal (7 x 24) and days (7)
+    """
+    if isinstance(profile, dict) and profile.get("resolved"):
+        return profile
+    name = profile if isinstance(profile, str) else "custom"
+    if profile is None:
+        name = DEFAULT_ARRIVAL_PROFILE
+        spec = ARRIVAL_PROFILES[name]
+    elif isinstance(profile, str):
+        if profile in ARRIVAL_PROFILES:
+            spec = ARRIVAL_PROFILES[profile]
+        else:
+            with open(profile, 'r') as f:
+                spec = json.load(f)
+    else:
+        spec = profile
+
+    def weekly(key: str) -> Tuple[Tuple[float, ...], ...]:
+        value = spec.get(key)
+        if isinstance(value, dict):
+            rows = [
+                value.get(day_name, value.get("weekend" if weekday >= 5 else "weekday"))
+                for weekday, day_name in enumerate(WEEKDAY_NAMES)
+            ]
+        else:
+            rows = [value] * 7
+        rows = [tuple(float(weight) for weight in row) if row is not None else (1.0,) * 24 for row in rows]
+        if any(len(row) != 24 or min(row) < 0 for row in rows):
+            raise ValueError(f"profile {key!r} needs 24 non-negative hourly weights per day")
+        return tuple(rows)
+
+    days = tuple(float(weight) for weight in spec.get("days", (1.0,) * 7))
+    if len(days) != 7 or min(days) <= 0:
+        raise ValueError("profile 'days' needs 7 positive weights, Monday first")
+    share = float(spec.get("businessShare", BUSINESS_SHARE))
+    if not 0 <= share <= 1:
+        raise ValueError("profile 'businessShare' must be between 0 and 1")
+    return {
+        "resolved": True,
+        "name": spec.get("name", name),
+        "businessShare": share,
+        "business": weekly("business"),
+        "personal": weekly("personal"),
+        "days": days,
+    }
+
+
+def build_alias_table(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """
+    Vose alias table of a discrete distribution.
+
+    A draw picks outcome k uniformly and keeps it when a second uniform is
+    below prob[k], otherwise takes alias[k], so sampling costs the same
+    for any number of outcomes or shape of weights.
+    """
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError("alias table needs a positive total weight")
+    size = len(weights)
+    scaled = [weight * size / total for weight in weights]
+    prob = [1.0] * size
+    alias = list(range(size))
+    small = [i for i, value in enumerate(scaled) if value < 1]
+    large = [i for i, value in enumerate(scaled) if value >= 1]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+    # Whatever is left is 1 up to rounding and keeps itself
+    return prob, alias
+
+
+def _arrival_weights(date_info: Dict, profile: Dict[str, Any], transaction_type: str) -> List[float]:
+    """
+    Probabilities of the ARRIVAL_OUTCOMES (pool, hour) outcomes of one day.
+
+    Same pool rules as before profiles existed: business hours on weekdays
+    with probability businessShare in mixed mode, personal hours otherwise,
+    and FALLBACK_HOURS when the chosen pool has no hours that day.
+    """
+    weekday = date_info["day_of_week"]
+    pools = []
+    for hours, weights in (
+        (date_info["business_hours"], profile["business"][weekday]),
+        (date_info["personal_hours"], profile["personal"][weekday]),
+    ):
+        total = sum(weights[hour] for hour in hours)
+        pools.append([weights[hour] / total if hour in hours else 0.0 for hour in range(24)] if total > 0 else None)
+    business, personal = pools
+    fallback = [
+        1 / (FALLBACK_HOURS[1] - FALLBACK_HOURS[0]) if FALLBACK_HOURS[0] <= hour < FALLBACK_HOURS[1] else 0.0
+        for hour in range(24)
+    ]
+
+    if transaction_type == "business":
+        mix = (1, 0, 0) if business else (0, 0, 1)
+    elif transaction_type == "personal" or date_info["is_weekend"] or not business:
+        mix = (0, 1, 0) if personal else (0, 0, 1)
+    else:
+        share = profile["businessShare"]
+        mix = (share, 1 - share, 0) if personal else (share, 0, 1 - share)
+    return [
+        share * weight
+        for share, pool in zip(mix, (business, personal, fallback))
+        for weight in (pool or (0.0,) * 24)
+    ]
+
+
+def _day_pattern(date_info: Dict) -> Tuple[int, bool, Tuple[int, ...], Tuple[int, ...]]:
+    """The fields of a day its arrival table depends on"""
+    return (date_info["day_of_week"], date_info["is_weekend"],
+            tuple(date_info["business_hours"]), tuple(date_info["personal_hours"]))
+
+
+@lru_cache(maxsize=ARRIVAL_TABLE_CACHE_SIZE)
+def _day_arrival_table(
+    profile: Optional[str],
+    transaction_type: str,
+    pattern: Tuple[int, bool, Tuple[int, ...], Tuple[int, ...]]
+) -> Tuple[List[float], List[int]]:
+    """Alias table (prob, alias) of one day pattern under a named or file profile"""
+    day_of_week, is_weekend, business_hours, personal_hours = pattern
+    date_info = {
+        "day_of_week": day_of_week,
+        "is_weekend": is_weekend,
+        "business_hours": business_hours,
+        "personal_hours": personal_hours,
+    }
+    return build_alias_table(_arrival_weights(date_info, _named_arrival_profile(profile), transaction_type))
+
+
+@lru_cache(maxsize=None)
+def _named_arrival_profile(profile: Optional[str]) -> Dict[str, Any]:
+    return load_arrival_profile(profile)
+
+
+def _arrival_tables(
+    dates: List[Dict],
+    profile: Dict[str, Any],
+    transaction_type: str
+) -> Tuple[List[int], List[List[float]], List[List[int]]]:
+    """
+    Alias tables of arrival outcomes, one per distinct day pattern.
+
+    Returns:
+        (table index per day, prob rows, alias rows)
+    """
+    index = {}
+    day_tables = []
+    probs = []
+    aliases = []
+    for date_info in dates:
+        key = _day_pattern(date_info)
+        table = index.get(key)
+        if table is None:
+            table = index[key] = len(probs)
+            prob, alias = build_alias_table(_arrival_weights(date_info, profile, transaction_type))
+            probs.append(prob)
+            aliases.append(alias)
+        day_tables.append(table)
+    return day_tables, probs, aliases
+
+
+def _day_weights(weekdays: Iterable[int], profile: Dict[str, Any]) -> List[int]:
+    """Integer relative volume of each day, from the profile's weekday weights"""
+    return [max(1, round(profile["days"][weekday] * DAY_WEIGHT_SCALE)) for weekday in weekdays]
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """Poisson draw by counting unit-rate exponential arrivals before mean (random-module fallback)"""
+    count = 0
+    elapsed = rng.expovariate(1.0)
+    while elapsed < mean:
+        count += 1
+        elapsed += rng.expovariate(1.0)
+    return count
+
+
+def draw_daily_counts(
+    weekdays: Sequence[int],
+    daily_rate: float,
+    profile: Any = None,
+    seed: Optional[int] = None
+) -> List[int]:
+    """
+    Poisson transaction count for each day.
+
+    Means are daily_rate scaled by the profile's weekday volume, normalized
+    so an average week still averages daily_rate per day.
+    """
+    profile = load_arrival_profile(profile)
+    scale = daily_rate * 7 / sum(profile["days"])
+    means = [profile["days"][weekday] * scale for weekday in weekdays]
+    if HAS_NUMPY:
+        import numpy as np
+        return np.random.default_rng(seed).poisson(means).tolist()
+    rng = random.Random(seed)
+    return [_poisson(rng, mean) for mean in means]
+
+
+def _bulk_transactions_numpy(
+    dates: List[Dict],
+    slots: List[List[int]],
+    count: int,
+    transaction_type: str,
+    seed: Optional[int],
+    profile: Dict[str, Any],
+    day_counts: Optional[Sequence[int]] = None
+) -> Dict[str, List[Any]]:
+    """Columnar transactions, every field sampled as one array"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    if day_counts is None:
+        weights = np.array(_day_weights((date_info["day_of_week"] for date_info in dates), profile), dtype=np.float64)
+        day_counts = rng.multinomial(count, weights / weights.sum())
+    day = np.repeat(np.arange(len(dates)), day_counts)
+
+    # Alias draw: a uniform outcome, kept or swapped for its alias by a second uniform
+    day_tables, probs, aliases = _arrival_tables(dates, profile, transaction_type)
+    table = np.array(day_tables, dtype=np.int64)[day]
+    outcome = rng.integers(0, ARRIVAL_OUTCOMES, count)
+    outcome = np.where(
+        rng.random(count) < np.array(probs)[table, outcome], outcome, np.array(aliases, dtype=np.int64)[table, outcome]
+    )
+    pool, hour = np.divmod(outcome, 24)
+    # Minute and second are independent and uniform, so one draw over the hour covers both
+    seconds = rng.integers(0, 3600, count)
+    timestamps = np.array(slots, dtype=np.int64)[day, hour] + seconds * 1000
+
+    is_business = pool == 0 if transaction_type == "mixed" else np.full(count, transaction_type == "business")
+    business = _category_table(BUSINESS_CATEGORIES)
+    personal = _category_table(PERSONAL_CATEGORIES)
+    labels = np.empty(len(business[0]) + len(personal[0]), dtype=object)
+    labels[:] = business[0] + personal[0]
+    merchants = np.array(business[1] + personal[1], dtype=object)
+    offsets = np.array(business[2] + [len(business[1]) + offset for offset in personal[2]], dtype=np.int64)
+    counts = np.array(business[3] + personal[3], dtype=np.int64)
+    averages = np.array(business[4] + personal[4], dtype=np.float64)
+    incomes = np.array(business[5] + personal[5], dtype=bool)
+
+    category = np.where(
+        is_business,
+        rng.integers(0, len(business[0]), count),
+        len(business[0]) + rng.integers(0, len(personal[0]), count),
+    )
+    merchant = offsets[category] + (rng.random(count) * counts[category]).astype(np.int64)
+    amount = averages[category] * (1 + (rng.random(count) * AMOUNT_VARIANCE * 2 - AMOUNT_VARIANCE))
+    # Math.round semantics (half up), as in the Convex mock generator
+    cents = np.floor(amount * 100 + 0.5)
+    income = incomes[category]
+
+    day_labels = np.array([date_info["date"] for date_info in dates], dtype=object)
+    return {
+        "amount": (np.where(income, cents, -cents) / 100).tolist(),
+        "date": day_labels[day].tolist(),
+        "dateTimestamp": timestamps.tolist(),
+        "merchant": merchants[merchant].tolist(),
+        "category": labels[category].tolist(),
+        "isBusiness": is_business.tolist(),
+        "transactionType": np.where(income, "credit", "debit").astype(object).tolist(),
+    }
+
+
+def _bulk_transactions_python(
+    dates: List[Dict],
+    slots: List[List[int]],
+    count: int,
+    transaction_type: str,
+    seed: Optional[int],
+    profile: Dict[str, Any],
+    day_counts: Optional[Sequence[int]] = None
+) -> Dict[str, List[Any]]:
+    """Columnar transactions from the random module, one k-sized draw per field where possible"""
+    rng = random.Random(seed)
+    if day_counts is None:
+        cumulative = list(accumulate(_day_weights((date_info["day_of_week"] for date_info in dates), profile)))
+        days = sorted(rng.choices(range(len(dates)), cum_weights=cumulative, k=count))
+    else:
+        days = [day for day, rows in enumerate(day_counts) for _ in range(rows)]
+    day_tables, probs, aliases = _arrival_tables(dates, profile, transaction_type)
+    business = _category_table(BUSINESS_CATEGORIES)
+    personal = _category_table(PERSONAL_CATEGORIES)
+
+    columns = {name: [] for name in TRANSACTION_COLUMNS}
+    uniforms = [rng.random() for _ in range(count * 4)]
+    seconds = rng.choices(range(3600), k=count)
+    for i, day in enumerate(days):
+        table = day_tables[day]
+        outcome = int(uniforms[i] * ARRIVAL_OUTCOMES)
+        if uniforms[3 * count + i] >= probs[table][outcome]:
+            outcome = aliases[table][outcome]
+        pool, hour = divmod(outcome, 24)
+
+        is_business = pool == 0 if transaction_type == "mixed" else transaction_type == "business"
+        labels, merchants, offsets, counts, averages, incomes = business if is_business else personal
+        category = int(uniforms[count + i] * len(labels))
+        merchant = merchants[offsets[category] + int(uniforms[2 * count + i] * counts[category])]
+        amount = averages[category] * (1 + (rng.random() * AMOUNT_VARIANCE * 2 - AMOUNT_VARIANCE))
+        cents = int(amount * 100 + 0.5)
+
+        columns["amount"].append((cents if incomes[category] else -cents) / 100)
+        columns["date"].append(dates[day]["date"])
+        columns["dateTimestamp"].append(slots[day][hour] + seconds[i] * 1000)
+        columns["merchant"].append(merchant)
+        columns["category"].append(labels[category])
+        columns["isBusiness"].append(is_business)
+        columns["transactionType"].append("credit" if incomes[category] else "debit")
+    return columns
+
+
+def generate_transactions_bulk(
+    date_ranges: Dict,
+    count: int,
+    transaction_type: str = "mixed",
+    seed: Optional[int] = None,
+    profile: Any = None,
+    day_counts: Optional[Sequence[int]] = None
+) -> Dict[str, List[Any]]:
+    """
+    Generate many transactions_raw-shaped rows across all days of a date range.
+
+    Same hour pools as generate_transaction_times and the same categories,
+    merchants and amount variance as the Convex mock generator, but every
+    field is sampled as an array: days by the profile's weekday volume,
+    (pool, hour) pairs from per-day alias tables, and timestamps from a
+    per-day hour table, so millions of rows take seconds whatever the
+    profile. Uses NumPy when installed; the pure-Python fallback is
+    correct but several times slower, and a seed reproduces output only on
+    the same path.
+
+    Args:
+        date_ranges: Result of generate_date_ranges, optionally with the
+                     days' hour slots from a calendar table under "slots"
+        count: Total number of transactions, spread over the days by weekday volume
+        transaction_type: "business", "personal", or "mixed"
+        seed: Optional RNG seed
+        profile: Arrival profile (see load_arrival_profile); default "uniform"
+        day_counts: Exact transactions per day (e.g. from draw_daily_counts);
+                    overrides count
+
+    Returns:
+        Columns keyed by TRANSACTION_COLUMNS, rows sorted by day
+    """
+    dates = date_ranges["dates"]
+    if day_counts is not None:
+        count = sum(day_counts)
+    if count <= 0 or not dates:
+        return {name: [] for name in TRANSACTION_COLUMNS}
+    slots = date_ranges.get("slots") or hour_slot_epochs(dates, date_ranges.get("timezone"))
+    generate = _bulk_transactions_numpy if HAS_NUMPY else _bulk_transactions_python
+    return generate(dates, slots, count, transaction_type, seed, load_arrival_profile(profile), day_counts)
+
+
+def iter_transaction_rows(columns: Dict[str, List[Any]]):
+    """Yield one dict per row from generate_transactions_bulk columns"""
+    names = [name for name in TRANSACTION_COLUMNS if name in columns]
+    for values in zip(*(columns[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def derive_seed(seed: int, *key: Any) -> int:
+    """64-bit seed for one shard, derived from the run seed and the shard key"""
+    digest = hashlib.sha256(":".join(str(part) for part in (seed,) + key).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _day_runs(
+    days: List[str],
+    count: int,
+    chunk_rows: int,
+    weights: Optional[Sequence[int]] = None
+) -> Iterator[Tuple[List[str], int]]:
+    """
+    Split "YYYY-MM-DD" days into runs within a month holding about chunk_rows
+    of count rows each; rows follow the cumulative integer day weights (day
+    count by default) and add up to count. Runs without rows are skipped.
+    """
+    weights = weights if weights is not None else [1] * len(days)
+    total_weight = sum(weights)
+    if not total_weight:
+        return
+    weight_done = 0
+    rows_done = 0
+    index = 0
+    run_days = max(1, chunk_rows * len(days) // max(count, 1))
+    for _, month in groupby(days, key=lambda day: day[:7]):
+        month = list(month)
+        for offset in range(0, len(month), run_days):
+            run = month[offset:offset + run_days]
+            weight_done += sum(weights[index:index + len(run)])
+            index += len(run)
+            rows = count * weight_done // total_weight - rows_done
+            rows_done += rows
+            if rows:
+                yield run, rows
+
+
+def plan_transaction_shards(
+    start_date: datetime,
+    end_date: datetime,
+    count: int,
+    orgs: int = 1,
+    seed: int = 0,
+    transaction_type: str = "mixed",
+    timezone_name: Optional[str] = None,
+    include_business_hours: bool = True,
+    include_personal_hours: bool = True,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    profile: Any = None,
+    daily_rate: Optional[float] = None
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield generation tasks, org by org and month by month.
+
+    Each org gets an equal share of count, spread over its days by the
+    profile's weekday volume. With daily_rate, count is ignored and every
+    day of every org gets a Poisson count instead, drawn per (org, month).
+    Months holding more than chunk_rows rows are cut into runs of days. A
+    task carries its own seed derived from (seed, org, first day), so
+    output depends only on these arguments, never on how many workers run
+    the tasks.
+    """
+    profile = load_arrival_profile(profile)
+    table = calendar_table(timezone_name, start_date.date(), end_date.date())
+    weights = _day_weights(table.weekdays, profile)
+    month_spans = list(zip(table.months, table.month_offsets, table.month_offsets[1:] + [len(table)]))
+    for org_index in range(orgs):
+        org_id = f"mock_org_{org_index + 1:05d}" if orgs > 1 else None
+        if daily_rate is None:
+            day_counts = None
+            runs = _day_runs(table.days, count * (org_index + 1) // orgs - count * org_index // orgs, chunk_rows, weights)
+        else:
+            day_counts = [
+                rows
+                for month, first, stop in month_spans
+                for rows in draw_daily_counts(
+                    table.weekdays[first:stop], daily_rate, profile, derive_seed(seed, org_index, "counts", month)
+                )
+            ]
+            runs = _day_runs(table.days, sum(day_counts), chunk_rows, day_counts)
+        for run, rows in runs:
+            first = table.index(run[0])
+            yield (
+                org_id, run[0], len(run), rows, derive_seed(seed, org_index, run[0]),
+                transaction_type, timezone_name, include_business_hours, include_personal_hours,
+                start_date.date(), end_date.date(), profile,
+                day_counts[first:first + len(run)] if day_counts is not None else None,
+            )
+
+
+def _generate_shard(task: Tuple[Any, ...]) -> Dict[str, List[Any]]:
+    """Bulk columns for one plan_transaction_shards task"""
+    (_, first_day, days, rows, seed, transaction_type, timezone_name,
+     include_business, include_personal, range_start, range_end, profile, day_counts) = task
+    # Every shard of a range slices the same table, built once per worker process
+    table = calendar_table(timezone_name, range_start, range_end)
+    start = table.index(first_day)
+    date_ranges = {
+        "dates": table.records(include_business, include_personal, start, start + days),
+        "timezone": timezone_name,
+        "slots": table.slots[start:start + days],
+    }
+    return generate_transactions_bulk(date_ranges, rows, transaction_type, seed=seed, profile=profile, day_counts=day_counts)
+
+
+def _shard_lines(task: Tuple[Any, ...]) -> List[str]:
+    """Worker entry point: one task's NDJSON lines"""
+    return list(transaction_ndjson_lines(_generate_shard(task), org_id=task[0]))
+
+
+def iter_transaction_chunks(
+    start_date: datetime,
+    end_date: datetime,
+    count: int,
+    transaction_type: str = "mixed",
+    timezone_name: Optional[str] = None,
+    include_business_hours: bool = True,
+    include_personal_hours: bool = True,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    seed: Optional[int] = None,
+    profile: Any = None,
+    daily_rate: Optional[float] = None
+) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Yield generate_transactions_bulk columns for consecutive runs of days.
+
+    Each run holds about chunk_rows transactions, so memory stays flat
+    however long the range or large the count, and the runs add up to
+    exactly count (or to the Poisson day counts, with daily_rate).
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    for task in plan_transaction_shards(
+        start_date, end_date, count, 1, seed, transaction_type, timezone_name,
+        include_business_hours, include_personal_hours, chunk_rows, profile, daily_rate
+    ):
+        yield _generate_shard(task)
+
+
+def _ordered_map(function, tasks: Iterable[Tuple[Any, ...]], workers: int = 1) -> Iterator[Any]:
+    """
+    Run tasks on a process pool and yield their results in task order.
+
+    At most a few tasks per worker are in flight, so memory stays bounded,
+    and results are yielded in submission order, so the output bytes do not
+    depend on workers.
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= workers * SHARDS_IN_FLIGHT:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_sharded_lines(tasks: Iterable[Tuple[Any, ...]], workers: int = 1) -> Iterator[List[str]]:
+    """Run plan_transaction_shards tasks on a process pool and yield their lines in task order"""
+    return _ordered_map(_shard_lines, tasks, workers)
+
+
+def _available_cores() -> int:
+    """Number of cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def transaction_ndjson_lines(columns: Dict[str, List[Any]], org_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Serialize bulk columns as NDJSON lines, equal to compact json.dumps of
+    each row (led by orgId when given); repeated strings (dates, merchants,
+    categories) are encoded once.
+    """
+    head = "{" if org_id is None else f'{{"orgId":{json.dumps(org_id)},'
+    # Dates and (merchant, category, isBusiness, transactionType) tails repeat, so each is encoded once
+    dates: Dict[str, str] = {}
+    tails: Dict[Tuple[str, str, bool, str], str] = {}
+    for amount, date, timestamp, merchant, category, is_business, kind in zip(
+        *(columns[name] for name in TRANSACTION_COLUMNS)
+    ):
+        date_text = dates.get(date)
+        if date_text is None:
+            date_text = dates[date] = json.dumps(date)
+        tail = tails.get((merchant, category[0], is_business, kind))
+        if tail is None:
+            tail = tails[(merchant, category[0], is_business, kind)] = (
+                f',"merchant":{json.dumps(merchant)},"category":{json.dumps(category)},'
+                f'"isBusiness":{json.dumps(is_business)},"transactionType":{json.dumps(kind)}}}\n'
+            )
+        yield f'{head}"amount":{amount!r},"date":{date_text},"dateTimestamp":{timestamp}{tail}'
+
+
+class _ChunkFile:
+    """
+    One output file written as bytes, with the SHA-256 and size of what
+    lands on disk. Gzip members carry no timestamp or name, so the same
+    rows always give the same checksum.
+    """
+
+    def __init__(self, path: str, compress: bool):
+        self._raw = open(path, "wb")
+        self._digest = hashlib.sha256()
+        self.size = 0
+        self._sink = gzip.GzipFile(filename="", mode="wb", fileobj=self, compresslevel=GZIP_LEVEL, mtime=0) if compress else self
+
+    def write(self, data: bytes) -> int:
+        """Raw sink: hash, count and store (GzipFile writes its output here too)"""
+        self._digest.update(data)
+        self.size += len(data)
+        return self._raw.write(data)
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def append(self, data: bytes) -> None:
+        self._sink.write(data)
+
+    def close(self, entry: Dict[str, Any]) -> None:
+        """Finish the file and record its on-disk size and checksum in entry"""
+        if self._sink is not self:
+            self._sink.close()
+        self._raw.close()
+        entry["size"] = self.size
+        entry["sha256"] = self._digest.hexdigest()
+
+
+class NdjsonWriter:
+    """
+    Write NDJSON lines to stdout or files, optionally gzipped and rotated.
+
+    With max_rows or max_bytes, output goes to numbered files next to path
+    (events.ndjson -> events-00000.ndjson, ...). Sizes count uncompressed
+    bytes; lines are ASCII (json.dumps escapes the rest), so characters
+    equal bytes. Each file entry also gets its on-disk size and SHA-256.
+
+    With threads, files are handed round-robin to writer threads behind
+    bounded queues, so compression and disk writes of one file overlap with
+    filling the next (zlib and file writes release the GIL).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        compress: bool = False,
+        max_rows: int = 0,
+        max_bytes: int = 0,
+        threads: int = 0
+    ):
+        if (max_rows or max_bytes) and path in (None, "-"):
+            raise ValueError("rotation needs an output path")
+        self.path = None if path == "-" else path
+        self.compress = compress
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.files: List[Dict[str, Any]] = []
+        self._file = None
+        self._error: Optional[BaseException] = None
+        self._queues: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        if threads and self.path is not None:
+            for _ in range(threads):
+                jobs = queue.Queue(maxsize=WRITER_QUEUE_BATCHES)
+                thread = threading.Thread(target=self._drain, args=(jobs,), daemon=True)
+                thread.start()
+                self._queues.append(jobs)
+                self._threads.append(thread)
+
+    def _target(self) -> str:
+        """Path of the next output file"""
+        path = self.path
+        if self.max_rows or self.max_bytes:
+            stem, dot, extension = os.path.basename(path).partition(".")
+            path = os.path.join(os.path.dirname(path), f"{stem}-{len(self.files):05d}{dot}{extension}")
+        return path + ".gz" if self.compress and not path.endswith(".gz") else path
+
+    def _open(self) -> None:
+        if self.path is None:
+            path = "<stdout>"
+            if self.compress:
+                self._file = gzip.open(sys.stdout.buffer, "wt", compresslevel=GZIP_LEVEL)
+            else:
+                self._file = sys.stdout
+        else:
+            path = self._target()
+            if self._queues:
+                # The file's thread opens it; data for it follows on the same queue, in order
+                self._file = self._queues[len(self.files) % len(self._queues)]
+            else:
+                self._file = _ChunkFile(path, self.compress)
+        self.files.append({"path": path, "rows": 0, "bytes": 0})
+        if self._queues:
+            self._put((self.files[-1], None))
+
+    def _close_file(self) -> None:
+        if isinstance(self._file, _ChunkFile):
+            self._file.close(self.files[-1])
+        elif self._file is sys.stdout:
+            self._file.flush()
+        elif self._file is not None and not self._queues:
+            self._file.close()
+        # A threaded file is closed by its thread when it opens the next one or shuts down
+        self._file = None
+
+    def _put(self, job: Tuple[Any, Optional[bytes]]) -> None:
+        if self._error is not None:
+            raise self._error
+        self._file.put(job)
+
+    def _drain(self, jobs: queue.Queue) -> None:
+        """Writer thread: (entry, None) opens entry's file, (entry, data) appends, (None, None) stops"""
+        chunk = None
+        entry = None
+        while True:
+            job_entry, data = jobs.get()
+            if self._error is not None:
+                # Keep draining so the producer never blocks on a full queue
+                if job_entry is None:
+                    return
+                continue
+            try:
+                if data is not None:
+                    chunk.append(data)
+                    continue
+                if chunk is not None:
+                    chunk.close(entry)
+                    chunk = None
+                if job_entry is None:
+                    return
+                entry = job_entry
+                chunk = _ChunkFile(entry["path"], self.compress)
+            except BaseException as e:
+                self._error = e
+
+    def write(self, lines: Iterable[str]) -> None:
+        """Append lines (each ending in a newline), rotating when a limit would be exceeded"""
+        iterator = iter(lines)
+        while True:
+            batch = list(islice(iterator, WRITE_BATCH_LINES))
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[str]) -> None:
+        """Write a batch, splitting it at file limits with one length pass instead of per-line checks"""
+        start = 0
+        while start < len(batch):
+            if self._file is None:
+                self._open()
+            current = self.files[-1]
+            end = len(batch)
+            if self.max_rows:
+                end = min(end, start + self.max_rows - current["rows"])
+            sizes = list(accumulate(map(len, batch[start:end])))
+            if self.max_bytes:
+                end = start + bisect_right(sizes, self.max_bytes - current["bytes"])
+            if end == start:
+                if current["rows"]:
+                    # Full: rotate lazily, so no empty trailing file is created
+                    self._close_file()
+                    continue
+                # A single line larger than max_bytes gets a file of its own
+                end = start + 1
+            if self._queues:
+                self._put((current, "".join(batch[start:end]).encode()))
+            elif isinstance(self._file, _ChunkFile):
+                self._file.append("".join(batch[start:end]).encode())
+            else:
+                self._file.writelines(batch[start:end])
+            current["rows"] += end - start
+            current["bytes"] += sizes[end - start - 1]
+            start = end
+
+    def close(self) -> None:
+        self._close_file()
+        for jobs in self._queues:
+            jobs.put((None, None))
+        for thread in self._threads:
+            thread.join()
+        self._queues = []
+        self._threads = []
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+LEDGER_ACCOUNT_TYPES = ("asset", "liability", "equity", "income", "expense")
+
+# Default business chart: bank and card accounts plus the mock categories as income/expense accounts
+DEFAULT_CHART_OF_ACCOUNTS = (
+    [
+        {"name": "Business Checking", "type": "asset"},
+        {"name": "Business Savings", "type": "asset"},
+        {"name": "Business Credit Card", "type": "liability"},
+        {"name": "Owner's Equity", "type": "equity"},
+    ]
+    + [
+        {"name": category["name"], "type": "income" if category["isIncome"] else "expense",
+         "avgAmount": category["avgAmount"]}
+        for category in BUSINESS_CATEGORIES
+    ]
+)
+
+# Entry kinds and their shares; kinds whose accounts the chart lacks are dropped
+LEDGER_ENTRY_KINDS = (
+    ("revenue", 0.30),           # Dr asset / Cr income
+    ("expense_cash", 0.35),      # Dr expense / Cr asset
+    ("expense_credit", 0.20),    # Dr expense / Cr liability, usually paid later in the run
+    ("split_expense", 0.10),     # Dr expense + Dr expense / Cr asset
+    ("owner_investment", 0.05),  # Dr asset / Cr equity
+)
+LEDGER_MEMOS = {
+    "revenue": "Revenue",
+    "expense_cash": "Expense",
+    "expense_credit": "Expense on credit",
+    "split_expense": "Split expense",
+    "owner_investment": "Owner investment",
+    "liability_payment": "Liability payment",
+}
+# Share of credit expenses paid off (Dr liability / Cr asset) before the run ends
+PAYMENT_SHARE = 0.8
+DEFAULT_ACCOUNT_AMOUNT = 500
+OWNER_INVESTMENT_AMOUNT = 10000
+MOCK_USER_ID = "mock_user_00001"
+MOCK_ORG_ID = "mock_org_00001"
+
+
+def load_chart_of_accounts(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read a chart of accounts, or return the default one.
+
+    The file is a JSON list of {name, type, avgAmount?} or an object mapping
+    each type (asset, liability, equity, income or revenue, expense) to
+    account names or such objects. Assets, income and expense accounts are
+    required; liability and equity accounts are optional.
+    """
+    if path is None:
+        chart = [dict(account) for account in DEFAULT_CHART_OF_ACCOUNTS]
+    else:
+        with open(path, 'r') as f:
+            document = json.load(f)
+        if isinstance(document, dict):
+            chart = [
+                dict(account, type=account_type) if isinstance(account, dict) else {"name": account, "type": account_type}
+                for account_type, accounts in document.items()
+                for account in accounts
+            ]
+        else:
+            chart = [dict(account) for account in document]
+    for account in chart:
+        if account.get("type") == "revenue":
+            account["type"] = "income"
+        if account.get("type") not in LEDGER_ACCOUNT_TYPES or not account.get("name"):
+            raise ValueError(f"invalid account {account!r}; types are {', '.join(LEDGER_ACCOUNT_TYPES)}")
+    for required in ("asset", "income", "expense"):
+        if not any(account["type"] == required for account in chart):
+            raise ValueError(f"chart of accounts needs at least one {required} account")
+    for index, account in enumerate(chart):
+        account.setdefault("_id", f"mock_account_{index + 1:04d}")
+        account.setdefault("avgAmount", DEFAULT_ACCOUNT_AMOUNT)
+    return chart
+
+
+def _ledger_kinds(chart: List[Dict[str, Any]]) -> Tuple[List[str], List[float]]:
+    """Entry kinds the chart supports, with normalized weights"""
+    types = {account["type"] for account in chart}
+    kinds = [
+        (kind, weight) for kind, weight in LEDGER_ENTRY_KINDS
+        if (kind != "expense_credit" or "liability" in types) and (kind != "owner_investment" or "equity" in types)
+    ]
+    total = sum(weight for _, weight in kinds)
+    return [kind for kind, _ in kinds], [weight / total for _, weight in kinds]
+
+
+def _ledger_run_numpy(chart: List[Dict[str, Any]], start: int, end: int, count: int, seed: int) -> Dict[str, List[Any]]:
+    """
+    One run of entries in [start, end) ms as sorted entry and line columns.
+
+    Every entry's debit lines add up to its credit line by construction: a
+    split expense divides the credited amount between two debit lines.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    kinds, weights = _ledger_kinds(chart)
+    by_type = {
+        account_type: np.array([i for i, account in enumerate(chart) if account["type"] == account_type], dtype=np.int64)
+        for account_type in LEDGER_ACCOUNT_TYPES
+    }
+    averages = np.array([account["avgAmount"] for account in chart], dtype=np.float64)
+
+    def pick(account_type: str, size: int):
+        accounts = by_type[account_type]
+        return accounts[rng.integers(0, len(accounts), size)] if len(accounts) else np.zeros(size, dtype=np.int64)
+
+    kind = rng.choice(len(kinds), count, p=weights)
+    dates = rng.integers(start, end, count)
+    debit = np.empty(count, dtype=np.int64)
+    credit = np.empty(count, dtype=np.int64)
+    second = np.full(count, -1, dtype=np.int64)
+    average = np.empty(count, dtype=np.float64)
+    for code, name in enumerate(kinds):
+        mask = kind == code
+        size = int(mask.sum())
+        if name == "revenue":
+            debit[mask], credit[mask] = pick("asset", size), pick("income", size)
+            average[mask] = averages[credit[mask]]
+        elif name == "owner_investment":
+            debit[mask], credit[mask] = pick("asset", size), pick("equity", size)
+            average[mask] = OWNER_INVESTMENT_AMOUNT
+        else:
+            debit[mask] = pick("expense", size)
+            credit[mask] = pick("liability" if name == "expense_credit" else "asset", size)
+            average[mask] = averages[debit[mask]]
+            if name == "split_expense":
+                second[mask] = pick("expense", size)
+    variance = 1 + (rng.random(count) * AMOUNT_VARIANCE * 2 - AMOUNT_VARIANCE)
+    # At least 2 cents, so both halves of a split are non-zero
+    cents = np.maximum(np.floor(average * variance * 100 + 0.5).astype(np.int64), 2)
+    split = np.where(second >= 0, 1 + (rng.random(count) * (cents - 1)).astype(np.int64), 0)
+
+    # Payments follow their purchase within the run, so liability balances never turn debit
+    kind_names = np.array(kinds + ["liability_payment"], dtype=object)
+    if "expense_credit" in kinds:
+        paid = (kind == kinds.index("expense_credit")) & (rng.random(count) < PAYMENT_SHARE)
+        paid_dates = dates[paid] + (rng.random(int(paid.sum())) * (end - dates[paid])).astype(np.int64)
+        kind = np.concatenate([kind, np.full(len(paid_dates), len(kinds))])
+        dates = np.concatenate([dates, paid_dates])
+        debit = np.concatenate([debit, credit[paid]])
+        credit = np.concatenate([credit, pick("asset", len(paid_dates))])
+        cents = np.concatenate([cents, cents[paid]])
+        split = np.concatenate([split, np.zeros(len(paid_dates), dtype=np.int64)])
+        second = np.concatenate([second, np.full(len(paid_dates), -1, dtype=np.int64)])
+    order = np.argsort(dates, kind="stable")
+    kind, dates, debit, credit, cents, split, second = (
+        column[order] for column in (kind, dates, debit, credit, cents, split, second)
+    )
+
+    # Lines: debit (less the split part), credit, then the split's second debit
+    entries = len(dates)
+    split_entries = np.flatnonzero(second >= 0)
+    line_entry = np.concatenate([np.arange(entries), np.arange(entries), split_entries])
+    line_order = np.argsort(line_entry, kind="stable")
+    line_account = np.concatenate([debit, credit, second[split_entries]])[line_order]
+    line_debit = np.concatenate([
+        np.ones(entries, dtype=bool), np.zeros(entries, dtype=bool), np.ones(len(split_entries), dtype=bool)
+    ])[line_order]
+    line_cents = np.concatenate([cents - split, cents, split[split_entries]])[line_order]
+    totals = np.zeros(len(chart), dtype=np.int64)
+    np.add.at(totals, line_account, np.where(line_debit, line_cents, -line_cents))
+    return {
+        "entry_date": dates.tolist(),
+        "entry_kind": kind_names[kind].tolist(),
+        "line_entry": line_entry[line_order].tolist(),
+        "line_account": line_account.tolist(),
+        "line_debit": line_debit.tolist(),
+        "line_cents": line_cents.tolist(),
+        "totals": totals.tolist(),
+    }
+
+
+def _ledger_run_python(chart: List[Dict[str, Any]], start: int, end: int, count: int, seed: int) -> Dict[str, List[Any]]:
+    """random-module version of _ledger_run_numpy, for environments without NumPy"""
+    rng = random.Random(seed)
+    kinds, weights = _ledger_kinds(chart)
+    by_type = {
+        account_type: [i for i, account in enumerate(chart) if account["type"] == account_type]
+        for account_type in LEDGER_ACCOUNT_TYPES
+    }
+    entries = []
+    for kind in rng.choices(kinds, weights, k=count):
+        date = rng.randrange(start, end)
+        second = None
+        if kind == "revenue":
+            debit, credit = rng.choice(by_type["asset"]), rng.choice(by_type["income"])
+            average = chart[credit]["avgAmount"]
+        elif kind == "owner_investment":
+            debit, credit = rng.choice(by_type["asset"]), rng.choice(by_type["equity"])
+            average = OWNER_INVESTMENT_AMOUNT
+        else:
+            debit = rng.choice(by_type["expense"])
+            credit = rng.choice(by_type["liability" if kind == "expense_credit" else "asset"])
+            average = chart[debit]["avgAmount"]
+            if kind == "split_expense":
+                second = rng.choice(by_type["expense"])
+        cents = max(int(average * (1 + (rng.random() * AMOUNT_VARIANCE * 2 - AMOUNT_VARIANCE)) * 100 + 0.5), 2)
+        split = 1 + int(rng.random() * (cents - 1)) if second is not None else 0
+        entries.append((date, kind, debit, credit, cents, split, second))
+        if kind == "expense_credit" and rng.random() < PAYMENT_SHARE:
+            paid_date = date + int(rng.random() * (end - date))
+            entries.append((paid_date, "liability_payment", credit, rng.choice(by_type["asset"]), cents, 0, None))
+    entries.sort(key=lambda entry: entry[0])
+
+    run = {name: [] for name in ("entry_date", "entry_kind", "line_entry", "line_account", "line_debit", "line_cents")}
+    totals = [0] * len(chart)
+    for index, (date, kind, debit, credit, cents, split, second) in enumerate(entries):
+        run["entry_date"].append(date)
+        run["entry_kind"].append(kind)
+        lines = [(debit, True, cents - split), (credit, False, cents)]
+        if second is not None:
+            lines.append((second, True, split))
+        for account, is_debit, amount in lines:
+            run["line_entry"].append(index)
+            run["line_account"].append(account)
+            run["line_debit"].append(is_debit)
+            run["line_cents"].append(amount)
+            totals[account] += amount if is_debit else -amount
+    run["totals"] = totals
+    return run
+
+
+def _ledger_run_lines(task: Tuple[Any, ...]) -> Tuple[str, str, str, List[int], int, int]:
+    """
+    Worker entry point: one run's entries_final and entry_lines NDJSON text.
+
+    Returns:
+        (month, entries text, lines text, per-account signed cents, entries, lines)
+    """
+    chart, first_day, start, end, count, seed = task
+    generate = _ledger_run_numpy if HAS_NUMPY else _ledger_run_python
+    run = generate(chart, start, end, count, seed)
+
+    # Ids only need to be unique and stable, so they are built from the run's first day
+    prefix = first_day.replace("-", "")
+    user = json.dumps(MOCK_USER_ID)
+    org = json.dumps(MOCK_ORG_ID)
+    memos = {kind: json.dumps(memo) for kind, memo in LEDGER_MEMOS.items()}
+    accounts = [json.dumps(account["_id"]) for account in chart]
+    entry_text = "".join(
+        f'{{"_id":"entry_{prefix}_{index:07d}","userId":{user},"orgId":{org},"date":{entry_date},'
+        f'"memo":{memos[kind]},"source":"manual","status":"posted","createdAt":{entry_date},'
+        f'"approvedAt":{entry_date},"approvedBy":{user}}}\n'
+        for index, (entry_date, kind) in enumerate(zip(run["entry_date"], run["entry_kind"]))
+    )
+    entry_dates = run["entry_date"]
+    line_text = "".join(
+        f'{{"_id":"line_{prefix}_{index:08d}","entryId":"entry_{prefix}_{entry:07d}","accountId":{accounts[account]},'
+        f'"userId":{user},"date":{entry_dates[entry]},"side":"{"debit" if is_debit else "credit"}",'
+        f'"amount":{cents / 100!r},"currency":"USD"}}\n'
+        for index, (entry, account, is_debit, cents) in enumerate(
+            zip(run["line_entry"], run["line_account"], run["line_debit"], run["line_cents"])
+        )
+    )
+    return first_day[:7], entry_text, line_text, run["totals"], len(entry_dates), len(run["line_entry"])
+
+
+def expected_ledger_reports(chart: List[Dict[str, Any]], totals: List[int], start: int, as_of: int) -> Dict[str, Dict]:
+    """
+    Trial balance, P&L and balance sheet of a generated ledger, shaped like the
+    reports the validator reads and following its rebuild rules: each account
+    sits on the side of its net balance, liabilities are shown as magnitudes,
+    and retained earnings are income less expenses.
+    """
+    rows = list(zip(chart, totals))
+    debits = sum(net for _, net in rows if net > 0)
+    credits = -sum(net for _, net in rows if net < 0)
+    trial_balance = {
+        "asOfDate": as_of,
+        "entries": [
+            {"accountId": account["_id"], "accountName": account["name"],
+             "debit": max(net, 0) / 100, "credit": max(-net, 0) / 100}
+            for account, net in rows
+        ],
+        "totals": {"debits": debits / 100, "credits": credits / 100},
+        "isBalanced": debits == credits,
+        "difference": (debits - credits) / 100,
+    }
+
+    def items(account_type: str, sign: int, magnitude: bool = False) -> Tuple[List[Dict], int]:
+        selected = [
+            (account, abs(net) if magnitude else sign * net)
+            for account, net in rows if account["type"] == account_type
+        ]
+        return (
+            [{"accountId": account["_id"], "name": account["name"], "balance": cents / 100} for account, cents in selected],
+            sum(cents for _, cents in selected),
+        )
+
+    asset_items, assets = items("asset", 1)
+    liability_items, liabilities = items("liability", -1, magnitude=True)
+    equity_items, equity = items("equity", -1)
+    income = -sum(net for account, net in rows if account["type"] == "income")
+    expenses = sum(net for account, net in rows if account["type"] == "expense")
+    retained_earnings = income - expenses
+    balance_sheet = {
+        "asOfDate": as_of,
+        "assets": {"items": asset_items, "total": assets / 100},
+        "liabilities": {"items": liability_items, "total": liabilities / 100},
+        "equity": {"items": equity_items, "total": equity / 100, "retainedEarnings": retained_earnings / 100},
+        "totalLiabilitiesAndEquity": (liabilities + equity + retained_earnings) / 100,
+        "isBalanced": assets == liabilities + equity + retained_earnings,
+    }
+
+    # Like the report, only income accounts with a credit balance and expenses with a debit balance count
+    revenue_rows = [(account, -net) for account, net in rows if account["type"] == "income" and net < 0]
+    expense_rows = [(account, net) for account, net in rows if account["type"] == "expense" and net > 0]
+    revenue = sum(cents for _, cents in revenue_rows)
+    spent = sum(cents for _, cents in expense_rows)
+    profit_loss = {
+        "dateRange": {"start": start, "end": as_of},
+        "revenue": {"items": [{"accountId": a["_id"], "name": a["name"], "amount": c / 100} for a, c in revenue_rows],
+                    "total": revenue / 100},
+        "expenses": {"items": [{"accountId": a["_id"], "name": a["name"], "amount": c / 100} for a, c in expense_rows],
+                     "total": spent / 100},
+        "netIncome": (revenue - spent) / 100,
+        "grossMargin": float(Decimal(revenue - spent) / Decimal(revenue) * 100) if revenue > 0 else 0.0,
+    }
+    return {"trial_balance": trial_balance, "pnl": profit_loss, "balance_sheet": balance_sheet}
+
+
+def generate_ledger(
+    out_dir: str,
+    start_date: datetime,
+    end_date: datetime,
+    entries: int,
+    chart: Optional[List[Dict[str, Any]]] = None,
+    seed: int = 0,
+    workers: int = 1,
+    chunk_rows: int = STREAM_CHUNK_ROWS
+) -> Dict[str, Any]:
+    """
+    Write a balanced double-entry ledger directory plus its expected reports.
+
+    Layout: accounts.json, entries_final/YYYY-MM.ndjson,
+    entry_lines/YYYY-MM.ndjson (lines carry userId, accountId and date, as
+    in the by_user_account_date index) and
+    expected/{trial_balance,pnl,balance_sheet}.json, the layout the
+    validator's --ledger reads (it only opens entries_final/ to date
+    undated lines, and every line here is dated). Dates are UTC;
+    runs of days are generated on a process pool with seeds derived from
+    (seed, first day), so output does not depend on workers.
+
+    Returns:
+        Summary with entry, line and slice counts
+    """
+    chart = chart or load_chart_of_accounts()
+    table = calendar_table("UTC", start_date.date(), end_date.date())
+    start = table.bounds[0]
+    as_of = table.bounds[-1] - 1
+    tasks = (
+        (chart, run[0], table.bounds[table.index(run[0])], table.bounds[table.index(run[-1]) + 1],
+         count, derive_seed(seed, "ledger", run[0]))
+        for run, count in _day_runs(table.days, entries, chunk_rows)
+    )
+
+    for folder in ("entries_final", "entry_lines", "expected"):
+        os.makedirs(os.path.join(out_dir, folder), exist_ok=True)
+    with open(os.path.join(out_dir, "accounts.json"), 'w') as f:
+        json.dump({
+            "orgId": MOCK_ORG_ID,
+            "asOfDate": as_of,
+            "accounts": [
+                {"_id": account["_id"], "userId": MOCK_USER_ID, "orgId": MOCK_ORG_ID, "name": account["name"],
+                 "type": account["type"], "isBusiness": True}
+                for account in chart
+            ],
+        }, f, indent=2)
+
+    totals = [0] * len(chart)
+    entry_count = 0
+    line_count = 0
+    slices = []
+    entry_file = line_file = None
+    try:
+        for month, entry_text, line_text, run_totals, run_entries, run_lines in _ordered_map(
+            _ledger_run_lines, tasks, workers
+        ):
+            if not slices or slices[-1] != month:
+                for handle in (entry_file, line_file):
+                    if handle:
+                        handle.close()
+                entry_file = open(os.path.join(out_dir, "entries_final", f"{month}.ndjson"), 'w')
+                line_file = open(os.path.join(out_dir, "entry_lines", f"{month}.ndjson"), 'w')
+                slices.append(month)
+            entry_file.write(entry_text)
+            line_file.write(line_text)
+            totals = [total + delta for total, delta in zip(totals, run_totals)]
+            entry_count += run_entries
+            line_count += run_lines
+    finally:
+        for handle in (entry_file, line_file):
+            if handle:
+                handle.close()
+
+    expected = expected_ledger_reports(chart, totals, start, as_of)
+    for report_type, report in expected.items():
+        with open(os.path.join(out_dir, "expected", f"{report_type}.json"), 'w') as f:
+            json.dump(report, f, indent=2)
+    return {
+        "seed": seed,
+        "entries": entry_count,
+        "lines": line_count,
+        "accounts": len(chart),
+        "slices": len(slices),
+        "start": start,
+        "asOfDate": as_of,
+        "balanced": expected["trial_balance"]["isBalanced"] and expected["balance_sheet"]["isBalanced"],
+    }
+
+
+# Import-ready bulk output: one JSONL table per directory, chunked for the import tool
+BULK_TABLES = ("transactions_raw", "entries_final")
+BULK_CHUNK_ROWS = 1_000_000
+BULK_WRITER_THREADS = 2
+MOCK_ACCOUNT_ID = "mock_account_0001"
+
+
+def transactions_raw_lines(
+    columns: Dict[str, List[Any]],
+    user_id: str,
+    account_id: str,
+    org_id: Optional[str] = None,
+    id_prefix: str = "mock"
+) -> Iterator[str]:
+    """
+    Serialize bulk columns as transactions_raw documents, shaped like the
+    rows convex/mock_data.ts inserts (without location). Timestamps double
+    as postedAt and createdAt so output stays deterministic.
+    """
+    head = f'{{"userId":{json.dumps(user_id)},' + (f'"orgId":{json.dumps(org_id)},' if org_id else "")
+    head += f'"accountId":{json.dumps(account_id)},"currency":"USD","source":"mock","status":"posted",'
+    dates: Dict[str, str] = {}
+    tails: Dict[Tuple[str, str, bool, str], str] = {}
+    for index, (amount, date, timestamp, merchant, category, is_business, kind) in enumerate(zip(
+        *(columns[name] for name in TRANSACTION_COLUMNS)
+    )):
+        date_text = dates.get(date)
+        if date_text is None:
+            date_text = dates[date] = json.dumps(date)
+        tail = tails.get((merchant, category[0], is_business, kind))
+        if tail is None:
+            merchant_text = json.dumps(merchant)
+            tail = tails[(merchant, category[0], is_business, kind)] = (
+                f',"description":{merchant_text},"merchant":{merchant_text},"merchantName":{merchant_text},'
+                f'"category":{json.dumps(category)},"categoryName":{json.dumps(category[0])},'
+                f'"isBusiness":{json.dumps(is_business)},"transactionType":{json.dumps(kind)}}}\n'
+            )
+        # Formatted once, used three times
+        timestamp = str(timestamp)
+        yield (
+            f'{head}"transactionId":"{id_prefix}_{index:07d}","amount":{amount!r},"date":{date_text},'
+            f'"dateTimestamp":{timestamp},"postedAt":{timestamp},"createdAt":{timestamp}{tail}'
+        )
+
+
+def entries_final_lines(columns: Dict[str, List[Any]], user_id: str, org_id: Optional[str] = None) -> Iterator[str]:
+    """Serialize bulk columns as entries_final documents, one posted entry per transaction"""
+    user = json.dumps(user_id)
+    head = f'{{"userId":{user},' + (f'"orgId":{json.dumps(org_id)},' if org_id else "")
+    memos: Dict[str, str] = {}
+    for timestamp, merchant in zip(columns["dateTimestamp"], columns["merchant"]):
+        memo = memos.get(merchant)
+        if memo is None:
+            memo = memos[merchant] = json.dumps(merchant)
+        timestamp = str(timestamp)
+        yield (
+            f'{head}"date":{timestamp},"memo":{memo},"source":"manual","status":"posted",'
+            f'"createdAt":{timestamp},"approvedAt":{timestamp},"approvedBy":{user}}}\n'
+        )
+
+
+def _bulk_shard_lines(job: Tuple[Tuple[Any, ...], str, str, Optional[str]]) -> Tuple[List[str], List[str]]:
+    """Worker entry point: one task's transactions_raw and entries_final lines"""
+    task, user_id, account_id, org_id = job
+    columns = _generate_shard(task)
+    org_id = task[0] or org_id
+    # The task seed is unique per (org, first day), so it keeps transactionIds unique across shards
+    id_prefix = f"mock_{task[4]:016x}"
+    return (
+        list(transactions_raw_lines(columns, user_id, account_id, org_id, id_prefix)),
+        list(entries_final_lines(columns, user_id, org_id)),
+    )
+
+
+def write_bulk_tables(
+    out_dir: str,
+    tasks: Iterable[Tuple[Any, ...]],
+    user_id: str = MOCK_USER_ID,
+    account_id: str = MOCK_ACCOUNT_ID,
+    org_id: Optional[str] = None,
+    compress: bool = False,
+    max_rows: int = BULK_CHUNK_ROWS,
+    max_bytes: int = 0,
+    workers: int = 1,
+    threads: int = BULK_WRITER_THREADS,
+    meta: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Write plan_transaction_shards tasks as import-ready JSONL tables.
+
+    Shards are generated and serialized on a process pool, then split into
+    out_dir/<table>/<table>-NNNNN.jsonl[.gz] chunks of at most max_rows
+    lines and max_bytes uncompressed bytes, written by threads per table.
+    Documents carry no _id; userId, accountId and orgId should be ids that
+    exist in the target deployment. A manifest.json lists each chunk's
+    rows, bytes, on-disk size and SHA-256, after the entries of meta.
+
+    Returns:
+        The manifest
+    """
+    writers = {}
+    for table in BULK_TABLES:
+        os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+        writers[table] = NdjsonWriter(
+            os.path.join(out_dir, table, f"{table}.jsonl"), compress=compress,
+            max_rows=max_rows, max_bytes=max_bytes, threads=threads,
+        )
+    jobs = ((task, user_id, account_id, org_id) for task in tasks)
+    try:
+        for table_lines in _ordered_map(_bulk_shard_lines, jobs, workers):
+            for table, lines in zip(BULK_TABLES, table_lines):
+                writers[table].write(lines)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    manifest = dict(meta or {}, tables={})
+    for table, writer in writers.items():
+        files = [dict(entry, path=os.path.relpath(entry["path"], out_dir)) for entry in writer.files]
+        manifest["tables"][table] = {"rows": sum(entry["rows"] for entry in files), "files": files}
+    with open(os.path.join(out_dir, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
 def main():
     """Main function to run the script from command line"""
     import argparse
@@ -186,21 +1745,154 @@ def main():
     parser = argparse.ArgumentParser(description="Generate mock data date ranges")
     parser.add_argument("--months", type=int, default=3, help="Number of months to generate")
     parser.add_argument("--timezone", type=str, default=None, help="Timezone (e.g., America/New_York)")
-    parser.add_argument("--format", type=str, default="json", choices=["json", "dates"], help="Output format")
+    parser.add_argument("--format", type=str, default="json", choices=["json", "dates", "ndjson"],
+                        help="Output format; ndjson streams one date (or, with --transactions, one transaction) per line")
     parser.add_argument("--business-only", action="store_true", help="Only business hours")
     parser.add_argument("--personal-only", action="store_true", help="Only personal hours")
+    parser.add_argument("--transactions", type=int, default=0,
+                        help="Also generate this many transactions_raw-shaped rows across the range")
+    parser.add_argument("--transaction-type", type=str, default="mixed", choices=["business", "personal", "mixed"],
+                        help="Hour pattern for generated transactions")
+    parser.add_argument("--profile", type=str, default=DEFAULT_ARRIVAL_PROFILE, metavar="NAME|PATH",
+                        help=f"Arrival profile for generated transactions: {', '.join(ARRIVAL_PROFILES)} "
+                             "or a JSON file of hourly and weekday weights")
+    parser.add_argument("--daily-rate", type=float, default=None, metavar="RATE",
+                        help="Instead of --transactions, draw a Poisson count per day with this mean "
+                             "(scaled by the profile's weekday volume)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="With --format ndjson, seed for reproducible transactions (default: random)")
+    parser.add_argument("--orgs", type=int, default=1,
+                        help="With --format ndjson, split --transactions evenly over this many orgs (adds orgId)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="With --format ndjson, generator processes (default: available cores); "
+                             "output is identical for any count")
+    parser.add_argument("--end-date", type=str, default=None, metavar="YYYY-MM-DD",
+                        help="End the range on this day instead of today, for reproducible fixtures")
+    parser.add_argument("--ledger", type=str, default=None, metavar="OUT_DIR",
+                        help="Write a balanced double-entry ledger (accounts, entries_final, entry_lines) "
+                             "and its expected reports to OUT_DIR")
+    parser.add_argument("--entries", type=int, default=10000,
+                        help="With --ledger, number of journal entries before liability payments")
+    parser.add_argument("--chart", type=str, default=None, metavar="PATH",
+                        help="With --ledger, chart of accounts JSON (default: mock business chart)")
+    parser.add_argument("--bulk", type=str, default=None, metavar="OUT_DIR",
+                        help="Write --transactions (or --daily-rate) as import-ready transactions_raw and "
+                             "entries_final JSONL chunks plus manifest.json to OUT_DIR")
+    parser.add_argument("--user-id", type=str, default=MOCK_USER_ID,
+                        help="With --bulk, userId (and approvedBy) of every document")
+    parser.add_argument("--account-id", type=str, default=MOCK_ACCOUNT_ID,
+                        help="With --bulk, accountId of every transaction")
+    parser.add_argument("--org-id", type=str, default=None,
+                        help="With --bulk and a single org, orgId of every document")
+    parser.add_argument("--writer-threads", type=int, default=BULK_WRITER_THREADS,
+                        help="With --bulk, writer threads per table")
+    parser.add_argument("--calendar-cache", type=str, default=None, metavar="DIR",
+                        help=f"Keep calendar tables in DIR across runs (default: ${CALENDAR_CACHE_ENV})")
+    parser.add_argument("--output", type=str, default=None, metavar="PATH",
+                        help="With --format ndjson, write to PATH instead of stdout")
+    parser.add_argument("--gzip", action="store_true", help="With --format ndjson or --bulk, gzip the output")
+    parser.add_argument("--max-rows", type=int, default=0,
+                        help="With --output, rotate to a new numbered file after this many lines "
+                             f"(--bulk chunks default to {BULK_CHUNK_ROWS})")
+    parser.add_argument("--max-bytes", type=int, default=0,
+                        help="With --output or --bulk, rotate before a file exceeds this many uncompressed bytes")
     
     args = parser.parse_args()
+    if args.calendar_cache:
+        # Set in the environment so worker processes share the cache too
+        os.environ[CALENDAR_CACHE_ENV] = args.calendar_cache
     
     include_business = not args.personal_only
     include_personal = not args.business_only
+    try:
+        profile = load_arrival_profile(args.profile)
+    except (OSError, ValueError) as e:
+        parser.error(f"--profile: {e}")
+    if args.timezone:
+        try:
+            _time_core().resolve_timezone(args.timezone)
+        except ImportError as e:
+            # time_core.TimezoneSupportError: no zoneinfo or pytz for a named zone
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    if args.daily_rate is not None and (args.transactions or args.daily_rate < 0):
+        parser.error("--daily-rate must be non-negative and replaces --transactions")
+    
+    if args.ledger:
+        try:
+            chart = load_chart_of_accounts(args.chart)
+        except (OSError, ValueError) as e:
+            parser.error(f"--chart: {e}")
+        # Ledger dates are UTC, like the validator's month buckets
+        start_date, now = _date_range_bounds(args.months, None, args.end_date)
+        seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(63)
+        summary = generate_ledger(
+            args.ledger, start_date, now, args.entries, chart, seed, workers=args.workers or _available_cores()
+        )
+        print(json.dumps(summary, indent=2))
+        return summary
+
+    if args.bulk:
+        if not args.transactions and args.daily_rate is None:
+            parser.error("--bulk needs --transactions or --daily-rate")
+        start_date, now = _date_range_bounds(args.months, args.timezone, args.end_date)
+        seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(63)
+        tasks = plan_transaction_shards(
+            start_date, now, args.transactions, max(args.orgs, 1), seed, args.transaction_type,
+            args.timezone, include_business, include_personal, profile=profile, daily_rate=args.daily_rate
+        )
+        manifest = write_bulk_tables(
+            args.bulk, tasks, args.user_id, args.account_id, args.org_id, compress=args.gzip,
+            max_rows=args.max_rows or (0 if args.max_bytes else BULK_CHUNK_ROWS), max_bytes=args.max_bytes,
+            workers=args.workers or _available_cores(), threads=max(args.writer_threads, 0),
+            meta={"seed": seed, "start": start_date.date().isoformat(), "end": now.date().isoformat(),
+                  "timezone": args.timezone, "profile": profile["name"]},
+        )
+        print(json.dumps({
+            "seed": seed,
+            "rows": {table: manifest["tables"][table]["rows"] for table in BULK_TABLES},
+            "manifest": os.path.join(args.bulk, "manifest.json"),
+        }, indent=2))
+        return manifest
+
+    if args.format == "ndjson":
+        if (args.max_rows or args.max_bytes) and not args.output:
+            parser.error("--max-rows/--max-bytes need --output")
+        start_date, now = _date_range_bounds(args.months, args.timezone, args.end_date)
+        seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(63)
+        with NdjsonWriter(args.output, compress=args.gzip, max_rows=args.max_rows, max_bytes=args.max_bytes) as writer:
+            if args.transactions or args.daily_rate is not None:
+                tasks = plan_transaction_shards(
+                    start_date, now, args.transactions, max(args.orgs, 1), seed, args.transaction_type,
+                    args.timezone, include_business, include_personal, profile=profile, daily_rate=args.daily_rate
+                )
+                for lines in iter_sharded_lines(tasks, workers=args.workers or _available_cores()):
+                    writer.write(lines)
+            else:
+                writer.write(
+                    json.dumps(date_info, separators=(",", ":")) + "\n"
+                    for date_info in iter_dates(start_date, now, include_business, include_personal)
+                )
+        if args.output:
+            print(json.dumps({"seed": seed, "rows": sum(f["rows"] for f in writer.files), "files": writer.files}, indent=2))
+        return writer.files
     
+    if args.end_date:
+        parser.error("--end-date needs --format ndjson or --ledger")
     result = generate_date_ranges(
         months=args.months,
         timezone_name=args.timezone,
         include_business_hours=include_business,
         include_personal_hours=include_personal
     )
+    if args.transactions or args.daily_rate is not None:
+        day_counts = None
+        if args.daily_rate is not None:
+            day_counts = draw_daily_counts([date_info["day_of_week"] for date_info in result["dates"]], args.daily_rate, profile)
+        columns = generate_transactions_bulk(
+            result, args.transactions, transaction_type=args.transaction_type, profile=profile, day_counts=day_counts
+        )
+        result["transactions"] = list(iter_transaction_rows(columns))
     
     if args.format == "json":
         print(json.dumps(result, indent=2))
@@ -210,6 +1902,8 @@ def main():
         print(f"Timezone: {result['timezone']}")
         print(f"Start Timestamp: {result['start_timestamp']}")
         print(f"End Timestamp: {result['end_timestamp']}")
+        if "transactions" in result:
+            print(f"Transactions: {len(result['transactions'])}")
     
     return result
 
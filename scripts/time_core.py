@@ -0,0 +1,101 @@
+"""
+Time Core
+Timezone resolution shared by scripts/generate-mock-data.py and
+tests/utils/helpers/datetime-utils.py
+
+Nothing timezone-related is imported until a zone is first resolved:
+zoneinfo (or backports.zoneinfo) on the first lookup, and pytz only when
+zoneinfo is unavailable or does not know the name (e.g. no tzdata
+installed). Resolved zones are kept in an LRU keyed by name, so repeat
+lookups cost a dict hit. Neither typing nor datetime is imported here: these scripts
+are started thousands of times per CI run, so import time is budgeted
+(tests/utils/validation/benchmark-startup.py).
+"""
+
+from functools import lru_cache
+
+TIMEZONE_CACHE_SIZE = 256
+NO_TIMEZONE_SUPPORT = "Requires Python 3.9+ with zoneinfo or pytz package"
+
+
+class TimezoneSupportError(ImportError):
+    """Neither zoneinfo nor pytz is installed; the scripts' CLIs report it and exit 1"""
+
+
+@lru_cache(maxsize=None)
+def _zoneinfo():
+    """ZoneInfo class, or None without zoneinfo and backports.zoneinfo; imported on first call"""
+    try:
+        from zoneinfo import ZoneInfo
+    except ImportError:
+        try:
+            from backports.zoneinfo import ZoneInfo
+        except ImportError:
+            return None
+    return ZoneInfo
+
+
+@lru_cache(maxsize=None)
+def _pytz():
+    """pytz module, or None when it is not installed; imported on first call"""
+    try:
+        import pytz
+    except ImportError:
+        return None
+    return pytz
+
+
+def timezone_backend():
+    """Which library resolves names: "zoneinfo", "pytz", or None when neither is installed"""
+    if _zoneinfo() is not None:
+        return "zoneinfo"
+    return "pytz" if _pytz() is not None else None
+
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def resolve_timezone(timezone_name):
+    """
+    tzinfo for an IANA timezone name, cached per name.
+
+    Returns:
+        ZoneInfo (or pytz) timezone; None for local time ("local" or no name)
+        and for unknown names.
+
+    Raises:
+        TimezoneSupportError: a name is given but neither zoneinfo nor pytz is installed
+    """
+    if not timezone_name or timezone_name == "local":
+        return None
+    zone_info = _zoneinfo()
+    if zone_info is not None:
+        try:
+            return zone_info(timezone_name)
+        except Exception:
+            # ZoneInfoNotFoundError for unknown names, ValueError for malformed keys; pytz may still know it
+            pass
+    pytz = _pytz()
+    if pytz is None:
+        if zone_info is None:
+            raise TimezoneSupportError(NO_TIMEZONE_SUPPORT)
+        return None
+    try:
+        return pytz.timezone(timezone_name)
+    except Exception:
+        # pytz raises UnknownTimeZoneError (a KeyError) for unknown names
+        return None
+
+
+def localize(wall, tz):
+    """Attach tz to a naive wall-clock datetime (pytz zones need localize); tz None stays naive local time"""
+    if tz is None:
+        return wall
+    localize_wall = getattr(tz, "localize", None)
+    return localize_wall(wall) if localize_wall is not None else wall.replace(tzinfo=tz)
+
+
+def timezone_name(moment):
+    """IANA name of an aware datetime's zone (ZoneInfo key or pytz zone), None if naive"""
+    tz = moment.tzinfo
+    if tz is None:
+        return None
+    return getattr(tz, "key", None) or getattr(tz, "zone", None) or moment.tzname()
@@ -3,28 +3,247 @@
 Date and Time Utility Script
 Gets current date and time in a specific timezone
 Formats date as "Month Day, Year" and time as 12-hour AM/PM format
+Batch-formats epoch-millisecond timestamps the same way (format_timestamps, --epochs)
 
-Requires Python 3.9+ for zoneinfo support
+Requires Python 3.9+ for zoneinfo support (or pytz); timezones resolve
+through scripts/time_core.py when this file runs from its repo checkout
 """
 
+import os
 import sys
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 
-# Try to use zoneinfo (Python 3.9+), fall back to pytz if needed
-try:
-    from zoneinfo import ZoneInfo
-    HAS_ZONEINFO = True
-except ImportError:
+# Timezone lookups are shared with scripts/generate-mock-data.py when this file sits in its checkout
+TIME_CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts", "time_core.py")
+
+DAY_MS = 24 * 60 * 60 * 1000
+MINUTE_MS = 60 * 1000
+EPOCH_DATE = date(1970, 1, 1)
+FORMAT_FIELDS = ("date", "time", "datetime", "iso")
+# isoformat pieces: ":SS" per second and ".ffffff" per millisecond (empty on whole seconds)
+SECOND_TEXTS = tuple(f":{second:02d}" for second in range(60))
+MILLI_FRACTIONS = ("",) + tuple(f".{milli:03d}000" for milli in range(1, 1000))
+
+
+@lru_cache(maxsize=None)
+def _time_core():
+    """scripts/time_core.py (or an importable time_core), loaded on the first lookup; None when absent"""
+    if os.path.isfile(TIME_CORE_PATH):
+        import importlib.util
+
+        spec = importlib.util.spec_from_file_location("time_core", TIME_CORE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    try:
+        import time_core
+    except ImportError:
+        return None
+    return time_core
+
+
+@lru_cache(maxsize=None)
+def _standalone_timezone(timezone_name):
+    """The zoneinfo -> pytz lookup time_core does, for a copy of this file running on its own"""
     try:
-        from backports.zoneinfo import ZoneInfo
-        HAS_ZONEINFO = True
+        try:
+            from zoneinfo import ZoneInfo
+        except ImportError:
+            from backports.zoneinfo import ZoneInfo
     except ImportError:
         try:
             import pytz
-            HAS_ZONEINFO = False
         except ImportError:
-            print("Error: Requires Python 3.9+ with zoneinfo or pytz package", file=sys.stderr)
-            sys.exit(1)
+            # Same error time_core raises (its TimezoneSupportError is an ImportError)
+            raise ImportError("Requires Python 3.9+ with zoneinfo or pytz package") from None
+        try:
+            return pytz.timezone(timezone_name)
+        except Exception:
+            # pytz raises UnknownTimeZoneError (a KeyError) for unknown names
+            return None
+    try:
+        return ZoneInfo(timezone_name)
+    except Exception:
+        # ZoneInfoNotFoundError for unknown names, ValueError for malformed keys
+        return None
+
+
+def get_timezone(timezone_name):
+    """
+    Cached tzinfo for an IANA timezone name.
+    
+    Returns:
+        ZoneInfo (or pytz) timezone, or None for unknown names
+
+    Raises:
+        ImportError: neither zoneinfo nor pytz is installed
+    """
+    time_core = _time_core()
+    if time_core is None:
+        return _standalone_timezone(timezone_name) if timezone_name and timezone_name != "local" else None
+    return time_core.resolve_timezone(timezone_name)
+
+
+def _offset_text(offset_ms):
+    """UTC offset as isoformat prints it, e.g. -05:00 or +05:45"""
+    sign = "-" if offset_ms < 0 else "+"
+    minutes = abs(offset_ms) // MINUTE_MS
+    return f"{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class LocalFormatter:
+    """
+    Formats epoch milliseconds in one timezone, caching what repeats.
+    
+    The UTC offset is looked up once per UTC day; a day with a DST
+    transition is bisected once for the exact instant. Date strings are
+    built once per local day and time strings once per minute of the day,
+    so formatting a value is a few dict lookups and one f-string.
+    Output equals datetime.fromtimestamp(ms / 1000, tz) formatted the same
+    way as format_date_time.
+    """
+    
+    def __init__(self, timezone_name=None):
+        self.timezone_name = timezone_name
+        self.tz = get_timezone(timezone_name) if timezone_name else None
+        if timezone_name and self.tz is None:
+            print(f"Warning: Unknown timezone '{timezone_name}'. Using system timezone.", file=sys.stderr)
+        self._spans = {}
+        self._days = {}
+        self._times = {}
+        self._offsets = {}
+    
+    def utc_offset_ms(self, timestamp_ms):
+        """UTC offset in milliseconds at an instant, straight from the tz database"""
+        moment = datetime.fromtimestamp(timestamp_ms / 1000, self.tz)
+        offset = moment.utcoffset() if self.tz else moment.astimezone().utcoffset()
+        return int(offset.total_seconds() * 1000)
+    
+    def _span(self, utc_day):
+        """(offset before, transition instant, offset after) for one UTC day"""
+        span = self._spans.get(utc_day)
+        if span is None:
+            start = utc_day * DAY_MS
+            before = self.utc_offset_ms(start)
+            after = self.utc_offset_ms(start + DAY_MS - 1)
+            transition = start + DAY_MS
+            if after != before:
+                # Transitions fall on whole seconds: bisect for the first second with the new offset
+                low, high = start // 1000, (start + DAY_MS - 1) // 1000
+                while low < high:
+                    middle = (low + high) // 2
+                    if self.utc_offset_ms(middle * 1000) == before:
+                        low = middle + 1
+                    else:
+                        high = middle
+                transition = low * 1000
+            span = self._spans[utc_day] = (before, transition, after)
+        return span
+    
+    def _day(self, local_day):
+        """("Month DD, YYYY", "YYYY-MM-DDT") for a local day number since the epoch"""
+        day = self._days.get(local_day)
+        if day is None:
+            calendar_day = EPOCH_DATE + timedelta(days=local_day)
+            day = self._days[local_day] = (calendar_day.strftime("%B %d, %Y"), f"{calendar_day.isoformat()}T")
+        return day
+    
+    def _time(self, minute):
+        """("H:MM AM/PM", "HH:MM") for a minute of the day"""
+        text = self._times.get(minute)
+        if text is None:
+            hour = minute // 60
+            text = self._times[minute] = (
+                f"{(hour - 1) % 12 + 1}:{minute % 60:02d} {'AM' if hour < 12 else 'PM'}",
+                f"{hour:02d}:{minute % 60:02d}",
+            )
+        return text
+    
+    def _offset(self, offset_ms):
+        text = self._offsets.get(offset_ms)
+        if text is None:
+            # Naive local output, like datetime.now().isoformat(), carries no offset
+            text = self._offsets[offset_ms] = _offset_text(offset_ms) if self.tz else ""
+        return text
+    
+    def format_many(self, timestamps, fields=FORMAT_FIELDS):
+        """
+        Format epoch-millisecond timestamps.
+        
+        Args:
+            timestamps: Iterable (or NumPy array) of epoch milliseconds
+            fields: Any of "date", "time", "datetime" and "iso"
+        
+        Returns:
+            dict: One list of strings per requested field
+        """
+        if hasattr(timestamps, "tolist"):
+            timestamps = timestamps.tolist()
+        columns = {field: [] for field in fields}
+        dates = columns.get("date")
+        times = columns.get("time")
+        combined = columns.get("datetime")
+        isos = columns.get("iso")
+        days = self._days
+        minutes = self._times
+        span_day = None
+        before = transition = after = 0
+        before_text = after_text = ""
+        for value in timestamps:
+            if type(value) is int:
+                millis = value
+                fraction = MILLI_FRACTIONS[value % 1000]
+            else:
+                # Sub-millisecond input keeps microseconds, as datetime.fromtimestamp does
+                micros = round(value * 1000)
+                millis = micros // 1000
+                fraction = f".{micros % 1000000:06d}" if micros % 1000000 else ""
+            utc_day = millis // DAY_MS
+            if utc_day != span_day:
+                span_day = utc_day
+                before, transition, after = self._span(utc_day)
+                before_text, after_text = self._offset(before), self._offset(after)
+            if millis < transition:
+                offset, offset_text = before, before_text
+            else:
+                offset, offset_text = after, after_text
+            local_day, day_ms = divmod(millis + offset, DAY_MS)
+            day = days.get(local_day) or self._day(local_day)
+            minute = minutes.get(day_ms // MINUTE_MS) or self._time(day_ms // MINUTE_MS)
+            if dates is not None:
+                dates.append(day[0])
+            if times is not None:
+                times.append(minute[0])
+            if combined is not None:
+                combined.append(f"{day[0]} at {minute[0]}")
+            if isos is not None:
+                isos.append(f"{day[1]}{minute[1]}{SECOND_TEXTS[day_ms // 1000 % 60]}{fraction}{offset_text}")
+        return columns
+
+
+@lru_cache(maxsize=64)
+def get_formatter(timezone_name=None):
+    """Shared LocalFormatter per timezone, so caches survive across batches"""
+    return LocalFormatter(timezone_name)
+
+
+def format_timestamps(timestamps, timezone_name=None, fields=FORMAT_FIELDS):
+    """
+    Format many epoch-millisecond timestamps in a timezone at once.
+    
+    Args:
+        timestamps: Iterable (or NumPy array) of epoch milliseconds
+        timezone_name (str, optional): IANA timezone name; None uses system local time
+        fields: Any of "date" ("Month Day, Year"), "time" ("H:MM AM/PM"),
+                "datetime" ("<date> at <time>") and "iso"
+    
+    Returns:
+        dict: One list of strings per requested field, in input order
+    """
+    return get_formatter(timezone_name).format_many(timestamps, fields)
+
 
 def format_date_time(timezone_name=None):
     """
@@ -39,14 +258,10 @@ def format_date_time(timezone_name=None):
     """
     # Get current time in specified timezone
     if timezone_name:
-        try:
-            if HAS_ZONEINFO:
-                tz = ZoneInfo(timezone_name)
-                now = datetime.now(tz)
-            else:
-                tz = pytz.timezone(timezone_name)
-                now = datetime.now(tz)
-        except (ValueError, pytz.exceptions.UnknownTimeZoneError) as e:
+        tz = get_timezone(timezone_name)
+        if tz is not None:
+            now = datetime.now(tz)
+        else:
             print(f"Warning: Unknown timezone '{timezone_name}'. Using system timezone.", file=sys.stderr)
             now = datetime.now()
     else:
@@ -70,15 +285,44 @@ def format_date_time(timezone_name=None):
         "iso": now.isoformat()
     }
 
+def format_epoch_lines(lines, timezone_name=None, batch_size=1 << 16):
+    """
+    Format epoch-ms timestamps, one per line, as tab-separated date, time and ISO lines.
+    
+    Works in batches, so arbitrarily long inputs stream in constant memory.
+    """
+    values = (float(line) if "." in line else int(line) for line in map(str.strip, lines) if line)
+    formatter = get_formatter(timezone_name)
+    while True:
+        batch = list(islice(values, batch_size))
+        if not batch:
+            return
+        columns = formatter.format_many(batch, ("date", "time", "iso"))
+        for date_text, time_text, iso in zip(columns["date"], columns["time"], columns["iso"]):
+            yield f"{date_text}\t{time_text}\t{iso}\n"
+
+
 def main():
     """Main function to run the script from command line"""
     timezone = None
+    args = sys.argv[1:]
     
-    # Check for timezone argument
-    if len(sys.argv) > 1:
-        timezone = sys.argv[1]
-    
-    result = format_date_time(timezone)
+    try:
+        # --epochs: format epoch-ms timestamps from stdin instead of the current time
+        if "--epochs" in args:
+            args.remove("--epochs")
+            sys.stdout.writelines(format_epoch_lines(sys.stdin, args[0] if args else None))
+            return None
+        
+        # Check for timezone argument
+        if args:
+            timezone = args[0]
+        
+        result = format_date_time(timezone)
+    except ImportError as e:
+        # No zoneinfo or pytz for a named zone
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     
     # Print results
     print("Current Date and Time:")
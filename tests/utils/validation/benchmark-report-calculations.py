@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Financial Calculator Benchmarks
+Times the calculate_* and validate_* functions from validate-report-calculations.py
+on synthetic ledgers built from the day/hour patterns of scripts/generate-mock-data.py.
+Seeds are fixed, so every run measures the same rows; no network access is needed.
+"""
+
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VALIDATOR_PATH = os.path.join(HERE, "validate-report-calculations.py")
+MOCK_DATA_PATH = os.path.join(HERE, "..", "..", "..", "scripts", "generate-mock-data.py")
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_SEED = 20240101
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.15
+# Cases faster than this in the baseline are timer noise; their throughput is not flagged
+DEFAULT_MIN_TIME = 0.05
+
+# Synthetic ledgers span one year from a fixed UTC start so dates never depend on "now"
+BENCH_START_MS = 1704067200000  # 2024-01-01T00:00:00Z
+BENCH_DAYS = 366
+DAY_MS = 24 * 60 * 60 * 1000
+HOUR_MS = 60 * 60 * 1000
+
+CHART_OF_ACCOUNTS = (
+    ("asset", 12),
+    ("liability", 6),
+    ("equity", 3),
+    ("income", 6),
+    ("expense", 18),
+)
+CUSTOMER_COUNT = 1000
+
+
+def _load_module(name: str, path: str):
+    """Import a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_size(value: str) -> int:
+    """Row count with an optional k/M suffix, e.g. 100k or 10M"""
+    value = value.strip()
+    multiplier = {"k": 1_000, "K": 1_000, "m": 1_000_000, "M": 1_000_000}.get(value[-1:], 1)
+    if multiplier != 1:
+        value = value[:-1]
+    size = int(float(value) * multiplier)
+    if size <= 0:
+        raise ValueError(f"Size must be positive: {value}")
+    return size
+
+
+def weekday_patterns(mock) -> Dict[int, Dict[str, Any]]:
+    """
+    Day patterns (weekend flag, business and personal hours) keyed by weekday.
+
+    generate_date_ranges is anchored at "now", so only its per-weekday shape is
+    reused; the benchmark calendar itself starts at BENCH_START_MS.
+    """
+    patterns = {}
+    for day in mock.generate_date_ranges(months=1, timezone_name="UTC")["dates"]:
+        patterns.setdefault(day["day_of_week"], {
+            "is_weekend": day["is_weekend"],
+            "business_hours": day["business_hours"],
+            "personal_hours": day["personal_hours"],
+        })
+    return patterns
+
+
+class LedgerSynthesizer:
+    """Deterministic row generator following generate_transaction_times' mixed mode"""
+
+    def __init__(self, patterns: Dict[int, Dict[str, Any]], seed: int, size: int):
+        self.rng = random.Random(seed * 1_000_003 + size)
+        start_weekday = datetime.fromtimestamp(BENCH_START_MS / 1000, tz=timezone.utc).weekday()
+        self.days = [patterns[(start_weekday + day) % 7] for day in range(BENCH_DAYS)]
+        self.accounts = [
+            {"_id": f"acct_{account_type}_{i}", "type": account_type}
+            for account_type, count in CHART_OF_ACCOUNTS
+            for i in range(count)
+        ]
+
+    def timestamp(self) -> int:
+        """Epoch ms: 70% business hours on weekdays, personal hours otherwise"""
+        rng = self.rng
+        day_index = rng.randrange(BENCH_DAYS)
+        day = self.days[day_index]
+        if not day["is_weekend"] and day["business_hours"] and rng.random() < 0.7:
+            hours = day["business_hours"]
+        else:
+            hours = day["personal_hours"]
+        hour = rng.choice(hours) if hours else rng.randint(6, 23)
+        return BENCH_START_MS + day_index * DAY_MS + hour * HOUR_MS + rng.randrange(HOUR_MS // 1000) * 1000
+
+    def amount(self) -> float:
+        """Log-normal amount in dollars (median around $80), always whole cents"""
+        return max(1, int(self.rng.lognormvariate(9, 1.3))) / 100
+
+    def entry_lines(self, count: int) -> List[Dict[str, Any]]:
+        """Balanced two-line entries with denormalized dates"""
+        rng = self.rng
+        accounts = self.accounts
+        lines = []
+        for i in range(0, count - count % 2, 2):
+            amount = self.amount()
+            date = self.timestamp()
+            debit, credit = rng.sample(accounts, 2)
+            entry_id = f"entry_{i // 2}"
+            lines.append({"entryId": entry_id, "accountId": debit["_id"], "side": "debit", "amount": amount, "date": date})
+            lines.append({"entryId": entry_id, "accountId": credit["_id"], "side": "credit", "amount": amount, "date": date})
+        return lines
+
+    def trial_balance_entries(self, count: int) -> List[Dict[str, Any]]:
+        rng = self.rng
+        entries = []
+        for _ in range(count):
+            amount = self.amount()
+            if rng.random() < 0.5:
+                entries.append({"accountId": rng.choice(self.accounts)["_id"], "debit": amount, "credit": 0})
+            else:
+                entries.append({"accountId": rng.choice(self.accounts)["_id"], "debit": 0, "credit": amount})
+        return entries
+
+    def balance_items(self, count: int) -> List[Dict[str, Any]]:
+        return [{"name": f"item_{i}", "balance": self.amount()} for i in range(count)]
+
+    def invoices(self, count: int) -> List[Dict[str, Any]]:
+        rng = self.rng
+        return [
+            {"customer": f"customer_{rng.randrange(CUSTOMER_COUNT)}", "date": self.timestamp(), "amount": self.amount()}
+            for _ in range(count)
+        ]
+
+
+# Each dataset is built, benchmarked and released before the next so 10M-row runs
+# only hold one dataset at a time
+Case = Tuple[str, int, Callable[[], Any]]
+
+
+def ledger_cases(validator, synth: LedgerSynthesizer, size: int) -> List[Case]:
+    lines = synth.entry_lines(size)
+    as_of = BENCH_START_MS + BENCH_DAYS * DAY_MS
+    ledger = {"accounts": synth.accounts, "entry_lines": lines, "asOfDate": as_of}
+    report = validator.rebuild_trial_balance(validator.scan_ledger(synth.accounts, lines, cutoffs=[as_of]), as_of)
+    return [
+        ("scan_ledger", len(lines), lambda: validator.scan_ledger(synth.accounts, lines, cutoffs=[as_of])),
+        ("validate_against_ledger", len(lines), lambda: validator.validate_against_ledger(ledger, {"trial_balance": report})),
+    ]
+
+
+def trial_balance_cases(validator, synth: LedgerSynthesizer, size: int) -> List[Case]:
+    entries = synth.trial_balance_entries(size)
+    totals = validator.calculate_trial_balance(entries)
+    report = {
+        "entries": entries,
+        "totals": {"debits": totals["total_debits"], "credits": totals["total_credits"]},
+        "isBalanced": totals["is_balanced"],
+    }
+    return [
+        ("calculate_trial_balance", size, lambda: validator.calculate_trial_balance(entries)),
+        ("validate_trial_balance", size, lambda: validator.validate_trial_balance(report)),
+    ]
+
+
+def balance_sheet_cases(validator, synth: LedgerSynthesizer, size: int) -> List[Case]:
+    assets = synth.balance_items(size - 2 * (size // 4))
+    liabilities = synth.balance_items(size // 4)
+    equity = synth.balance_items(size // 4)
+    totals = validator.calculate_balance_sheet(assets, liabilities, equity, 0)
+    # Retained earnings close the gap so the report takes the balanced path
+    retained_earnings = round(totals["total_assets"] - totals["total_liabilities_and_equity"], 2)
+    totals = validator.calculate_balance_sheet(assets, liabilities, equity, retained_earnings)
+    report = {
+        "assets": {"items": assets, "total": totals["total_assets"]},
+        "liabilities": {"items": liabilities, "total": totals["total_liabilities"]},
+        "equity": {"items": equity, "retainedEarnings": retained_earnings, "total": totals["total_equity"]},
+        "totalLiabilitiesAndEquity": totals["total_liabilities_and_equity"],
+        "isBalanced": totals["is_balanced"],
+    }
+    return [
+        ("calculate_balance_sheet", size,
+         lambda: validator.calculate_balance_sheet(assets, liabilities, equity, retained_earnings)),
+        ("validate_balance_sheet", size, lambda: validator.validate_balance_sheet(report)),
+    ]
+
+
+def aging_cases(validator, synth: LedgerSynthesizer, size: int) -> List[Case]:
+    invoices = synth.invoices(size)
+    as_of = BENCH_START_MS + BENCH_DAYS * DAY_MS
+    aging = validator.age_invoices(invoices, as_of=as_of)
+    report = {
+        "invoices": invoices,
+        "asOfDate": as_of,
+        "agingBuckets": aging["buckets"],
+        "totalOutstanding": aging["total"],
+        "customers": [{"customer": name, "totalOwed": party["total"]} for name, party in aging["by_party"].items()],
+    }
+    return [
+        ("calculate_aging_buckets", size, lambda: validator.calculate_aging_buckets(invoices, as_of)),
+        ("age_invoices", size, lambda: validator.age_invoices(invoices, as_of=as_of)),
+        ("validate_accounts_receivable", size, lambda: validator.validate_accounts_receivable(report)),
+    ]
+
+
+def burn_rate_cases(validator, synth: LedgerSynthesizer, size: int) -> List[Case]:
+    burns = [synth.amount() for _ in range(size)]
+    ending_balance = round(sum(burns) / 2, 2)
+    calculated = validator.calculate_burn_rate(burns, ending_balance)
+    report = {
+        "monthlyBurns": [{"burn": burn} for burn in burns],
+        "endingBalance": ending_balance,
+        "averageMonthlyBurn": calculated["average_monthly_burn"],
+        "runwayMonths": calculated["runway_months"],
+    }
+    return [
+        ("calculate_burn_rate", size, lambda: validator.calculate_burn_rate(burns, ending_balance)),
+        ("validate_burn_rate", size, lambda: validator.validate_burn_rate(report)),
+    ]
+
+
+DATASETS = (
+    ("ledger", ledger_cases, ("scan_ledger", "validate_against_ledger")),
+    ("trial_balance", trial_balance_cases, ("calculate_trial_balance", "validate_trial_balance")),
+    ("balance_sheet", balance_sheet_cases, ("calculate_balance_sheet", "validate_balance_sheet")),
+    ("aging", aging_cases, ("calculate_aging_buckets", "age_invoices", "validate_accounts_receivable")),
+    ("burn_rate", burn_rate_cases, ("calculate_burn_rate", "validate_burn_rate")),
+)
+
+
+def measure(func: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    """Best and mean wall time over repeat runs, plus one traced run for peak allocation"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    result = {"best_s": min(timings), "mean_s": sum(timings) / len(timings)}
+    if memory:
+        # Traced separately: tracemalloc slows the timed runs several-fold
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    backends: Optional[Sequence[str]] = None,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    memory: bool = True,
+    cases: Optional[Sequence[str]] = None,
+    log=sys.stderr
+) -> Dict[str, Any]:
+    """
+    Benchmark every calculator and validator on each synthetic ledger size.
+
+    Args:
+        sizes: Row counts per dataset
+        backends: Validator backends (default: python, plus numpy when installed)
+        seed: Base seed; each size derives its own stream
+        repeat: Timed runs per case (best is reported)
+        memory: Also record tracemalloc peak bytes per case
+        cases: Optional case names to run (default: all)
+        log: Progress stream (None to silence)
+
+    Returns:
+        Results document with run metadata
+    """
+    validator = _load_module("validate_report_calculations", VALIDATOR_PATH)
+    mock = _load_module("generate_mock_data", MOCK_DATA_PATH)
+    patterns = weekday_patterns(mock)
+    if backends is None:
+        backends = ["python", "numpy"] if validator.HAS_NUMPY else ["python"]
+
+    results = []
+    for size in sizes:
+        for dataset, build, names in DATASETS:
+            if cases and not set(cases) & set(names):
+                continue
+            synth = LedgerSynthesizer(patterns, seed, size)
+            dataset_cases = [case for case in build(validator, synth, size) if not cases or case[0] in cases]
+            for backend in backends:
+                validator.set_backend(backend)
+                for name, rows, func in dataset_cases:
+                    measured = measure(func, repeat, memory)
+                    measured.update({
+                        "case": name,
+                        "dataset": dataset,
+                        "backend": validator._backend,
+                        "rows": rows,
+                        "rows_per_s": rows / measured["best_s"] if measured["best_s"] > 0 else None,
+                    })
+                    results.append(measured)
+                    if log:
+                        print(f"{name:<30} {validator._backend:<7} {rows:>10} rows  "
+                              f"{measured['best_s']:.4f}s  {measured['rows_per_s'] or 0:,.0f} rows/s", file=log)
+            del dataset_cases, synth
+            gc.collect()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": getattr(validator.np, "__version__", None),
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": list(sizes),
+            "peak_rss_bytes": validator.peak_rss_bytes(),
+        },
+        "results": results,
+    }
+
+
+def _result_key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+    return result["case"], result["backend"], result["rows"]
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_time: float = DEFAULT_MIN_TIME
+) -> Dict[str, Any]:
+    """
+    Flag cases whose throughput dropped or peak memory grew beyond threshold.
+
+    Args:
+        baseline: Stored results document
+        current: New results document
+        threshold: Allowed relative change, e.g. 0.15 for 15%
+        min_time: Baseline best time (s) below which throughput is not flagged
+
+    Returns:
+        Per-case ratios, regressions, and cases missing from either side
+    """
+    base_by_key = {_result_key(result): result for result in baseline.get("results", [])}
+    comparisons = []
+    regressions = []
+    for result in current.get("results", []):
+        base = base_by_key.pop(_result_key(result), None)
+        if base is None:
+            continue
+        entry = {"case": result["case"], "backend": result["backend"], "rows": result["rows"]}
+        if base.get("rows_per_s") and result.get("rows_per_s"):
+            entry["throughput_ratio"] = result["rows_per_s"] / base["rows_per_s"]
+            if entry["throughput_ratio"] < 1 - threshold and base.get("best_s", 0) >= min_time:
+                entry["regressed"] = "throughput"
+        if base.get("peak_bytes") and result.get("peak_bytes") is not None:
+            entry["memory_ratio"] = result["peak_bytes"] / base["peak_bytes"]
+            if entry["memory_ratio"] > 1 + threshold:
+                entry["regressed"] = "memory" if "regressed" not in entry else "throughput+memory"
+        comparisons.append(entry)
+        if "regressed" in entry:
+            regressions.append(entry)
+    current_keys = {_result_key(result) for result in current.get("results", [])}
+    return {
+        "threshold": threshold,
+        "valid": not regressions,
+        "comparisons": comparisons,
+        "regressions": regressions,
+        "missing": [list(key) for key in base_by_key if key not in current_keys],
+    }
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark report calculators on synthetic ledgers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suite")
+    run.add_argument("--sizes", type=str, default=",".join(str(size) for size in DEFAULT_SIZES),
+                     help="Comma-separated row counts, k/M suffixes allowed (e.g. 10k,100k,1M,10M)")
+    run.add_argument("--backend", type=str, default=None,
+                     help="Comma-separated backends (default: python, plus numpy when installed)")
+    run.add_argument("--cases", type=str, default=None, help="Comma-separated case names to run")
+    run.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Base random seed")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    run.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    run.add_argument("--out", type=str, default=None, help="Write results JSON here instead of stdout")
+
+    compare = commands.add_parser("compare", help="Compare results against a stored baseline")
+    compare.add_argument("baseline", help="Baseline results JSON")
+    compare.add_argument("current", help="Current results JSON")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Allowed relative slowdown or memory growth (default: 0.15)")
+    compare.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                         help="Ignore throughput changes for cases faster than this in the baseline (default: 0.05s)")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        try:
+            sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+        except ValueError as e:
+            print(f"Error: Invalid --sizes: {e}")
+            sys.exit(1)
+        results = run_benchmarks(
+            sizes=sizes,
+            backends=args.backend.split(",") if args.backend else None,
+            seed=args.seed,
+            repeat=max(1, args.repeat),
+            memory=not args.no_memory,
+            cases=args.cases.split(",") if args.cases else None,
+        )
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        else:
+            print(json.dumps(results, indent=2))
+        return
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        with open(args.current, 'r') as f:
+            current = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: File {e.filename} not found")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON: {e}")
+        sys.exit(1)
+
+    comparison = compare_results(baseline, current, threshold=args.threshold, min_time=args.min_time)
+    print(json.dumps(comparison, indent=2))
+    sys.exit(0 if comparison["valid"] else 1)
+
+
+if __name__ == "__main__":
+    main()
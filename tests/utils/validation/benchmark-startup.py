@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmarks
+Times cold starts of scripts/generate-mock-data.py and tests/utils/helpers/datetime-utils.py,
+and timezone resolution in scripts/time_core.py, against fixed budgets.
+Both scripts are started thousands of times per CI run, so the run exits non-zero
+when any measurement goes over its budget.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.normpath(os.path.join(HERE, "..", "..", "..", "scripts"))
+STARTUP_TARGETS = (
+    ("time_core", os.path.join(SCRIPTS_DIR, "time_core.py")),
+    ("generate-mock-data", os.path.join(SCRIPTS_DIR, "generate-mock-data.py")),
+    ("datetime-utils", os.path.normpath(os.path.join(HERE, "..", "helpers", "datetime-utils.py"))),
+)
+
+DEFAULT_REPEAT = 15
+DEFAULT_LOOKUPS = 200_000
+DEFAULT_SCALE = 1.0
+# Import budgets are milliseconds over a bare interpreter start; lookups are per call
+DEFAULT_BUDGETS = {
+    "import:time_core": 10.0,
+    "import:generate-mock-data": 50.0,
+    "import:datetime-utils": 15.0,
+    "resolve:first_ms": 20.0,
+    "resolve:cached_us": 1.0,
+}
+RESOLVE_NAMES = ("America/New_York", "Europe/London", "Asia/Kolkata", "Australia/Lord_Howe", "UTC")
+
+# Loads a file as a module without running its main(), like benchmark-report-calculations.py does.
+# With no path argument it only pays for importlib, which is the baseline subtracted from each target.
+LOAD_SNIPPET = """
+import importlib.util, sys
+if len(sys.argv) > 1:
+    spec = importlib.util.spec_from_file_location("startup_target", sys.argv[1])
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+# Runs in a fresh interpreter so the first lookup also pays for importing the timezone library
+RESOLVE_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import time_core
+names, lookups = sys.argv[3:], int(sys.argv[2])
+start = time.perf_counter()
+time_core.resolve_timezone(names[0])
+first = time.perf_counter() - start
+for name in names:
+    time_core.resolve_timezone(name)
+rounds = max(1, lookups // len(names))
+start = time.perf_counter()
+for _ in range(rounds):
+    for name in names:
+        time_core.resolve_timezone(name)
+cached = (time.perf_counter() - start) / (rounds * len(names))
+print(json.dumps({
+    "first_s": first,
+    "cached_s": cached,
+    "backend": time_core.timezone_backend(),
+    "pytz_loaded": "pytz" in sys.modules,
+}))
+"""
+
+
+def _run_seconds(args: Sequence[str]) -> float:
+    """Wall time of one interpreter run, failing loudly if the run itself fails"""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *args], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args[:1])} failed: {completed.stderr.strip()}")
+    return elapsed
+
+
+def measure_imports(repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Median cold-start import time per target in milliseconds, over a bare interpreter.
+
+    Runs are interleaved (baseline, then each target, repeat times) so drift in
+    machine load hits every target alike.
+    """
+    samples: Dict[str, List[float]] = {name: [] for name, _ in STARTUP_TARGETS}
+    baseline = []
+    for _ in range(repeat):
+        baseline.append(_run_seconds(["-c", LOAD_SNIPPET]))
+        for name, path in STARTUP_TARGETS:
+            samples[name].append(_run_seconds(["-c", LOAD_SNIPPET, path]))
+    base = statistics.median(baseline)
+    return {name: max(0.0, statistics.median(times) - base) * 1000 for name, times in samples.items()}
+
+
+def measure_resolution(repeat: int = DEFAULT_REPEAT, lookups: int = DEFAULT_LOOKUPS) -> Dict[str, Any]:
+    """Median first-lookup time (ms) and cached per-call time (us) of time_core.resolve_timezone"""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", RESOLVE_SNIPPET, SCRIPTS_DIR, str(lookups), *RESOLVE_NAMES],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"time_core lookup run failed: {completed.stderr.strip()}")
+        runs.append(json.loads(completed.stdout))
+    return {
+        "first_ms": statistics.median(run["first_s"] for run in runs) * 1000,
+        "cached_us": statistics.median(run["cached_s"] for run in runs) * 1_000_000,
+        "backend": runs[0]["backend"],
+        "pytz_loaded": any(run["pytz_loaded"] for run in runs),
+    }
+
+
+def run_benchmarks(
+    repeat: int = DEFAULT_REPEAT,
+    lookups: int = DEFAULT_LOOKUPS,
+    budgets: Optional[Dict[str, float]] = None,
+    scale: float = DEFAULT_SCALE
+) -> Dict[str, Any]:
+    """
+    Measure startup costs and check each against its budget.
+
+    Args:
+        repeat: Interpreter runs per measurement (the median is reported)
+        lookups: Cached lookups timed per run
+        budgets: Budget per check name (default: DEFAULT_BUDGETS)
+        scale: Multiplier for every budget, for slower machines
+
+    Returns:
+        Results document; "valid" is False when any check is over budget
+    """
+    budgets = budgets or DEFAULT_BUDGETS
+    measured = {f"import:{name}": value for name, value in measure_imports(repeat).items()}
+    resolution = measure_resolution(repeat, lookups)
+    measured["resolve:first_ms"] = resolution["first_ms"]
+    measured["resolve:cached_us"] = resolution["cached_us"]
+
+    checks = []
+    for name, value in measured.items():
+        budget = budgets[name] * scale
+        checks.append({
+            "check": name,
+            "value": round(value, 3),
+            "budget": round(budget, 3),
+            "unit": "us" if name.endswith("_us") else "ms",
+            "within_budget": value <= budget,
+        })
+    # zoneinfo knows every name above, so pytz must never have been imported
+    if resolution["backend"] == "zoneinfo":
+        checks.append({
+            "check": "resolve:pytz_not_imported",
+            "value": resolution["pytz_loaded"],
+            "budget": False,
+            "unit": None,
+            "within_budget": not resolution["pytz_loaded"],
+        })
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timezone_backend": resolution["backend"],
+            "repeat": repeat,
+            "lookups": lookups,
+            "scale": scale,
+        },
+        "valid": all(check["within_budget"] for check in checks),
+        "checks": checks,
+        "over_budget": [check["check"] for check in checks if not check["within_budget"]],
+    }
+
+
+def main():
+    """Main benchmark function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check script cold-start and timezone lookup costs against budgets")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Interpreter runs per measurement")
+    parser.add_argument("--lookups", type=int, default=DEFAULT_LOOKUPS, help="Cached lookups timed per run")
+    parser.add_argument("--scale", type=float, default=DEFAULT_SCALE,
+                        help="Multiply every budget, e.g. 2 on slow CI runners (default: 1.0)")
+    parser.add_argument("--budget", action="append", default=[], metavar="CHECK=VALUE",
+                        help="Override one budget, e.g. import:generate-mock-data=50 (repeatable)")
+    parser.add_argument("--out", type=str, default=None, help="Write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for override in args.budget:
+        name, _, value = override.partition("=")
+        if name not in budgets:
+            print(f"Error: Unknown budget '{name}'. Choose from: {', '.join(budgets)}")
+            sys.exit(1)
+        try:
+            budgets[name] = float(value)
+        except ValueError:
+            print(f"Error: Invalid budget value for {name}: {value}")
+            sys.exit(1)
+
+    try:
+        results = run_benchmarks(repeat=max(1, args.repeat), lookups=max(1, args.lookups),
+                                 budgets=budgets, scale=args.scale)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    sys.exit(0 if results["valid"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/generate-mock-data.py
+Run with: python -m unittest discover -s tests/utils/validation -p "test_*.py" (or pytest)
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_PATH = os.path.join(HERE, "..", "..", "..", "scripts", "generate-mock-data.py")
+
+
+def _load_module(name: str, path: str):
+    """Import a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+generator = _load_module("generate_mock_data", GENERATOR_PATH)
+
+END_DATE = "2026-03-31"
+
+
+def run_generator(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, GENERATOR_PATH, *args], capture_output=True)
+
+
+def read_output(path: str) -> bytes:
+    """A written file's lines, decompressed when gzipped"""
+    with (gzip.open if path.endswith(".gz") else open)(path, "rb") as f:
+        return f.read()
+
+
+def utc_date_ranges(months: int = 2):
+    """generate_date_ranges-shaped input pinned to END_DATE in UTC"""
+    start, end = generator._date_range_bounds(months, "UTC", END_DATE)
+    return {"dates": list(generator.iter_dates(start, end, timezone_name="UTC")), "timezone": "UTC"}
+
+
+class BulkTransactionTests(unittest.TestCase):
+    """generate_transactions_bulk rows must be transactions_raw-shaped on both sampling paths"""
+
+    def setUp(self):
+        self.date_ranges = utc_date_ranges()
+        self.dates = {date_info["date"]: date_info for date_info in self.date_ranges["dates"]}
+        self.slots = generator.hour_slot_epochs(self.date_ranges["dates"], "UTC")
+        # Business and personal categories share some names (e.g. Utilities) but not merchants
+        self.categories = {
+            (is_business, category["name"]): category
+            for is_business, categories in ((True, generator.BUSINESS_CATEGORIES), (False, generator.PERSONAL_CATEGORIES))
+            for category in categories
+        }
+
+    def _paths(self):
+        paths = [generator._bulk_transactions_python]
+        if generator.HAS_NUMPY:
+            paths.append(generator._bulk_transactions_numpy)
+        return paths
+
+    def _generate(self, path, count, transaction_type="mixed", seed=16, day_counts=None):
+        profile = generator.load_arrival_profile(None)
+        return path(self.date_ranges["dates"], self.slots, count, transaction_type, seed, profile, day_counts)
+
+    def assert_rows_shaped(self, columns, transaction_type):
+        rows = list(generator.iter_transaction_rows(columns))
+        self.assertEqual([row["date"] for row in rows], sorted(row["date"] for row in rows))
+        for row in rows:
+            self.assertEqual(set(row), set(generator.TRANSACTION_COLUMNS))
+            date_info = self.dates[row["date"]]
+            moment = datetime.fromtimestamp(row["dateTimestamp"] / 1000, timezone.utc)
+            self.assertEqual(moment.date(), date.fromisoformat(row["date"]))
+            if transaction_type == "business" and date_info["business_hours"]:
+                self.assertIn(moment.hour, date_info["business_hours"])
+            elif transaction_type != "business":
+                self.assertIn(moment.hour, date_info["business_hours"] + date_info["personal_hours"])
+
+            name, = row["category"]
+            category = self.categories[row["isBusiness"], name]
+            if transaction_type != "mixed":
+                self.assertEqual(row["isBusiness"], transaction_type == "business")
+            self.assertIn(row["merchant"], category["merchants"])
+            self.assertEqual(row["transactionType"], "credit" if category["isIncome"] else "debit")
+            self.assertEqual(row["amount"] > 0, category["isIncome"])
+            self.assertEqual(round(row["amount"], 2), row["amount"])
+            spread = category["avgAmount"] * generator.AMOUNT_VARIANCE + 0.01
+            self.assertLessEqual(abs(abs(row["amount"]) - category["avgAmount"]), spread)
+
+    def test_rows_are_transactions_raw_shaped(self):
+        for path in self._paths():
+            for transaction_type in ("mixed", "business", "personal"):
+                with self.subTest(path=path.__name__, transaction_type=transaction_type):
+                    columns = self._generate(path, 3000, transaction_type)
+                    self.assertEqual({name: len(values) for name, values in columns.items()},
+                                     {name: 3000 for name in generator.TRANSACTION_COLUMNS})
+                    self.assert_rows_shaped(columns, transaction_type)
+
+    def test_seed_and_day_counts(self):
+        day_counts = [index % 4 for index in range(len(self.date_ranges["dates"]))]
+        for path in self._paths():
+            with self.subTest(path=path.__name__):
+                self.assertEqual(self._generate(path, 500), self._generate(path, 500))
+                self.assertNotEqual(self._generate(path, 500), self._generate(path, 500, seed=17))
+                columns = self._generate(path, sum(day_counts), day_counts=day_counts)
+                per_day = [columns["date"].count(date_info["date"]) for date_info in self.date_ranges["dates"]]
+                self.assertEqual(per_day, day_counts)
+
+    def test_public_entry_point(self):
+        columns = generator.generate_transactions_bulk(self.date_ranges, 200, seed=3)
+        self.assertEqual(len(columns["amount"]), 200)
+        self.assert_rows_shaped(columns, "mixed")
+        self.assertEqual(generator.generate_transactions_bulk(self.date_ranges, 0),
+                         {name: [] for name in generator.TRANSACTION_COLUMNS})
+
+
+class NdjsonWriterTests(unittest.TestCase):
+    """NdjsonWriter must split lines across numbered files without losing, reordering or overfilling any"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.lines = [json.dumps({"row": index, "pad": "x" * (index % 37)}) + "\n" for index in range(1000)]
+
+    def _write(self, name, batches=4, **options):
+        writer = generator.NdjsonWriter(os.path.join(self.tmp, name, "events.ndjson"), **options)
+        os.makedirs(os.path.join(self.tmp, name))
+        with writer:
+            step = len(self.lines) // batches
+            for start in range(0, len(self.lines), step):
+                writer.write(iter(self.lines[start:start + step]))
+        return writer.files
+
+    def assert_files_hold_lines(self, files):
+        self.assertEqual(b"".join(read_output(entry["path"]) for entry in files), "".join(self.lines).encode())
+        for entry in files:
+            content = read_output(entry["path"])
+            self.assertEqual(entry["rows"], content.count(b"\n"))
+            self.assertEqual(entry["bytes"], len(content))
+            with open(entry["path"], "rb") as f:
+                on_disk = f.read()
+            self.assertEqual(entry["size"], len(on_disk))
+            self.assertEqual(entry["sha256"], hashlib.sha256(on_disk).hexdigest())
+
+    def test_rotate_by_rows(self):
+        files = self._write("rows", max_rows=100)
+        self.assertEqual([os.path.basename(entry["path"]) for entry in files],
+                         [f"events-{index:05d}.ndjson" for index in range(10)])
+        self.assertEqual([entry["rows"] for entry in files], [100] * 10)
+        self.assert_files_hold_lines(files)
+
+    def test_rotate_by_bytes_gzipped(self):
+        files = self._write("bytes", batches=3, compress=True, max_bytes=4096)
+        self.assertTrue(all(entry["path"].endswith(".ndjson.gz") for entry in files))
+        self.assertTrue(all(entry["bytes"] <= 4096 for entry in files))
+        # Each file is filled until the next line would not fit
+        written = 0
+        for entry in files[:-1]:
+            written += entry["rows"]
+            self.assertGreater(entry["bytes"] + len(self.lines[written]), 4096)
+        self.assert_files_hold_lines(files)
+
+    def test_oversized_line_gets_its_own_file(self):
+        self.lines[500] = json.dumps({"pad": "y" * 500}) + "\n"
+        files = self._write("oversized", max_bytes=256)
+        self.assertIn(1, [entry["rows"] for entry in files if entry["bytes"] > 256])
+        self.assert_files_hold_lines(files)
+
+    def test_writer_threads_and_gzip_are_deterministic(self):
+        serial = self._write("serial", compress=True, max_rows=150)
+        threaded = self._write("threaded", batches=7, compress=True, max_rows=150, threads=3)
+        self.assertEqual([(e["rows"], e["bytes"], e["size"], e["sha256"]) for e in serial],
+                         [(e["rows"], e["bytes"], e["size"], e["sha256"]) for e in threaded])
+        self.assert_files_hold_lines(threaded)
+
+    def test_rotation_needs_a_path(self):
+        with self.assertRaises(ValueError):
+            generator.NdjsonWriter(None, max_rows=10)
+
+
+class NdjsonCliTests(unittest.TestCase):
+    """--format ndjson streams the same transaction lines to stdout or to rotated, gzipped files"""
+
+    ARGS = ("--format", "ndjson", "--transactions", "500", "--months", "1", "--seed", "3",
+            "--end-date", END_DATE, "--timezone", "UTC")
+
+    def test_stdout_and_rotated_files_agree(self):
+        stdout = run_generator(*self.ARGS)
+        self.assertEqual(stdout.returncode, 0, stdout.stderr)
+        rows = [json.loads(line) for line in stdout.stdout.splitlines()]
+        self.assertEqual(len(rows), 500)
+        self.assertTrue(all(set(generator.TRANSACTION_COLUMNS) <= set(row) for row in rows))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "transactions.ndjson")
+            written = run_generator(*self.ARGS, "--output", output, "--gzip", "--max-rows", "200")
+            self.assertEqual(written.returncode, 0, written.stderr)
+            summary = json.loads(written.stdout)
+            self.assertEqual(summary["rows"], 500)
+            self.assertEqual([entry["rows"] for entry in summary["files"]], [200, 200, 100])
+            self.assertEqual(b"".join(read_output(entry["path"]) for entry in summary["files"]), stdout.stdout)
+
+    def test_rotation_without_output_is_rejected(self):
+        result = run_generator(*self.ARGS, "--max-rows", "10")
+        self.assertEqual(result.returncode, 2)
+        self.assertIn(b"--max-rows/--max-bytes need --output", result.stderr)
+
+
+def read_tree(root: str) -> dict:
+    """Every file under root by relative path, with its bytes"""
+    tree = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+class ShardingTests(unittest.TestCase):
+    """Seeded output depends on the arguments only, never on how many workers run the shards"""
+
+    ARGS = ("--transactions", "4000", "--orgs", "3", "--months", "2", "--seed", "18",
+            "--end-date", END_DATE, "--timezone", "UTC")
+
+    def test_plan_splits_counts_by_org_and_month(self):
+        start, end = generator._date_range_bounds(2, "UTC", END_DATE)
+        tasks = list(generator.plan_transaction_shards(start, end, 4000, 3, 18, timezone_name="UTC", chunk_rows=300))
+        rows = {}
+        for task in tasks:
+            org_id, first_day, days, count = task[:4]
+            rows[org_id] = rows.get(org_id, 0) + count
+            # Runs stay inside one month and hold about chunk_rows rows
+            last_day = date.fromisoformat(first_day) + timedelta(days=days - 1)
+            self.assertEqual(last_day.isoformat()[:7], first_day[:7])
+            self.assertLessEqual(count, 400)
+        self.assertEqual(rows, {"mock_org_00001": 1333, "mock_org_00002": 1333, "mock_org_00003": 1334})
+        self.assertEqual(len({task[4] for task in tasks}), len(tasks))
+
+    def test_ndjson_identical_across_workers(self):
+        for extra in ((), ("--daily-rate", "40", "--transactions", "0")):
+            with self.subTest(extra=extra):
+                outputs = []
+                for workers in ("1", "2"):
+                    result = run_generator("--format", "ndjson", *self.ARGS, *extra, "--workers", workers)
+                    self.assertEqual(result.returncode, 0, result.stderr)
+                    outputs.append(result.stdout)
+                self.assertEqual(outputs[0], outputs[1])
+                self.assertTrue(outputs[0])
+
+    def test_bulk_identical_across_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trees = []
+            for workers in ("1", "2"):
+                out_dir = os.path.join(tmp, workers)
+                result = run_generator("--bulk", out_dir, *self.ARGS, "--gzip", "--max-rows", "700",
+                                       "--workers", workers)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                trees.append(read_tree(out_dir))
+            self.assertEqual(trees[0], trees[1])
+            self.assertEqual(len(trees[0]), 1 + 2 * 6)
+
+
+class BulkTablesTests(unittest.TestCase):
+    """write_bulk_tables: the manifest must describe exactly the chunk files on disk"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        start, end = generator._date_range_bounds(2, "UTC", END_DATE)
+        self.tasks = list(generator.plan_transaction_shards(start, end, 2500, 2, 22, timezone_name="UTC", chunk_rows=400))
+
+    def _write(self, name, **options):
+        out_dir = os.path.join(self.tmp, name)
+        manifest = generator.write_bulk_tables(out_dir, iter(self.tasks), "user_1", "account_1", meta={"seed": 22}, **options)
+        return out_dir, manifest
+
+    def assert_manifest_matches_files(self, out_dir, manifest, max_rows):
+        with open(os.path.join(out_dir, "manifest.json")) as f:
+            self.assertEqual(json.load(f), manifest)
+        self.assertEqual(manifest["seed"], 22)
+        self.assertEqual(set(manifest["tables"]), set(generator.BULK_TABLES))
+        listed = set()
+        for table, summary in manifest["tables"].items():
+            self.assertEqual(summary["rows"], 2500)
+            self.assertEqual(sum(entry["rows"] for entry in summary["files"]), 2500)
+            for entry in summary["files"]:
+                path = os.path.join(out_dir, entry["path"])
+                listed.add(os.path.relpath(path, out_dir))
+                with open(path, "rb") as f:
+                    on_disk = f.read()
+                content = read_output(path)
+                self.assertEqual(entry["size"], len(on_disk))
+                self.assertEqual(entry["sha256"], hashlib.sha256(on_disk).hexdigest())
+                self.assertEqual(entry["rows"], content.count(b"\n"))
+                self.assertEqual(entry["bytes"], len(content))
+                self.assertLessEqual(entry["rows"], max_rows)
+        self.assertEqual(listed | {"manifest.json"}, set(read_tree(out_dir)))
+
+    def test_manifest_checksums(self):
+        for compress in (False, True):
+            with self.subTest(compress=compress):
+                out_dir, manifest = self._write(f"bulk-{compress}", compress=compress, max_rows=600)
+                self.assert_manifest_matches_files(out_dir, manifest, 600)
+                suffix = ".jsonl.gz" if compress else ".jsonl"
+                self.assertTrue(all(
+                    entry["path"].endswith(suffix) for summary in manifest["tables"].values() for entry in summary["files"]
+                ))
+
+    def test_tables_line_up(self):
+        out_dir, manifest = self._write("rows", max_rows=1000, threads=0)
+        tables = {
+            table: [
+                json.loads(line)
+                for entry in manifest["tables"][table]["files"]
+                for line in read_output(os.path.join(out_dir, entry["path"])).splitlines()
+            ]
+            for table in generator.BULK_TABLES
+        }
+        raw, entries = tables["transactions_raw"], tables["entries_final"]
+        self.assertEqual(len({row["transactionId"] for row in raw}), len(raw))
+        self.assertEqual({row["orgId"] for row in raw}, {"mock_org_00001", "mock_org_00002"})
+        for row, entry in zip(raw, entries):
+            self.assertNotIn("_id", row)
+            self.assertEqual((row["userId"], row["accountId"]), ("user_1", "account_1"))
+            self.assertEqual((entry["date"], entry["memo"], entry["orgId"]), (row["dateTimestamp"], row["merchant"], row["orgId"]))
+            self.assertEqual(row["categoryName"], row["category"][0])
+
+    def test_threads_do_not_change_bytes(self):
+        serial_dir, serial = self._write("serial", compress=True, max_rows=500, threads=0)
+        threaded_dir, threaded = self._write("threaded", compress=True, max_rows=500, threads=3)
+        self.assertEqual(serial, threaded)
+        self.assertEqual(read_tree(serial_dir), read_tree(threaded_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1093 @@
+#!/usr/bin/env python3
+"""
+Tests for validate-report-calculations.py
+Run with: python -m unittest discover -s tests/utils/validation -p "test_*.py" (or pytest)
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sqlite3
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+from decimal import Decimal, ROUND_HALF_UP
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VALIDATOR_PATH = os.path.join(HERE, "validate-report-calculations.py")
+GENERATOR_PATH = os.path.join(HERE, "..", "..", "..", "scripts", "generate-mock-data.py")
+TIME_CORE_PATH = os.path.join(HERE, "..", "..", "..", "scripts", "time_core.py")
+BENCHMARK_PATH = os.path.join(HERE, "benchmark-report-calculations.py")
+
+
+def _load_module(name: str, path: str):
+    """Import a hyphenated script as a module"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+validator = _load_module("validate_report_calculations", VALIDATOR_PATH)
+
+
+def decimal_cents(value) -> int:
+    """The pre-cents Decimal path: ROUND_HALF_UP on str(value), scaled to cents"""
+    return int(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
+
+
+def float_bits(value: float) -> bytes:
+    """IEEE-754 bytes, so 0.0 and -0.0 compare unequal"""
+    return struct.pack("<d", value)
+
+
+# Signed zeros and amounts that round to zero from either side
+SIGNED_ZERO_AMOUNTS = [0, 0.0, -0.0, 0.001, -0.001, 0.004, -0.004, 0.0049, -0.0049, "0", "-0", "-0.00", "-0.004"]
+# Half-cent ties and near-ties whose float is just below or above the tie
+HALF_CENT_AMOUNTS = [
+    0.005, -0.005, 0.015, -0.015, 0.125, 1.005, -1.005, 1.015, 2.675, -2.675, 8.345, 10.235, 1234.565,
+    0.0051, 0.00499, 1.00499999, 1.0050000001, 99999.995, -99999.995, "1.005", "-2.675", "0.125",
+]
+# Around the fast-path limit (1e11 dollars), the float precision limit (2**53) and the int64 range of _column_cents
+LARGE_AMOUNTS = [
+    1e11, -1e11, 99999999999.995, 100000000000.005, 123456789012.345, 2.0 ** 53, -(2.0 ** 53), 9e15, -9e15,
+    2 ** 53, -(2 ** 53), 10 ** 15, "12345678901234.565", "-90000000000000.005",
+]
+
+
+class StreamingTests(unittest.TestCase):
+    """--stream must hold one array element at a time, whatever sits before it"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def test_skip_matches_json_load(self):
+        # Brackets and escaped quotes inside strings must not move the bracket depth
+        data = {
+            "assets": {"items": [{"name": 'a "[{" \\ }]', "balance": 1.5, "nested": [[], {}, [1, [2]]]}] * 50},
+            "note": "}]\\\"",
+            "liabilities": {"total": 3, "items": [{"name": "loan", "balance": 2.25}, {"name": "card", "balance": 0.75}]},
+        }
+        path = self._write("report.json", data)
+        for chunk_size in (1, 7, 64, 1 << 16):
+            with open(path, 'r') as f:
+                reader = validator._JsonStreamReader(f, chunk_size=chunk_size)
+                rows = list(validator._iter_array_at(reader, ("liabilities", "items")))
+            self.assertEqual(rows, data["liabilities"]["items"])
+
+    def test_sibling_array_peak_memory(self):
+        # A large assets.items before liabilities.items used to be decoded whole while skipping it
+        data = {
+            "assets": {"items": [{"name": f"Asset {i}", "balance": i * 1.25} for i in range(40_000)], "total": 0},
+            "liabilities": {"items": [{"name": "Loan", "balance": 5.5}] * 10, "total": 55},
+            "equity": {"items": [], "total": 0},
+        }
+        path = self._write("balance_sheet.json", data)
+        size = os.path.getsize(path)
+        del data
+
+        tracemalloc.start()
+        try:
+            report = validator.load_report(path, stream=True)
+            total = sum(row["balance"] for row in report["liabilities"]["items"])
+            validator.validate_balance_sheet(report)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(total, 55)
+        self.assertLess(peak, size / 4, f"peak {peak} bytes for a {size}-byte report")
+
+    def test_skip_rejects_unterminated_value(self):
+        reader = validator._JsonStreamReader(io.StringIO('{"a": [1, "]", {'), chunk_size=4)
+        reader.expect("{")
+        reader.value()
+        reader.expect(":")
+        with self.assertRaises(json.JSONDecodeError):
+            reader.skip()
+
+
+class CentsTests(unittest.TestCase):
+    """to_cents and _column_cents must equal the Decimal path they replaced, exactly"""
+
+    def _amounts(self):
+        rng = random.Random(20240101)
+        randomized = [round(rng.uniform(-1e6, 1e6), rng.randint(0, 4)) for _ in range(5000)]
+        randomized += [rng.randint(-10 ** 9, 10 ** 9) / 1000 for _ in range(5000)]
+        randomized += [rng.randint(-10 ** 6, 10 ** 6) + 0.005 for _ in range(2000)]
+        return SIGNED_ZERO_AMOUNTS + HALF_CENT_AMOUNTS + LARGE_AMOUNTS + randomized
+
+    def test_to_cents_matches_decimal(self):
+        for value in self._amounts():
+            cents = validator.to_cents(value)
+            self.assertIs(type(cents), int, repr(value))
+            self.assertEqual(cents, decimal_cents(value), repr(value))
+
+    def test_cents_float_matches_decimal_float(self):
+        # cents / 100 is the float the calculators report for one rounded amount
+        for value in self._amounts():
+            reported = validator.to_cents(value) / 100
+            expected = float(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+            if expected == 0:
+                # Integer cents carry no sign: Decimal -0.00 reports 0.0 (see to_cents); never -0.0
+                self.assertEqual(float_bits(reported), float_bits(0.0), repr(value))
+            else:
+                self.assertEqual(float_bits(reported), float_bits(expected), repr(value))
+
+    @unittest.skipUnless(validator.HAS_NUMPY, "NumPy is not installed")
+    def test_column_cents_matches_decimal(self):
+        amounts = self._amounts()
+        columns = {
+            "float": [float(value) for value in amounts],
+            "int": [int(value) for value in amounts if type(value) is int],
+            "mixed": amounts,
+        }
+        for name, values in columns.items():
+            cents = validator._column_cents(values)
+            self.assertEqual(str(cents.dtype), "int64", name)
+            self.assertEqual(cents.tolist(), [decimal_cents(value) for value in values], name)
+
+    def test_cash_flow_signed_zero(self):
+        # -Decimal('0.00') is 0.00, so a zero change in assets never reports -0.0
+        for value in SIGNED_ZERO_AMOUNTS:
+            result = validator.calculate_cash_flow(0, value, 0)
+            expected = float(-Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+            self.assertEqual(float_bits(result["change_in_current_assets"]), float_bits(expected), repr(value))
+            self.assertEqual(json.dumps(result["change_in_current_assets"]), "0.0")
+
+
+DAY_MS = 24 * 60 * 60 * 1000
+JAN_1 = 1704067200000  # 2024-01-01T00:00:00Z
+FEB_1 = 1706745600000  # 2024-02-01T00:00:00Z
+MAR_1 = 1709251200000  # 2024-03-01T00:00:00Z
+# mtime for ledger files written long before any checkpoint (2001-09-09)
+OLD_MTIME_NS = 1_000_000_000 * 10 ** 9
+
+
+def journal(entry_id, date, debit_account, credit_account, amount, dated=True):
+    """Two balanced entry lines; undated lines take their date from entries_final"""
+    return [
+        dict({"entryId": entry_id, "accountId": account_id, "side": side, "amount": amount},
+             **({"date": date} if dated else {}))
+        for account_id, side in ((debit_account, "debit"), (credit_account, "credit"))
+    ]
+
+
+class LedgerRebuildTests(unittest.TestCase):
+    """Every ledger report is rebuilt from raw entry lines in one pass and compared field by field"""
+
+    def setUp(self):
+        self.ledger = {
+            "asOfDate": MAR_1 - 1,
+            "accounts": [
+                {"_id": "cash", "type": "asset"}, {"_id": "loan", "type": "liability"},
+                {"_id": "capital", "type": "equity"}, {"_id": "sales", "type": "income"},
+                {"_id": "rent", "type": "expense"},
+            ],
+            "entries_final": [{"_id": "e4", "date": FEB_1 + 2 * DAY_MS}],
+        }
+        self.lines = (
+            journal("e1", JAN_1 + 4 * DAY_MS, "cash", "capital", 1000)
+            + journal("e2", JAN_1 + 9 * DAY_MS, "cash", "sales", 300)
+            + journal("e3", JAN_1 + 19 * DAY_MS, "rent", "cash", 500)
+            + journal("e4", None, "cash", "loan", 200, dated=False)
+            + journal("e5", FEB_1 + 9 * DAY_MS, "cash", "sales", 150.25)
+            + journal("e6", FEB_1 + 14 * DAY_MS, "rent", "cash", 400)
+            # After the as-of date: in no report
+            + journal("e7", MAR_1 + 4 * DAY_MS, "cash", "sales", 99)
+        )
+        # Worked by hand: cash 750.25, loan 200, capital 1000, sales 450.25, rent 900 at the end of February
+        self.reports = {
+            "trial_balance": {"asOfDate": MAR_1 - 1, "totals": {"debits": 1650.25, "credits": 1650.25}, "isBalanced": True},
+            "balance_sheet": {
+                "asOfDate": MAR_1 - 1,
+                "assets": {"total": 750.25},
+                "liabilities": {"total": 200},
+                "equity": {"total": 1000, "retainedEarnings": -449.75},
+                "totalLiabilitiesAndEquity": 750.25,
+            },
+            "pnl": {"dateRange": {"start": FEB_1, "end": MAR_1 - 1}, "revenue": {"total": 150.25},
+                    "expenses": {"total": 400}, "netIncome": -249.75},
+            "burn_rate": {
+                "endingBalance": 750.25,
+                "averageMonthlyBurn": 224.875,
+                "monthlyBurns": [
+                    {"month": "2024-01", "revenue": 300, "expenses": 500, "burn": 200},
+                    {"month": "2024-02", "burn": 249.75},
+                ],
+            },
+        }
+
+    def test_rebuilds_every_report_in_one_pass(self):
+        # A generator can only be read once, so every report must come out of the same scan
+        ledger = dict(self.ledger, entry_lines=(line for line in self.lines))
+        result = validator.validate_against_ledger(ledger, self.reports)
+        self.assertTrue(result["valid"], json.dumps(result, indent=2))
+        self.assertEqual(result["lines_scanned"], len(self.lines))
+        self.assertEqual(result["unknown_accounts"], [])
+        self.assertEqual(set(result["reports"]), set(self.reports))
+
+    def test_reports_each_mismatched_field(self):
+        self.reports["pnl"]["revenue"]["total"] = 150.35
+        self.reports["burn_rate"]["monthlyBurns"][0]["expenses"] = 400
+        self.lines += journal("e8", FEB_1, "cash", "suspense", 5)
+        result = validator.validate_against_ledger(dict(self.ledger, entry_lines=self.lines), self.reports)
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["unknown_accounts"], ["suspense"])
+        self.assertAlmostEqual(result["reports"]["pnl"]["discrepancies"]["revenue"], 0.1)
+        self.assertEqual(result["reports"]["burn_rate"]["discrepancies"]["expenses[2024-01]"], 100)
+        # The suspense side is left out, so the cash side of e8 shows up unbalanced
+        self.assertEqual(result["reports"]["trial_balance"]["discrepancies"]["debits"], 5)
+        self.assertEqual(result["reports"]["balance_sheet"]["discrepancies"]["total_assets"], 5)
+
+
+class LedgerCheckpointTests(unittest.TestCase):
+    """A checkpointed run must reuse unchanged slices cheaply and never reuse stale ones"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ledger = os.path.join(self.tmp.name, "ledger")
+        os.makedirs(os.path.join(self.ledger, "entry_lines"))
+        with open(os.path.join(self.ledger, "accounts.json"), 'w') as f:
+            json.dump({"orgId": "org1", "asOfDate": MAR_1 + 10 * DAY_MS, "accounts": [
+                {"_id": "cash", "type": "asset"}, {"_id": "sales", "type": "income"},
+            ]}, f)
+        # January lines carry their dates; February lines predate denormalized dates
+        self._write_lines("2024-01.ndjson", [
+            {"entryId": "j1", "accountId": "cash", "side": "debit", "amount": 10.5, "date": JAN_1 + DAY_MS},
+            {"entryId": "j1", "accountId": "sales", "side": "credit", "amount": 10.5, "date": JAN_1 + DAY_MS},
+        ])
+        self._write_lines("2024-02.ndjson", [
+            {"entryId": "f1", "accountId": "cash", "side": "debit", "amount": 4.25},
+            {"entryId": "f1", "accountId": "sales", "side": "credit", "amount": 4.25},
+        ])
+        self._write_entries({"f1": FEB_1 + DAY_MS}, mtime_ns=OLD_MTIME_NS)
+        self.reports = {"pnl": {"dateRange": {"start": FEB_1, "end": MAR_1 - 1}}}
+        self.store_path = os.path.join(self.tmp.name, "checkpoint.sqlite")
+
+    def _write_lines(self, name, lines, mtime_ns=OLD_MTIME_NS):
+        path = os.path.join(self.ledger, "entry_lines", name)
+        with open(path, 'w') as f:
+            f.writelines(json.dumps(line) + "\n" for line in lines)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def _write_entries(self, dates, mtime_ns=None):
+        path = os.path.join(self.ledger, "entries_final.ndjson")
+        with open(path, 'w') as f:
+            f.writelines(json.dumps({"_id": entry_id, "date": date}) + "\n" for entry_id, date in dates.items())
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def _run(self):
+        store = validator.CheckpointStore(self.store_path)
+        try:
+            result = validator.validate_ledger_dir(self.ledger, self.reports, store=store)
+        finally:
+            store.close()
+        fresh = validator.validate_ledger_dir(self.ledger, self.reports)
+        checkpoint = result.pop("checkpoint")
+        fresh.pop("checkpoint")
+        self.assertEqual(result, fresh)
+        return checkpoint
+
+    def test_unchanged_slices_skip_hashing_and_entries(self):
+        self._run()
+        store = validator.CheckpointStore(self.store_path)
+        self.addCleanup(store.close)
+        with mock.patch.object(validator, "_file_digest", wraps=validator._file_digest) as digest, \
+                mock.patch.object(validator, "_iter_ndjson", wraps=validator._iter_ndjson) as iter_ndjson:
+            result = validator.validate_ledger_dir(self.ledger, self.reports, store=store)
+        self.assertEqual(result["checkpoint"]["reused"], 2)
+        digest.assert_not_called()
+        iter_ndjson.assert_not_called()
+
+    def test_touched_slice_is_hashed_once_and_reused(self):
+        self._run()
+        path = os.path.join(self.ledger, "entry_lines", "2024-01.ndjson")
+        os.utime(path, ns=(1, 1))
+        with mock.patch.object(validator, "_file_digest", wraps=validator._file_digest) as digest:
+            self.assertEqual(self._run()["reused"], 2)
+        digest.assert_called_once_with(path)
+        with mock.patch.object(validator, "_file_digest", wraps=validator._file_digest) as digest:
+            self.assertEqual(self._run()["reused"], 2)
+        digest.assert_not_called()
+
+    def test_same_size_rewrite_within_one_mtime_tick_is_rescanned(self):
+        now = time.time_ns()
+        lines = [
+            {"entryId": "f1", "accountId": "cash", "side": "debit", "amount": 4.25},
+            {"entryId": "f1", "accountId": "sales", "side": "credit", "amount": 4.25},
+        ]
+        self._write_lines("2024-02.ndjson", lines, mtime_ns=now)
+        self._run()
+        # Same size and mtime, new amounts: only the content hash can tell
+        for line in lines:
+            line["amount"] = 9.25
+        self._write_lines("2024-02.ndjson", lines, mtime_ns=now)
+        self.assertEqual(self._run()["rescanned"], 1)
+
+    def test_entry_date_change_rescans_undated_slice(self):
+        self.assertEqual(self._run()["rescanned"], 2)
+        # Unrelated entries do not touch the February slice's dates
+        self._write_entries({"f1": FEB_1 + DAY_MS, "x9": JAN_1}, mtime_ns=1)
+        self.assertEqual(self._run()["reused"], 2)
+        # Moving f1 into March moves the undated lines out of the P&L range
+        self._write_entries({"f1": MAR_1 + DAY_MS, "x9": JAN_1}, mtime_ns=2)
+        self.assertEqual(self._run(), {"org_id": "org1", "slices": 2, "reused": 1, "rescanned": 1})
+        self.assertEqual(self._run()["reused"], 2)
+
+    def test_monthly_entries_final_slices(self):
+        os.remove(os.path.join(self.ledger, "entries_final.ndjson"))
+        os.makedirs(os.path.join(self.ledger, "entries_final"))
+        for name, dates in (("2024-01.ndjson", {"j1": JAN_1 + DAY_MS}), ("2024-02.ndjson", {"f1": FEB_1 + DAY_MS})):
+            path = os.path.join(self.ledger, "entries_final", name)
+            with open(path, 'w') as f:
+                f.writelines(json.dumps({"_id": entry_id, "date": date}) + "\n" for entry_id, date in dates.items())
+            os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+        self.assertEqual(self._run()["rescanned"], 2)
+        result = validator.validate_ledger_dir(self.ledger, self.reports)
+        self.assertEqual(result["reports"]["pnl"]["calculated"]["revenue"], 4.25)
+        self.assertEqual(validator.load_ledger_dir(self.ledger)["entries_final"], {"j1": JAN_1 + DAY_MS, "f1": FEB_1 + DAY_MS})
+        # Moving f1 into March in its monthly slice rescans the undated February lines
+        path = os.path.join(self.ledger, "entries_final", "2024-02.ndjson")
+        with open(path, 'w') as f:
+            f.write(json.dumps({"_id": "f1", "date": MAR_1 + DAY_MS}) + "\n")
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(self._run(), {"org_id": "org1", "slices": 2, "reused": 1, "rescanned": 1})
+
+    def test_refuses_to_overwrite_other_files(self):
+        text_path = os.path.join(self.tmp.name, "report.json")
+        with open(text_path, 'w') as f:
+            f.write('{"not": "a checkpoint"}' * 100)
+        foreign_path = os.path.join(self.tmp.name, "app.sqlite")
+        with contextlib.closing(sqlite3.connect(foreign_path)) as conn:
+            conn.execute("CREATE TABLE meta (key TEXT, value TEXT)")
+            conn.execute("INSERT INTO meta VALUES ('owner', 'someone else')")
+            conn.commit()
+        for path in (text_path, foreign_path):
+            with open(path, 'rb') as f:
+                before = f.read()
+            with self.assertRaises(ValueError):
+                validator.CheckpointStore(path)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), before, path)
+
+    def test_rebuilds_outdated_checkpoint(self):
+        with contextlib.closing(sqlite3.connect(self.store_path)) as conn:
+            conn.executescript(
+                "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+                "CREATE TABLE slices (org_id TEXT, slice TEXT, content_hash TEXT);"
+                "CREATE TABLE aggregates (org_id TEXT, slice TEXT);"
+                "INSERT INTO meta VALUES ('schema_version', '1');"
+            )
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(self._run()["rescanned"], 2)
+        self.assertIn("Rebuilding", stderr.getvalue())
+        self.assertEqual(self._run()["reused"], 2)
+
+
+
+class AgingTests(unittest.TestCase):
+    """Odd invoice dates age like the original age comparisons, on every backend"""
+
+    AS_OF = 100 * DAY_MS
+    INVOICES = [
+        {"customer": "a", "date": float("nan"), "amount": 1},
+        {"customer": "a", "date": float("inf"), "amount": 2},
+        {"customer": "b", "date": -float("inf"), "amount": 4},
+        {"customer": "b", "amount": 8},
+        {"customer": "b", "date": 100 * DAY_MS - 45 * DAY_MS, "amount": 32},
+    ]
+    EXPECTED = {"0-30": 10.0, "31-60": 32.0, "61-90": 0.0, "90+": 5.0}
+
+    def tearDown(self):
+        validator.set_backend("python")
+
+    def _backends(self):
+        return ("python", "numpy") if validator.HAS_NUMPY else ("python",)
+
+    def test_nan_and_infinite_dates(self):
+        for backend in self._backends():
+            validator.set_backend(backend)
+            self.assertEqual(validator.calculate_aging_buckets(self.INVOICES, self.AS_OF), self.EXPECTED, backend)
+            aging = validator.age_invoices(self.INVOICES, as_of=self.AS_OF)
+            self.assertEqual(aging["buckets"], self.EXPECTED, backend)
+            self.assertEqual(aging["by_party"]["a"]["buckets"]["90+"], 1.0, backend)
+
+    def test_rejects_non_numeric_dates(self):
+        for backend in self._backends():
+            validator.set_backend(backend)
+            for date in ("2024-01-01", "1700000000000", True):
+                with self.assertRaises(ValueError):
+                    validator.calculate_aging_buckets([{"date": date, "amount": 1}], self.AS_OF)
+                with self.assertRaises(ValueError):
+                    validator.age_invoices([{"date": date, "amount": 1}], as_of=self.AS_OF)
+
+
+
+@unittest.skipUnless(validator.HAS_NUMPY, "NumPy is not installed")
+class BackendTests(unittest.TestCase):
+    """--backend numpy must report exactly what the python backend reports"""
+
+    AS_OF = MAR_1
+
+    def setUp(self):
+        rng = random.Random(4)
+        amounts = SIGNED_ZERO_AMOUNTS + HALF_CENT_AMOUNTS + [
+            round(rng.uniform(-1e6, 1e6), rng.randint(0, 4)) for _ in range(20_000)
+        ]
+        rng.shuffle(amounts)
+        self.entries = [
+            {"account": f"a{i % 97}", "debit": amount, "credit": 0} if i % 2 else
+            {"account": f"a{i % 97}", "debit": 0, "credit": amount}
+            for i, amount in enumerate(amounts)
+        ]
+        # Balances and aging amounts are summed as numbers; only entries take amount strings
+        numbers = [amount for amount in amounts if not isinstance(amount, str)]
+        self.items = [{"name": f"item {i}", "balance": amount} for i, amount in enumerate(numbers)]
+        # Dates on and either side of every bucket edge, plus undated rows
+        edges = [self.AS_OF - days * DAY_MS + offset for days in (0, 30, 60, 90) for offset in (-1, 0, 1)]
+        self.transactions = [
+            {"date": rng.choice(edges) if i % 3 else self.AS_OF - rng.randint(0, 400) * DAY_MS, "amount": amount}
+            for i, amount in enumerate(numbers)
+        ] + [{"amount": 12.5}, {"date": None, "amount": -3.25}]
+
+    def tearDown(self):
+        validator.set_backend("python")
+
+    def _on_each_backend(self, calculate):
+        results = []
+        for backend in ("python", "numpy"):
+            self.assertEqual(validator.set_backend(backend), backend)
+            results.append(json.dumps(calculate()))
+        self.assertEqual(results[1], results[0])
+
+    def test_trial_balance(self):
+        self._on_each_backend(lambda: validator.calculate_trial_balance(self.entries))
+        self._on_each_backend(lambda: validator.validate_trial_balance({
+            "entries": self.entries, "totals": {"debits": 1, "credits": 1}, "isBalanced": False,
+        }))
+
+    def test_balance_sheet(self):
+        half = len(self.items) // 2
+        self._on_each_backend(lambda: validator.calculate_balance_sheet(
+            self.items[:half], self.items[half:], self.items[:100], 1234.565
+        ))
+
+    def test_aging_buckets(self):
+        for bucket_edges in (validator.AGING_BUCKET_EDGES, (7, 14, 30, 45, 60, 90, 180)):
+            self._on_each_backend(
+                lambda: validator.calculate_aging_buckets(self.transactions, self.AS_OF, bucket_edges)
+            )
+            self._on_each_backend(lambda: validator.age_invoices(
+                self.transactions, as_of=self.AS_OF, bucket_edges=bucket_edges
+            ))
+
+PNL_DATA = {"revenue": {"total": 100}, "expenses": {"total": 40}, "netIncome": 60, "grossMargin": 60}
+
+
+class OrgShardTests(unittest.TestCase):
+    """Multi-org exports: top-level orgIds, file references and per-line failures"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.export_dir = os.path.join(self.tmp.name, "export")
+        os.makedirs(self.export_dir)
+        self.export_path = os.path.join(self.export_dir, "orgs.ndjson")
+
+    def _write_export(self, lines):
+        with open(self.export_path, 'w') as f:
+            f.writelines(json.dumps(line) + "\n" for line in lines)
+
+    def test_nested_org_id_is_ignored(self):
+        self._write_export([
+            {"report_type": "pnl", "data": dict(PNL_DATA, orgId="nested"), "orgId": "outer"},
+            {"orgId": "first", "report_type": "pnl", "data": dict(PNL_DATA, orgId="nested")},
+            {"report_type": "pnl", "data": dict(PNL_DATA, orgId="nested")},
+        ])
+        index = validator.index_org_export(self.export_path)
+        self.assertEqual(sorted(index), ["first", "outer", validator.UNKNOWN_ORG])
+
+    def test_file_references_resolve_against_export_and_count_toward_budget(self):
+        with open(os.path.join(self.export_dir, "pnl.json"), 'w') as f:
+            json.dump(dict(PNL_DATA, padding="x" * 5000), f)
+        self._write_export([{"orgId": "org1", "report_type": "pnl", "file": "pnl.json"}] * 3)
+        index = validator.index_org_export(self.export_path)
+        self.assertTrue(all(cost > 5000 for _, _, _, cost in index["org1"]))
+        self.assertEqual(len(validator.plan_org_shards(index, max_shard_bytes=12000)), 2)
+
+        # Run from elsewhere: paths must not depend on the working directory
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        summary = validator.run_org_shards(self.export_path, workers=1, max_shard_bytes=1000)
+        self.assertEqual((summary["total"], summary["passed"], summary["errors"]), (3, 3, 0), summary)
+
+    def test_spill_failure_is_a_per_org_error(self):
+        self._write_export([
+            {"orgId": "big", "report_type": "pnl", "data": dict(PNL_DATA, padding="x" * 5000)},
+            {"orgId": "small", "report_type": "pnl", "data": PNL_DATA},
+        ])
+        with mock.patch("tempfile.mkstemp", side_effect=OSError(28, "No space left on device")):
+            summary = validator.run_org_shards(self.export_path, workers=1, max_shard_bytes=1000)
+        self.assertEqual(summary["organizations"]["big"]["errors"], 1)
+        self.assertIn("No space left", summary["organizations"]["big"]["problems"][0]["error"])
+        self.assertTrue(summary["organizations"]["small"]["valid"])
+
+
+
+class TimeCoreTests(unittest.TestCase):
+    """scripts/time_core.py is optional: loaded lazily, with a zoneinfo fallback outside the checkout"""
+
+    def test_copied_validator_matches_checkout(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "validate-report-calculations.py")
+            with open(VALIDATOR_PATH, 'rb') as src, open(path, 'wb') as dst:
+                dst.write(src.read())
+            copy = _load_module("validate_report_calculations_copy", path)
+        self.assertIsNone(copy._time_core())
+        for timezone_name in ("America/New_York", "Australia/Lord_Howe"):
+            standalone = copy.period_index("month", timezone_name, first_year=2020, last_year=2026)
+            shared = validator.period_index("month", timezone_name, first_year=2020, last_year=2026)
+            self.assertEqual(standalone.boundaries, shared.boundaries, timezone_name)
+        with self.assertRaises(ValueError):
+            copy.period_index("month", "Not/A_Zone")
+
+    def test_missing_timezone_library_raises(self):
+        time_core = _load_module("time_core_without_libraries", TIME_CORE_PATH)
+        with mock.patch.object(time_core, "_zoneinfo", lambda: None), mock.patch.object(time_core, "_pytz", lambda: None):
+            with self.assertRaises(time_core.TimezoneSupportError):
+                time_core.resolve_timezone("America/New_York")
+            self.assertIsNone(time_core.resolve_timezone("local"))
+            with mock.patch.object(validator, "_time_core", lambda: time_core):
+                with self.assertRaises(ImportError):
+                    validator.period_index("month", "Europe/Paris")
+
+    def test_generator_imports_time_core_lazily(self):
+        path_before = list(sys.path)
+        generator = _load_module("generate_mock_data_startup", GENERATOR_PATH)
+        self.assertEqual(sys.path, path_before)
+        self.assertEqual(generator._time_core.cache_info().currsize, 0)
+        self.assertEqual(generator._time_core().timezone_name(
+            generator.datetime(2024, 1, 1, tzinfo=generator._time_core().resolve_timezone("Asia/Kolkata"))
+        ), "Asia/Kolkata")
+
+
+def generate_ledger(out_dir: str, *args: str) -> None:
+    """A small seeded sliced ledger (with expected/ reports) from generate-mock-data.py --ledger"""
+    subprocess.run(
+        [sys.executable, GENERATOR_PATH, "--ledger", out_dir, "--entries", "200", "--months", "3",
+         "--seed", "7", "--end-date", "2026-03-31", *args],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def run_validator(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, VALIDATOR_PATH, *args], capture_output=True, text=True)
+
+
+class BundleTests(unittest.TestCase):
+    """--all: one parse, shared intermediates, cross-report checks and an optional ledger"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.ledger_dir = os.path.join(self.tmp, "ledger")
+        generate_ledger(self.ledger_dir)
+        self.bundle = {}
+        for report_type in ("trial_balance", "pnl", "balance_sheet"):
+            with open(os.path.join(self.ledger_dir, "expected", f"{report_type}.json")) as f:
+                self.bundle[report_type] = json.load(f)
+        self.bundle_path = os.path.join(self.tmp, "bundle.json")
+        with open(self.bundle_path, 'w') as f:
+            json.dump(self.bundle, f)
+
+    def test_all_with_ledger_directory(self):
+        checkpoint = os.path.join(self.tmp, "ledger.ckpt")
+        for args in ((), ("--checkpoint", checkpoint), ("--checkpoint", checkpoint)):
+            proc = run_validator("--all", self.bundle_path, "--ledger", self.ledger_dir, *args)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            result = json.loads(proc.stdout)
+            self.assertTrue(result["ledger"]["valid"])
+            self.assertEqual(set(result["ledger"]["reports"]), set(self.bundle))
+
+    def test_burn_balance_check_needs_matching_as_of_dates(self):
+        total_assets = self.bundle["balance_sheet"]["assets"]["total"]
+        as_of = self.bundle["balance_sheet"]["asOfDate"]
+        burn_rate = {"burns": [{"month": "2026-03", "burn": 1000.0}], "endingBalance": total_assets + 500}
+
+        for burn_as_of in (None, as_of - DAY_MS):
+            bundle = dict(self.bundle, burn_rate=dict(burn_rate, asOfDate=burn_as_of))
+            result = validator.validate_bundle(bundle)
+            self.assertIn("skipped", result["cross_checks"]["burn_ending_balance_vs_total_assets"])
+            self.assertTrue(result["valid"])
+
+        bundle = dict(self.bundle, burn_rate=dict(burn_rate, asOfDate=as_of))
+        result = validator.validate_bundle(bundle)
+        self.assertFalse(result["cross_checks"]["burn_ending_balance_vs_total_assets"]["valid"])
+        self.assertFalse(result["valid"])
+
+    def test_shared_figures_are_computed_once(self):
+        with mock.patch.object(validator, "calculate_balance_sheet", wraps=validator.calculate_balance_sheet) as calc:
+            result = validator.validate_bundle(self.bundle)
+        self.assertTrue(result["valid"])
+        self.assertEqual(calc.call_count, 1)
+
+
+class BatchTests(unittest.TestCase):
+    """--batch fans reports out over a process pool; results must not depend on the worker count"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        ledger_dir = os.path.join(self.tmp, "ledger")
+        generate_ledger(ledger_dir)
+        self.reports_dir = os.path.join(self.tmp, "reports")
+        os.makedirs(self.reports_dir)
+        for org_id in ("org1", "org2", "org3"):
+            for report_type in ("trial_balance", "pnl", "balance_sheet"):
+                with open(os.path.join(ledger_dir, "expected", f"{report_type}.json")) as src, \
+                        open(os.path.join(self.reports_dir, f"{org_id}.{report_type}.json"), 'w') as dst:
+                    dst.write(src.read())
+        # One wrong net income, one truncated file and one name without a report type
+        self._write("org4.pnl.json", json.dumps(dict(PNL_DATA, netIncome=61)))
+        self._write("org5.balance_sheet.json", '{"assets": {"items": [')
+        self._write("notes.json", json.dumps(PNL_DATA))
+
+    def _write(self, name, text):
+        with open(os.path.join(self.reports_dir, name), 'w') as f:
+            f.write(text)
+
+    def _batch(self, source, *args):
+        summary_path = os.path.join(self.tmp, "summary.json")
+        proc = run_validator("--batch", source, "--summary-out", summary_path, *args)
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        with open(summary_path) as f:
+            return json.load(f)
+
+    def test_pool_matches_serial(self):
+        serial = self._batch(self.reports_dir, "--workers", "1")
+        pooled = self._batch(self.reports_dir, "--workers", "3")
+        self.assertEqual((serial.pop("workers"), pooled.pop("workers")), (1, 3))
+        self.assertEqual(pooled, serial)
+        self.assertEqual(
+            (serial["total"], serial["passed"], serial["failed"], serial["errors"]), (12, 9, 1, 2)
+        )
+        for report in serial["reports"]:
+            if "result" in report:
+                with open(report["file"]) as f:
+                    expected = validator.validators[report["report_type"]](json.load(f))
+                self.assertEqual(report["result"], json.loads(json.dumps(expected)), report["file"])
+
+    def test_manifest_names_report_types(self):
+        manifest_path = os.path.join(self.reports_dir, "jobs.ndjson")
+        with open(manifest_path, 'w') as f:
+            f.write(json.dumps({"report_type": "pnl", "file": "notes.json"}) + "\n\n")
+            f.write(json.dumps({"file": "org4.pnl.json"}) + "\n")
+        jobs = validator.collect_batch_jobs(manifest_path)
+        self.assertEqual(jobs, [
+            ("pnl", os.path.join(self.reports_dir, "notes.json")),
+            (None, os.path.join(self.reports_dir, "org4.pnl.json")),
+        ])
+        summary = validator.run_batch(jobs, workers=1)
+        self.assertEqual([report["valid"] for report in summary["reports"]], [True, False])
+        self.assertIn("error", summary["reports"][1])
+
+
+class ServerTests(unittest.TestCase):
+    """--serve answers NDJSON requests like one-shot runs and drains in-flight work on shutdown"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.report_path = os.path.join(self.tmp, "trial_balance.json")
+        self.trial_balance = {
+            "entries": [{"account": "cash", "debit": 10.005, "credit": 0}, {"account": "sales", "debit": 0, "credit": 10.01}],
+            "totals": {"debits": 10.01, "credits": 10.01},
+            "isBalanced": True,
+        }
+        with open(self.report_path, 'w') as f:
+            json.dump(self.trial_balance, f)
+        self.requests = [
+            {"id": 1, "report_type": "pnl", "data": PNL_DATA},
+            {"id": 2, "report_type": "pnl", "data": dict(PNL_DATA, netIncome=61)},
+            {"id": 3, "report_type": "trial_balance", "file": self.report_path},
+            {"id": 4, "report_type": "cash_flow", "data": {}},
+            {"id": 5, "report_type": "balance_sheet", "file": os.path.join(self.tmp, "missing.json")},
+        ]
+
+    def _check_responses(self, responses):
+        by_id = {response["id"]: response for response in responses}
+        self.assertEqual(sorted(by_id, key=str), [1, 2, 3, 4, 5])
+        self.assertEqual(by_id[1]["result"], json.loads(json.dumps(validator.validate_profit_loss(PNL_DATA))))
+        self.assertEqual([by_id[i]["valid"] for i in (1, 2, 3, 4, 5)], [True, False, True, False, False])
+        self.assertEqual(by_id[3]["result"], json.loads(json.dumps(validator.validate_trial_balance(self.trial_balance))))
+        self.assertIn("Unknown report type", by_id[4]["error"])
+        self.assertIn("FileNotFoundError", by_id[5]["error"])
+
+    def test_stdin_round_trip(self):
+        lines = [json.dumps(request) for request in self.requests]
+        # A bad line is answered and skipped; nothing after the shutdown request is read
+        lines[2:2] = ["", "not json"]
+        lines += [json.dumps({"op": "shutdown"}), json.dumps({"id": 6, "report_type": "pnl", "data": PNL_DATA})]
+        proc = subprocess.run(
+            [sys.executable, VALIDATOR_PATH, "--serve", "--workers", "2"],
+            input="\n".join(lines) + "\n", capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        responses = [json.loads(line) for line in proc.stdout.splitlines()]
+        invalid = [response for response in responses if response["id"] is None]
+        self.assertEqual(len(invalid), 1)
+        self.assertTrue(invalid[0]["error"].startswith("Invalid request"))
+        self._check_responses([response for response in responses if response["id"] is not None])
+
+    def test_socket_round_trip(self):
+        import socket
+
+        socket_path = os.path.join(self.tmp, "validator.sock")
+        proc = subprocess.Popen(
+            [sys.executable, VALIDATOR_PATH, "--serve", "--socket", socket_path, "--workers", "1"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        self.addCleanup(proc.kill)
+        deadline = time.monotonic() + 30
+        while not os.path.exists(socket_path):
+            self.assertIsNone(proc.poll(), "server exited before listening")
+            self.assertLess(time.monotonic(), deadline, "server did not start listening")
+            time.sleep(0.05)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(30)
+            client.connect(socket_path)
+            client.sendall("".join(json.dumps(request) + "\n" for request in self.requests).encode())
+            with client.makefile('r') as replies:
+                responses = [json.loads(replies.readline()) for _ in self.requests]
+            client.sendall(b'{"op": "shutdown"}\n')
+        self._check_responses(responses)
+        _, stderr = proc.communicate(timeout=30)
+        self.assertEqual(proc.returncode, 0, stderr)
+        self.assertFalse(os.path.exists(socket_path))
+
+
+class MetricsTests(unittest.TestCase):
+    """--metrics-out/--profile write one machine-readable document; metering is off by default"""
+
+    def tearDown(self):
+        validator._metrics = None
+
+    def test_metrics_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = os.path.join(tmp, "trial_balance.json")
+            entries = [{"account": f"a{i}", "debit": 1.25, "credit": 1.25} for i in range(20_000)]
+            with open(report_path, 'w') as f:
+                json.dump({"entries": entries, "totals": {"debits": 25000, "credits": 25000}, "isBalanced": True}, f)
+            metrics_path = os.path.join(tmp, "metrics.json")
+            stacks_path = os.path.join(tmp, "stacks.txt")
+            proc = run_validator(
+                "trial_balance", report_path, "--stream", "--metrics-out", metrics_path, "--profile",
+                "--profile-stacks", stacks_path, "--profile-interval", "1",
+            )
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            with open(metrics_path) as f:
+                metrics = json.load(f)
+            with open(stacks_path) as f:
+                stacks = f.read().splitlines()
+
+        self.assertEqual(metrics["backend"], "python")
+        for key in ("wall_s", "cpu_s"):
+            self.assertGreater(metrics[key], 0)
+        self.assertGreater(metrics["peak_rss_bytes"], 1 << 20)
+        self.assertGreater(metrics["tracemalloc_peak_bytes"], 0)
+        self.assertEqual([phase["name"] for phase in metrics["phases"]], ["load", "validate:trial_balance"])
+        for phase in metrics["phases"]:
+            self.assertEqual(
+                set(phase), {"name", "wall_s", "cpu_s", "peak_rss_bytes", "tracemalloc_peak_bytes"}, phase["name"]
+            )
+        # Streamed entries are counted as they are consumed
+        stats = metrics["functions"]["calculate_trial_balance"]
+        self.assertEqual((stats["calls"], stats["rows"]), (1, len(entries)))
+        self.assertGreater(stats["rows_per_s"], 0)
+        # Collapsed "outer;...;inner count" lines, the sampled calculator among them
+        for line in stacks:
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+            self.assertRegex(stack, r"^\S.* \([\w.-]+\.py:\d+\)$")
+        self.assertTrue(any("calculate_trial_balance (" in line for line in stacks))
+
+    def test_nested_phases_and_counted_rows(self):
+        self.assertIsNone(validator._metrics)
+        metrics = validator.enable_metrics(trace_memory=True)
+        with validator._phase("ledger"):
+            with validator._phase("scan"):
+                validator.calculate_aging_buckets(({"date": MAR_1, "amount": 1} for _ in range(7)), MAR_1)
+            validator.calculate_balance_sheet([{"balance": 1}] * 3, [{"balance": 1}], [], 2)
+        document = metrics.to_dict()
+        self.assertEqual([phase["name"] for phase in document["phases"]], ["ledger/scan", "ledger"])
+        self.assertGreaterEqual(document["phases"][1]["tracemalloc_peak_bytes"], document["phases"][0]["tracemalloc_peak_bytes"])
+        self.assertEqual(document["functions"]["calculate_aging_buckets"]["rows"], 7)
+        self.assertEqual(document["functions"]["calculate_balance_sheet"]["rows"], 4)
+
+
+class BenchmarkTests(unittest.TestCase):
+    """benchmark-report-calculations.py: seeded synthetic ledgers, every case measured, regressions flagged"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bench = _load_module("benchmark_report_calculations", BENCHMARK_PATH)
+
+    def test_small_run_covers_every_case(self):
+        results = self.bench.run_benchmarks(sizes=[300], backends=["python"], repeat=1, log=None)
+        self.assertEqual(results["meta"]["sizes"], [300])
+        names = [name for _, _, case_names in self.bench.DATASETS for name in case_names]
+        self.assertEqual([result["case"] for result in results["results"]], names)
+        for result in results["results"]:
+            self.assertEqual(result["backend"], "python", result["case"])
+            self.assertGreater(result["rows"], 0, result["case"])
+            self.assertGreater(result["rows_per_s"], 0, result["case"])
+            self.assertGreater(result["peak_bytes"], 0, result["case"])
+            self.assertLessEqual(result["best_s"], result["mean_s"], result["case"])
+
+    def test_datasets_are_seeded_and_self_consistent(self):
+        validator_module = _load_module("validate_report_calculations_bench", VALIDATOR_PATH)
+        mock_data = _load_module("generate_mock_data_bench", GENERATOR_PATH)
+        patterns = self.bench.weekday_patterns(mock_data)
+        first = self.bench.LedgerSynthesizer(patterns, 7, 500).entry_lines(500)
+        self.assertEqual(self.bench.LedgerSynthesizer(patterns, 7, 500).entry_lines(500), first)
+        self.assertNotEqual(self.bench.LedgerSynthesizer(patterns, 8, 500).entry_lines(500), first)
+        for dataset, build, _ in self.bench.DATASETS:
+            synth = self.bench.LedgerSynthesizer(patterns, 7, 500)
+            for name, _, func in build(validator_module, synth, 500):
+                if name.startswith("validate_"):
+                    self.assertTrue(func()["valid"], f"{dataset}: {name}")
+
+    def test_compare_flags_regressions(self):
+        def result(case, best_s, peak_bytes):
+            return {"case": case, "backend": "python", "rows": 1000, "best_s": best_s,
+                    "rows_per_s": 1000 / best_s, "peak_bytes": peak_bytes}
+
+        baseline = {"results": [
+            result("slower", 0.1, 100), result("fatter", 0.1, 100), result("noise", 0.01, 100),
+            result("steady", 0.1, 100), result("dropped", 0.1, 100),
+        ]}
+        current = {"results": [
+            result("slower", 0.2, 100), result("fatter", 0.1, 200), result("noise", 0.05, 100),
+            result("steady", 0.11, 110),
+        ]}
+        comparison = self.bench.compare_results(baseline, current, threshold=0.15, min_time=0.05)
+        self.assertFalse(comparison["valid"])
+        self.assertEqual(
+            {entry["case"]: entry["regressed"] for entry in comparison["regressions"]},
+            {"slower": "throughput", "fatter": "memory"},
+        )
+        self.assertEqual(comparison["missing"], [["dropped", "python", 1000]])
+        self.assertTrue(self.bench.compare_results(baseline, baseline)["valid"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, document in (("baseline", baseline), ("current", current)):
+                paths.append(os.path.join(tmp, f"{name}.json"))
+                with open(paths[-1], 'w') as f:
+                    json.dump(document, f)
+            proc = subprocess.run([sys.executable, BENCHMARK_PATH, "compare", *paths], capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 1, proc.stderr)
+        self.assertEqual(len(json.loads(proc.stdout)["regressions"]), 2)
+
+
+class ColumnsTests(unittest.TestCase):
+    """A --to-columns directory validates exactly like the JSON report it was converted from"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        rng = random.Random(13)
+        amounts = HALF_CENT_AMOUNTS + SIGNED_ZERO_AMOUNTS + [round(rng.uniform(0, 5000), 3) for _ in range(2000)]
+        entries = [
+            {"accountId": f"acct{i % 40}", "debit": amount, "credit": 0} if i % 2 else
+            {"accountId": f"acct{i % 40}", "debit": 0, "credit": amount}
+            for i, amount in enumerate(amounts)
+        ] + [{"accountId": "both", "debit": 5, "credit": 7.5}, {"debit": 1.25}]
+        numbers = [amount for amount in amounts if not isinstance(amount, str)]
+        invoices = [
+            {"customer": f"c{i % 30}", "date": MAR_1 - rng.randint(0, 200) * DAY_MS, "amount": amount}
+            for i, amount in enumerate(numbers)
+        ] + [{"customer": "undated", "amount": 9.99}]
+        aging = validator.age_invoices(invoices, as_of=MAR_1)
+        half = len(numbers) // 2
+        self.reports = {
+            "trial_balance": {"entries": entries, "totals": {"debits": 1, "credits": 2}, "isBalanced": True},
+            "balance_sheet": {
+                "assets": {"items": [{"name": f"a{i}", "balance": b} for i, b in enumerate(numbers[:half])], "total": 1},
+                "liabilities": {"items": [{"name": f"l{i}", "balance": b} for i, b in enumerate(numbers[half:])]},
+                "equity": {"items": [], "retainedEarnings": 12.5},
+                "isBalanced": False,
+            },
+            "ar": {
+                "asOfDate": MAR_1,
+                "invoices": invoices,
+                "agingBuckets": aging["buckets"],
+                "totalOutstanding": aging["total"],
+                "customers": [{"customer": name, "totalOwed": party["total"]} for name, party in aging["by_party"].items()],
+            },
+        }
+
+    def tearDown(self):
+        validator.set_backend("python")
+
+    def _convert(self, report_type):
+        json_path = os.path.join(self.tmp, f"{report_type}.json")
+        with open(json_path, 'w') as f:
+            json.dump(self.reports[report_type], f)
+        columns_dir = os.path.join(self.tmp, f"{report_type}.columns")
+        validator.convert_report_to_columns(json_path, columns_dir)
+        return json_path, columns_dir
+
+    def test_columns_validate_like_json(self):
+        backends = ("python", "numpy") if validator.HAS_NUMPY else ("python",)
+        columnized = {"trial_balance": ("entries",), "balance_sheet": ("assets", "items"), "ar": ("invoices",)}
+        for report_type in self.reports:
+            json_path, columns_dir = self._convert(report_type)
+            self.assertTrue(validator.is_column_dir(columns_dir))
+            for backend in backends:
+                validator.set_backend(backend)
+                expected = validator.validators[report_type](validator.load_report(json_path))
+                columns = validator.load_report(columns_dir)
+                self.assertIsInstance(validator._field(columns, columnized[report_type]), validator.ColumnArray)
+                actual = validator.validators[report_type](columns)
+                self.assertEqual(json.dumps(actual), json.dumps(expected), f"{report_type} on {backend}")
+
+    def test_cli_converts_and_validates(self):
+        json_path = os.path.join(self.tmp, "trial_balance.json")
+        with open(json_path, 'w') as f:
+            json.dump(self.reports["trial_balance"], f)
+        columns_dir = os.path.join(self.tmp, "tb")
+        for _ in range(2):
+            # Converting again replaces the earlier directory
+            proc = run_validator("--to-columns", columns_dir, "trial_balance", json_path)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        from_json = run_validator("trial_balance", json_path)
+        from_columns = run_validator("trial_balance", columns_dir)
+        self.assertEqual((from_columns.returncode, from_columns.stdout), (from_json.returncode, from_json.stdout))
+
+        not_columns = os.path.join(self.tmp, "not-columns")
+        os.makedirs(not_columns)
+        with self.assertRaises(ValueError):
+            validator.convert_report_to_columns(json_path, not_columns)
+        self.assertEqual(os.listdir(not_columns), [])
+
+
+class BurnMatrixTests(unittest.TestCase):
+    """validate_burn_rates and BurnMatrix series must equal calculate_burn_rate/calculate_growth_rate per org"""
+
+    def setUp(self):
+        rng = random.Random(15)
+        self.reports = {}
+        for index in range(60):
+            start = 2021 * 12 + rng.randrange(24)
+            # Gaps inside an org's span are zero-burn months
+            ordinals = sorted(rng.sample(range(start, start + 40), rng.randint(1, 30)))
+            burns = [rng.choice([
+                round(rng.uniform(-2e4, 8e4), 2), round(rng.uniform(0, 1e5), 3), rng.choice(HALF_CENT_AMOUNTS), 0,
+            ]) for _ in ordinals]
+            balance = round(rng.uniform(-1e5, 2e6), 2)
+            calculated = validator.calculate_burn_rate(burns, balance)
+            self.reports[f"org{index}"] = {
+                "monthlyBurns": [
+                    {"month": validator._ordinal_month(ordinal), "burn": burn} for ordinal, burn in zip(ordinals, burns)
+                ],
+                "endingBalance": balance,
+                # Every fifth report is off by a cent more than the tolerance
+                "averageMonthlyBurn": calculated["average_monthly_burn"] + (0.02 if index % 5 == 0 else 0),
+                "runwayMonths": calculated["runway_months"],
+            }
+        self.reports["empty"] = {"monthlyBurns": [], "endingBalance": 10, "averageMonthlyBurn": 0}
+        self.reports["unplaced"] = {"monthlyBurns": [{"month": "Q1", "burn": 5}], "endingBalance": 10,
+                                    "averageMonthlyBurn": 5, "runwayMonths": 2}
+        self.reports["checked"] = {
+            "monthlyBurns": [{"month": "2024-01", "burn": 10, "revenue": 5, "expenses": 15},
+                             {"month": "2024-02", "burn": 10, "revenue": 5, "expenses": 16}],
+            "endingBalance": 100, "averageMonthlyBurn": 10, "runwayMonths": 10,
+        }
+
+    def tearDown(self):
+        validator.set_backend("python")
+
+    def _backends(self):
+        return ("python", "numpy") if validator.HAS_NUMPY else ("python",)
+
+    @staticmethod
+    def _calendar_burns(data):
+        """Burns per calendar month of the org's span, zero where a month is missing"""
+        by_month = {validator._month_ordinal(row["month"]): row["burn"] for row in data["monthlyBurns"]}
+        first, last = min(by_month), max(by_month)
+        return [by_month.get(ordinal, 0) for ordinal in range(first, last + 1)]
+
+    def test_summaries_match_single_report_validation(self):
+        documents = []
+        for backend in self._backends():
+            validator.set_backend(backend)
+            summary = validator.validate_burn_rates(self.reports)
+            documents.append(json.dumps(summary))
+            for org, data in self.reports.items():
+                burns = [row["burn"] for row in data["monthlyBurns"]]
+                result = summary["reports"][org]
+                self.assertEqual(result["calculated"], validator.calculate_burn_rate(burns, data["endingBalance"]), org)
+                if org != "checked":
+                    self.assertEqual(result["valid"], validator.validate_burn_rate(data)["valid"], org)
+            self.assertEqual(summary["reports"]["checked"]["discrepancies"]["monthly_burns"], ["2024-02"])
+            self.assertEqual(summary["failed"], 13)
+        self.assertEqual(len(set(documents)), 1)
+
+    def test_series_match_calculators(self):
+        windows = (1, 3, 12)
+        documents = []
+        for backend in self._backends():
+            validator.set_backend(backend)
+            series = validator.BurnMatrix(self.reports).series(windows)
+            documents.append(json.dumps(series))
+            self.assertIsNone(series["unplaced"])
+            self.assertIsNone(series["empty"])
+            for org, data in self.reports.items():
+                if series[org] is None:
+                    continue
+                burns = self._calendar_burns(data)
+                org_series = series[org]
+                self.assertEqual(org_series["burn"], [validator.to_cents(burn) / 100 for burn in burns], org)
+                self.assertEqual(
+                    org_series["growth"],
+                    [None] + [validator.calculate_growth_rate(float(current), float(previous))
+                            for previous, current in zip(burns, burns[1:])],
+                    org,
+                )
+                for window in windows:
+                    trailing = org_series["trailing"][str(window)]
+                    expected = [
+                        validator.calculate_burn_rate(burns[max(0, month - window + 1):month + 1], data["endingBalance"])
+                        for month in range(len(burns))
+                    ]
+                    self.assertEqual(trailing["average_burn"], [e["average_monthly_burn"] for e in expected], (org, window))
+                    self.assertEqual(trailing["runway_months"], expected[-1]["runway_months"], (org, window))
+        self.assertEqual(len(set(documents)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
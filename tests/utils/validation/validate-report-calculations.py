@@ -5,92 +5,1258 @@ Validates report calculations from Convex database against independent Python ca
 Accepts JSON input from report data and performs verification.
 """
 
+import ast
+import atexit
+import glob
+import io
 import json
+import mmap
+import os
+import re
+import struct
 import sys
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from itertools import accumulate, compress, islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 
+# resource is Unix-only; peak RSS is reported as null elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# NumPy is optional; the columnar backend falls back to pure Python without it
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Timezone lookups are shared with the Python scripts when this file sits in its checkout
+TIME_CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts", "time_core.py")
+
 # Set precision for financial calculations
 DECIMAL_PLACES = 2
 
+# Aging bucket upper edges in days: 0-30, 31-60, 61-90, 90+
+AGING_BUCKET_EDGES = (30, 60, 90)
+DAY_MS = 24 * 60 * 60 * 1000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Calendar periods a PeriodIndex can bucket by; fiscal years start in FISCAL_YEAR_START unless configured
+PERIOD_KINDS = ("month", "iso_week", "quarter", "fiscal_year")
+FISCAL_YEAR_START = 1
+# Calendar indexes span these years; timestamps outside still get keys, just not by bisection
+PERIOD_FIRST_YEAR = 1970
+PERIOD_LAST_YEAR = 2100
+
+BACKENDS = ("python", "numpy")
+_backend = "python"
+
+# Rows converted to columns at a time by the numpy backend
+COLUMN_CHUNK_SIZE = 1 << 16
+
+# Arrays that can grow with ledger size; streaming mode never holds them in memory
+STREAMED_ARRAYS = (
+    ("entries",),
+    ("assets", "items"),
+    ("liabilities", "items"),
+    ("equity", "items"),
+    ("customers",),
+    ("invoices",),
+    ("outstandingBills",),
+    ("entries_final",),
+    ("entry_lines",),
+)
+
+STREAM_CHUNK_SIZE = 1 << 16
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",:]}"
+# Brackets and string starts, and the rest of a string after its opening quote
+_SKIP_TOKEN = re.compile(r'[\[\]{}"]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"')
+
+
+class _JsonStreamReader:
+    """Incremental JSON tokenizer over a text file with a bounded read buffer"""
+
+    def __init__(self, fp, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Read more input, keeping only the unconsumed tail of the buffer"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading ahead as far as it extends"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value is truncated by the buffer; grow geometrically and retry
+                if not self._fill(len(self.buf)):
+                    raise
+                continue
+            if (end == len(self.buf) or self.buf[end] not in _JSON_DELIMITERS) and self._fill():
+                # A number cut at the buffer edge ("120." + "5") decodes early; read on and retry
+                continue
+            self.pos = end
+            return obj
+
+    def skip(self) -> None:
+        """
+        Consume one JSON value without building it.
+
+        Objects and arrays are scanned by bracket depth (skipping over string
+        contents, escapes included), so skipping a sibling array costs one
+        buffer of memory rather than the decoded array. Skipped values are
+        not validated.
+        """
+        if self.peek() not in "[{":
+            self.value()
+            return
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise json.JSONDecodeError("Unterminated value", self.buf, self.pos)
+                continue
+            token = match.group()
+            if token == '"':
+                end = _STRING_TAIL.match(self.buf, match.end())
+                if end is None:
+                    # String cut at the buffer edge; keep it from its opening quote and read on
+                    self.pos = match.start()
+                    if not self._fill():
+                        raise json.JSONDecodeError("Unterminated string", self.buf, self.pos)
+                    continue
+                self.pos = end.end()
+                continue
+            self.pos = match.end()
+            depth += 1 if token in "[{" else -1
+            if depth == 0:
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position one at a time"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position; the caller consumes each value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos - 1)
+
+
+class StreamedArray:
+    """Lazy, re-iterable view of a large array inside a JSON report file.
+
+    Each iteration re-opens the file and yields elements one at a time, so
+    the array is never materialized.
+    """
+
+    def __init__(self, json_file: str, path: Tuple[str, ...]):
+        self.json_file = json_file
+        self.path = path
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.json_file, 'r') as f:
+            yield from _iter_array_at(_JsonStreamReader(f), self.path)
+
+    def __repr__(self) -> str:
+        return f"StreamedArray({self.json_file!r}, {'.'.join(self.path)!r})"
+
+
+def _iter_array_at(reader: _JsonStreamReader, path: Tuple[str, ...]) -> Iterator[Any]:
+    """Walk the document to the array at path and stream its elements"""
+    if reader.peek() != "{":
+        reader.skip()
+        return
+    for key in reader.iter_object():
+        if key != path[0]:
+            reader.skip()
+        elif len(path) == 1:
+            if reader.peek() == "[":
+                yield from reader.iter_array()
+            else:
+                reader.skip()
+            return
+        else:
+            yield from _iter_array_at(reader, path[1:])
+            return
+
+
+def _load_streaming_object(reader: _JsonStreamReader, json_file: str, path: Tuple[str, ...], streamed) -> Dict[str, Any]:
+    """Decode an object, replacing streamed arrays with StreamedArray views"""
+    result = {}
+    for key in reader.iter_object():
+        key_path = path + (key,)
+        char = reader.peek()
+        if key_path in streamed and char == "[":
+            reader.skip()
+            result[key] = StreamedArray(json_file, key_path)
+        elif char == "{" and any(p[:len(key_path)] == key_path for p in streamed):
+            result[key] = _load_streaming_object(reader, json_file, key_path, streamed)
+        else:
+            result[key] = reader.value()
+    return result
+
+
+def load_report_streaming(json_file: str, streamed=STREAMED_ARRAYS) -> Dict[str, Any]:
+    """Load a report with its large arrays left on disk as StreamedArray views"""
+    with open(json_file, 'r') as f:
+        reader = _JsonStreamReader(f)
+        if reader.peek() != "{":
+            return reader.value()
+        data = _load_streaming_object(reader, json_file, (), set(streamed))
+        if reader.peek():
+            raise json.JSONDecodeError("Extra data", reader.buf, reader.pos)
+        return data
+
+
+def load_report(json_file: str, stream: bool = False) -> Dict[str, Any]:
+    """Load report JSON, optionally in streaming mode; columnar directories are memory-mapped"""
+    if os.path.isdir(json_file) and is_column_dir(json_file):
+        return load_report_columns(json_file)
+    if stream:
+        return load_report_streaming(json_file)
+    with open(json_file, 'r') as f:
+        return json.load(f)
+
+
+# Columnar report directories: meta.json plus one .npy file per column and array
+COLUMNS_META = "meta.json"
+COLUMNS_FORMAT = "report-columns"
+COLUMNS_VERSION = 1
+
+# Array path -> (row kind, key field); only the fields the validators read are kept
+COLUMN_ARRAYS = {
+    ("entries",): ("debit_credit", "accountId"),
+    ("entry_lines",): ("side", "accountId"),
+    ("invoices",): ("amount", "customer"),
+    ("outstandingBills",): ("amount", "vendor"),
+    ("assets", "items"): ("balance", "name"),
+    ("liabilities", "items"): ("balance", "name"),
+    ("equity", "items"): ("balance", "name"),
+}
+
+# Column -> (.npy descr, array typecode); side is 0 for debit, 1 for credit,
+# account_id indexes the array's key dictionary, a NaN date_ms means undated.
+# Balances stay float64 because balance sheets round the summed balances, not each row
+COLUMN_TYPES = {
+    "amount_cents": ("<i8", "q"),
+    "balance": ("<f8", "d"),
+    "side": ("|i1", "b"),
+    "account_id": ("<i4", "i"),
+    "date_ms": ("<f8", "d"),
+}
+COLUMN_KIND_COLUMNS = {
+    "debit_credit": ("amount_cents", "side", "account_id", "date_ms"),
+    "side": ("amount_cents", "side", "account_id", "date_ms"),
+    "amount": ("amount_cents", "account_id", "date_ms"),
+    "balance": ("balance", "account_id"),
+}
+_NPY_HEADER_SIZE = 128
+_NAN = float("nan")
+
+
+class _NpyColumnWriter:
+    """Append-only writer for a 1-D .npy file whose length is only known at close"""
+
+    def __init__(self, path: str, descr: str, typecode: str):
+        self.descr = descr
+        self.typecode = typecode
+        self.rows = 0
+        self.file = open(path, 'wb')
+        self.file.write(self._header())
+
+    def _header(self) -> bytes:
+        header = f"{{'descr': '{self.descr}', 'fortran_order': False, 'shape': ({self.rows},), }}"
+        # Fixed size keeps the data 64-byte aligned and lets close() rewrite the shape in place
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", _NPY_HEADER_SIZE - 10) + header.ljust(_NPY_HEADER_SIZE - 11).encode("latin1") + b"\n"
+
+    def append(self, values: List[Any]) -> None:
+        block = array(self.typecode, values)
+        if sys.byteorder != "little":
+            block.byteswap()
+        self.file.write(block.tobytes())
+        self.rows += len(values)
+
+    def close(self) -> None:
+        self.file.seek(0)
+        self.file.write(self._header())
+        self.file.close()
+
+
+def _mmap_npy(path: str):
+    """Zero-copy memoryview over a 1-D .npy file, for hosts without NumPy"""
+    with open(path, 'rb') as f:
+        if f.read(6) != b"\x93NUMPY":
+            raise ValueError(f"{path} is not a .npy file")
+        major = f.read(2)[0]
+        header_len = struct.unpack("<H" if major == 1 else "<I", f.read(2 if major == 1 else 4))[0]
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        offset = f.tell()
+        typecodes = {descr: typecode for descr, typecode in COLUMN_TYPES.values()}
+        typecode = typecodes.get(header["descr"])
+        if typecode is None or header["fortran_order"] or len(header["shape"]) != 1:
+            raise ValueError(f"Unsupported column layout in {path}: {header}")
+        if header["shape"][0] == 0:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)[offset:offset + header["shape"][0] * array(typecode).itemsize]
+    if sys.byteorder != "little":
+        # Big-endian hosts pay one copy to swap bytes
+        block = array(typecode, view.tobytes())
+        block.byteswap()
+        return memoryview(block)
+    return view.cast(typecode)
+
+
+class ColumnArray:
+    """
+    Lazy view of one columnized report array.
+
+    Calculators with a columnar fast path read the memory-mapped columns
+    directly (NumPy memmaps on the numpy backend, memoryviews otherwise);
+    everything else iterates it like the original list of row dicts.
+    """
+
+    def __init__(self, directory: str, name: str, spec: Dict[str, Any]):
+        self.directory = directory
+        self.name = name
+        self.kind = spec["kind"]
+        self.key_field = spec["key_field"]
+        self.keys = spec["keys"]
+        self.rows = spec["rows"]
+        self._columns: Dict[Tuple[str, bool], Any] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str):
+        """Memory-mapped column; pages are shared through the OS page cache"""
+        vectorized = _backend == "numpy"
+        cached = self._columns.get((name, vectorized))
+        if cached is None:
+            path = os.path.join(self.directory, self.name, f"{name}.npy")
+            cached = np.load(path, mmap_mode="r") if vectorized else _mmap_npy(path)
+            self._columns[(name, vectorized)] = cached
+        return cached
+
+    def iter_rows(self, *names: str) -> Iterator[Tuple[Any, ...]]:
+        """Yield tuples of plain Python values, converting one chunk of each column at a time"""
+        columns = [self.column(name) for name in names]
+        for start in range(0, self.rows, COLUMN_CHUNK_SIZE):
+            yield from zip(*(column[start:start + COLUMN_CHUNK_SIZE].tolist() for column in columns))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        keys = self.keys
+        key_field = self.key_field
+        columns = COLUMN_KIND_COLUMNS[self.kind]
+        for values in self.iter_rows(*columns):
+            row = dict(zip(columns, values))
+            key = keys[row["account_id"]]
+            item = {key_field: key} if key is not None else {}
+            if self.kind == "balance":
+                item["balance"] = row["balance"]
+                yield item
+                continue
+            amount = row["amount_cents"] / 100
+            if self.kind == "debit_credit":
+                item["debit"] = amount if row["side"] == 0 else 0
+                item["credit"] = amount if row["side"] == 1 else 0
+            elif self.kind == "side":
+                item["side"] = "credit" if row["side"] else "debit"
+                item["amount"] = amount
+            else:
+                item["amount"] = amount
+            date = row.get("date_ms")
+            if date is not None and date == date:
+                item["date"] = date
+            yield item
+
+    def __repr__(self) -> str:
+        return f"ColumnArray({self.directory!r}, {self.name!r}, rows={self.rows})"
+
+
+def is_column_dir(path: str) -> bool:
+    """True if path is a columnar report directory"""
+    return os.path.isfile(os.path.join(path, COLUMNS_META))
+
+
+def _set_path(data: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = value
+
+
+def load_report_columns(directory: str) -> Dict[str, Any]:
+    """Load a columnar report; columnized arrays become ColumnArray views and nothing is parsed"""
+    with open(os.path.join(directory, COLUMNS_META), 'r') as f:
+        meta = json.load(f)
+    if meta.get("format") != COLUMNS_FORMAT or meta.get("version") != COLUMNS_VERSION:
+        raise ValueError(f"Unsupported columnar report format in {directory}")
+    data = meta["report"]
+    for name, spec in meta["arrays"].items():
+        _set_path(data, tuple(spec["path"]), ColumnArray(directory, name, spec))
+    return data
+
+
+def _column_values(kind: str, key_field: str, row: Dict[str, Any]) -> Iterator[Tuple[Any, int, Any, float]]:
+    """(amount_cents or balance, side, key, date_ms) tuples for one source row"""
+    date = row.get("date")
+    date = _NAN if date is None else float(date)
+    key = row.get(key_field)
+    if kind == "debit_credit":
+        debit = to_cents(row.get("debit", 0))
+        credit = to_cents(row.get("credit", 0))
+        if credit:
+            yield credit, 1, key, date
+        if debit or not credit:
+            yield debit, 0, key, date
+    elif kind == "side":
+        if date != date:
+            # Columns cannot carry entryId, so undated lines could not be dated from entries_final
+            raise ValueError("entry_lines without a denormalized date cannot be columnized")
+        yield to_cents(row.get("amount", 0)), 0 if row.get("side") == "debit" else 1, key, date
+    elif kind == "amount":
+        yield to_cents(row.get("amount", 0)), 0, key, date
+    else:
+        yield float(row.get("balance", 0)), 0, key, date
+
+
+def _materialize(value: Any) -> Any:
+    """Replace StreamedArray views left in a streamed report with lists"""
+    if isinstance(value, StreamedArray):
+        return [_materialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _materialize(item) for key, item in value.items()}
+    return value
+
+
+def convert_report_to_columns(json_file: str, out_dir: str) -> Dict[str, Any]:
+    """
+    Convert a report JSON file into a columnar report directory.
+
+    Arrays listed in COLUMN_ARRAYS are streamed into .npy columns with
+    amounts rounded to cents, so conversion runs in bounded memory. Other
+    fields are kept as JSON in meta.json. The directory is written next to
+    out_dir and renamed into place, replacing an earlier conversion.
+
+    Returns:
+        The meta document written to meta.json
+    """
+    import shutil
+
+    data = load_report_streaming(json_file, streamed=tuple(COLUMN_ARRAYS) + STREAMED_ARRAYS)
+    if not isinstance(data, dict):
+        raise ValueError(f"{json_file} does not contain a report object")
+    if os.path.exists(out_dir) and not is_column_dir(out_dir):
+        raise ValueError(f"{out_dir} exists and is not a columnar report directory")
+    staging = f"{out_dir}.tmp-{os.getpid()}"
+    os.makedirs(staging)
+    arrays = {}
+    try:
+        for path, (kind, key_field) in COLUMN_ARRAYS.items():
+            parent = data
+            for key in path[:-1]:
+                parent = parent.get(key) if isinstance(parent, dict) else None
+            if not isinstance(parent, dict) or not isinstance(parent.get(path[-1]), (StreamedArray, list)):
+                continue
+            name = ".".join(path)
+            columns = COLUMN_KIND_COLUMNS[kind]
+            os.makedirs(os.path.join(staging, name))
+            writers = {
+                column: _NpyColumnWriter(os.path.join(staging, name, f"{column}.npy"), *COLUMN_TYPES[column])
+                for column in columns
+            }
+            codes: Dict[Any, int] = {}
+            keys: List[Any] = []
+            amount_column = columns[0]
+            for chunk in _iter_chunks(parent.pop(path[-1])):
+                values = {column: [] for column in (amount_column, "side", "account_id", "date_ms")}
+                for row in chunk:
+                    for amount, side, key, date in _column_values(kind, key_field, row):
+                        code = codes.get(key)
+                        if code is None:
+                            code = codes[key] = len(keys)
+                            keys.append(key)
+                        values[amount_column].append(amount)
+                        values["side"].append(side)
+                        values["account_id"].append(code)
+                        values["date_ms"].append(date)
+                for column, writer in writers.items():
+                    writer.append(values[column])
+            for writer in writers.values():
+                writer.close()
+            arrays[name] = {
+                "path": list(path),
+                "kind": kind,
+                "key_field": key_field,
+                "keys": keys,
+                "rows": writers[amount_column].rows,
+            }
+        meta = {
+            "format": COLUMNS_FORMAT,
+            "version": COLUMNS_VERSION,
+            "source": os.path.basename(json_file),
+            "arrays": arrays,
+            "report": _materialize(data),
+        }
+        with open(os.path.join(staging, COLUMNS_META), 'w') as f:
+            json.dump(meta, f)
+        if os.path.exists(out_dir):
+            shutil.rmtree(out_dir)
+        os.replace(staging, out_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return meta
+
 
 def round_decimal(value: float) -> Decimal:
     """Round to 2 decimal places for currency"""
     return Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
 
+# Below this magnitude (1e11 dollars) the float error in value * 100 stays far
+# below the 0.01 cent guard band, so round() agrees with ROUND_HALF_UP on str(value)
+_FAST_CENTS_LIMIT = 1e13
+_HALF_CENT_GUARD = 0.49
+
+
+def to_cents(value: Any) -> int:
+    """
+    Round a report amount to integer cents.
+
+    Exactly equal to round_decimal(value) * 100: floats take a fast path
+    unless they sit near a half-cent tie, which falls back to the Decimal
+    ROUND_HALF_UP path on str(value). Integers carry no sign on zero, so a
+    Decimal -0.00 reports as 0.0 (equal, but not the same float bits).
+    """
+    if type(value) is float:
+        scaled = value * 100
+        if -_FAST_CENTS_LIMIT < scaled < _FAST_CENTS_LIMIT:
+            cents = round(scaled)
+            if -_HALF_CENT_GUARD < scaled - cents < _HALF_CENT_GUARD:
+                return cents
+    elif type(value) is int:
+        return value * 100
+    return int(round_decimal(value).scaleb(DECIMAL_PLACES))
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Exact Decimal dollars for an integer-cents amount"""
+    return Decimal(cents).scaleb(-DECIMAL_PLACES)
+
+
+def set_backend(name: str) -> str:
+    """
+    Select the aggregation backend for calculate_* functions.
+
+    Args:
+        name: "python" or "numpy"
+
+    Returns:
+        The backend in effect; "numpy" falls back to "python" when NumPy is missing
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'")
+    if name == "numpy" and not HAS_NUMPY:
+        print("Warning: NumPy is not installed. Using python backend.", file=sys.stderr)
+        name = "python"
+    _backend = name
+    return _backend
+
+
+def aging_bucket_labels(bucket_edges: Sequence[int] = AGING_BUCKET_EDGES) -> List[str]:
+    """Bucket labels for ascending day edges, e.g. (30, 60, 90) -> 0-30, 31-60, 61-90, 90+"""
+    labels = []
+    lower = 0
+    for edge in bucket_edges:
+        labels.append(f"{lower}-{edge}")
+        lower = edge + 1
+    labels.append(f"{bucket_edges[-1]}+" if bucket_edges else "0+")
+    return labels
+
+
+def _period_start(kind: str, day: date, fiscal_year_start: int) -> date:
+    """First local day of the period containing day"""
+    if kind == "month":
+        return day.replace(day=1)
+    if kind == "quarter":
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    if kind == "fiscal_year":
+        return date(day.year if day.month >= fiscal_year_start else day.year - 1, fiscal_year_start, 1)
+    return day - timedelta(days=day.weekday())
+
+
+def _next_period_start(kind: str, start: date) -> date:
+    """First day of the period after the one starting on start"""
+    if kind == "iso_week":
+        return start + timedelta(days=7)
+    ordinal = start.year * 12 + start.month - 1 + {"month": 1, "quarter": 3}.get(kind, 12)
+    return date(ordinal // 12, ordinal % 12 + 1, 1)
+
+
+def _period_key(kind: str, start: date, fiscal_year_start: int) -> str:
+    """Key of the period starting on start: 2024-03, 2024-W09, 2024-Q1, or FY2025 (named for the year it ends in)"""
+    if kind == "month":
+        return f"{start.year:04d}-{start.month:02d}"
+    if kind == "quarter":
+        return f"{start.year:04d}-Q{(start.month - 1) // 3 + 1}"
+    if kind == "fiscal_year":
+        return f"FY{start.year + (fiscal_year_start > 1):04d}"
+    iso_year, week, _ = start.isocalendar()
+    return f"{iso_year:04d}-W{week:02d}"
+
+
+@lru_cache(maxsize=None)
+def _time_core():
+    """scripts/time_core.py (or an importable time_core), loaded for the first non-UTC timezone; None when absent"""
+    if os.path.isfile(TIME_CORE_PATH):
+        import importlib.util
+
+        spec = importlib.util.spec_from_file_location("time_core", TIME_CORE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    try:
+        import time_core
+    except ImportError:
+        return None
+    return time_core
+
+
+def _resolve_timezone(timezone_name: str):
+    """
+    tzinfo for an IANA name, or None when unknown; a copy running on its own resolves with zoneinfo alone.
+
+    Raises time_core's TimezoneSupportError (an ImportError) when neither zoneinfo nor pytz is installed.
+    """
+    time_core = _time_core()
+    if time_core is not None:
+        return time_core.resolve_timezone(timezone_name)
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(timezone_name)
+    except Exception:
+        # ImportError before Python 3.9, ZoneInfoNotFoundError or ValueError for unknown names
+        return None
+
+
+def _local_midnight_ms(day: date, tz) -> int:
+    """Epoch ms of local midnight starting day (the first instant after a DST gap at midnight); tz None is UTC"""
+    if tz is None:
+        return (day.toordinal() - EPOCH_ORDINAL) * DAY_MS
+    wall = datetime(day.year, day.month, day.day)
+    # pytz zones must localize; ZoneInfo zones are attached
+    localize = getattr(tz, "localize", None)
+    return int((localize(wall) if localize is not None else wall.replace(tzinfo=tz)).timestamp() * 1000)
+
+
+class PeriodIndex:
+    """
+    Sorted period boundaries in epoch ms, with one key per period.
+
+    Period i covers boundaries[i] <= t < boundaries[i + 1], so finding a
+    timestamp's period is one bisect_right (one searchsorted for arrays)
+    instead of a datetime conversion per row. period_index puts calendar
+    boundaries at local midnights, so periods follow the timezone's DST
+    shifts; aging_period_index puts them at the as-of date minus each edge.
+    """
+
+    def __init__(
+        self,
+        boundaries: Sequence[float],
+        keys: Sequence[str],
+        kind: Optional[str] = None,
+        timezone_name: Optional[str] = None,
+        fiscal_year_start: int = FISCAL_YEAR_START
+    ):
+        if len(boundaries) != len(keys) + 1:
+            raise ValueError("A PeriodIndex needs exactly one more boundary than keys")
+        self.boundaries = list(boundaries)
+        self.keys = list(keys)
+        self.kind = kind
+        self.timezone = timezone_name
+        self.fiscal_year_start = fiscal_year_start
+        self._tz = _resolve_timezone(timezone_name) if timezone_name not in (None, "UTC") else None
+        self._array = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def period_id(self, timestamp: float) -> int:
+        """Index of the period containing timestamp, or -1 outside the index (and for NaN)"""
+        slot = bisect_right(self.boundaries, timestamp)
+        return slot - 1 if 0 < slot < len(self.boundaries) else -1
+
+    def ids(self, timestamps: Iterable[float]):
+        """period_id of many timestamps: an int64 array on the numpy backend, else a list"""
+        if _backend == "numpy":
+            if self._array is None:
+                self._array = np.asarray(self.boundaries, dtype=np.float64)
+            slots = np.searchsorted(self._array, np.asarray(timestamps, dtype=np.float64), side="right")
+            return np.where((slots > 0) & (slots < len(self._array)), slots - 1, -1)
+        boundaries = self.boundaries
+        last = len(boundaries)
+        ids = []
+        for timestamp in timestamps:
+            slot = bisect_right(boundaries, timestamp)
+            ids.append(slot - 1 if 0 < slot < last else -1)
+        return ids
+
+    def key_of(self, timestamp: float) -> Optional[str]:
+        """Key of the period containing timestamp; calendar indexes also label timestamps outside their span"""
+        period = self.period_id(timestamp)
+        if period >= 0:
+            return self.keys[period]
+        if self.kind is None or timestamp != timestamp:
+            return None
+        day = datetime.fromtimestamp(timestamp / 1000, self._tz or timezone.utc).date()
+        return _period_key(self.kind, _period_start(self.kind, day, self.fiscal_year_start), self.fiscal_year_start)
+
+    def totals(self, timestamps, cents) -> List[int]:
+        """Exact cents per period, in key order; timestamps outside the index are dropped"""
+        if _backend == "numpy":
+            ids = self.ids(timestamps)
+            cents = np.asarray(cents, dtype=np.int64)
+            inside = ids >= 0
+            ids, cents = ids[inside], cents[inside]
+            if int(np.abs(cents).sum()) < 2 ** 53:
+                # float64 bincount weights are exact below 2**53 cents
+                sums = np.bincount(ids, weights=cents, minlength=len(self.keys))
+            else:
+                sums = np.zeros(len(self.keys), dtype=np.int64)
+                np.add.at(sums, ids, cents)
+            return [int(value) for value in sums]
+        sums = [0] * len(self.keys)
+        for period, amount in zip(self.ids(timestamps), cents):
+            if period >= 0:
+                sums[period] += amount
+        return sums
+
+
+@lru_cache(maxsize=32)
+def period_index(
+    kind: str = "month",
+    timezone_name: str = "UTC",
+    fiscal_year_start: int = FISCAL_YEAR_START,
+    first_year: int = PERIOD_FIRST_YEAR,
+    last_year: int = PERIOD_LAST_YEAR
+) -> PeriodIndex:
+    """
+    Calendar PeriodIndex from first_year through last_year, built once per argument set.
+
+    Args:
+        kind: month, iso_week, quarter or fiscal_year
+        timezone_name: IANA timezone whose local midnights bound the periods
+        fiscal_year_start: Month (1-12) fiscal years start in
+
+    Raises:
+        ValueError: For an unknown kind or timezone, or a month outside 1-12
+    """
+    if kind not in PERIOD_KINDS:
+        raise ValueError(f"Unknown period '{kind}'; use one of {', '.join(PERIOD_KINDS)}")
+    if not 1 <= fiscal_year_start <= 12:
+        raise ValueError(f"Fiscal year start must be a month from 1 to 12, got {fiscal_year_start}")
+    timezone_name = timezone_name or "UTC"
+    tz = _resolve_timezone(timezone_name) if timezone_name != "UTC" else None
+    if timezone_name != "UTC" and tz is None:
+        raise ValueError(f"Unknown timezone '{timezone_name}'")
+
+    starts = [_period_start(kind, date(first_year, 1, 1), fiscal_year_start)]
+    end = date(last_year + 1, 1, 1)
+    while starts[-1] < end:
+        starts.append(_next_period_start(kind, starts[-1]))
+    return PeriodIndex(
+        [_local_midnight_ms(day, tz) for day in starts],
+        [_period_key(kind, day, fiscal_year_start) for day in starts[:-1]],
+        kind, timezone_name, fiscal_year_start,
+    )
+
+
+def aging_period_index(as_of: float, bucket_edges: Sequence[int] = AGING_BUCKET_EDGES) -> PeriodIndex:
+    """
+    Aging buckets as periods, oldest (e.g. 90+) first, keyed by their labels.
+
+    An age equal to an edge stays in the lower bucket (30 days old is
+    0-30): age <= edge days  <=>  date >= as_of - edge days, and a period
+    includes its lower boundary. Future dates fall in the newest bucket.
+    """
+    labels = aging_bucket_labels(bucket_edges)
+    thresholds = [as_of - edge * DAY_MS for edge in reversed(bucket_edges)]
+    return PeriodIndex([-float("inf")] + thresholds + [float("inf")], labels[::-1])
+
+
+def _aging_date(date: Any) -> float:
+    """
+    An invoice date (ms) ready to bisect into aging periods.
+
+    NaN ages into the oldest bucket (no "age <= edge" test holds for it) and
+    +inf into the newest; anything that is not a number is rejected.
+    """
+    if isinstance(date, bool) or not isinstance(date, (int, float)):
+        raise ValueError(f"Invalid invoice date {date!r}; expected epoch milliseconds")
+    if date != date:
+        return -float("inf")
+    return min(date, sys.float_info.max)
+
+
+def _iter_chunks(items: Iterable[Any], size: int = None) -> Iterator[List[Any]]:
+    """Yield lists of up to size items; works on lists and StreamedArray alike"""
+    iterator = iter(items)
+    size = size or COLUMN_CHUNK_SIZE
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _column_cents(values: List[Any]):
+    """Convert a column of report amounts to an int64 cents array, matching to_cents exactly"""
+    column = np.asarray(values)
+    if column.dtype.kind == "f":
+        scaled = column * 100
+        cents = np.rint(scaled)
+        exact = (np.abs(scaled) < _FAST_CENTS_LIMIT) & (np.abs(scaled - cents) < _HALF_CENT_GUARD)
+        result = cents.astype(np.int64)
+        for i in np.flatnonzero(~exact):
+            result[i] = to_cents(values[i])
+        return result
+    if column.dtype.kind in "iu" and (column.size == 0 or np.abs(column).max() < _FAST_CENTS_LIMIT):
+        return column.astype(np.int64) * 100
+    # Strings, bools, huge ints and mixed objects take the scalar path
+    return np.fromiter((to_cents(value) for value in values), dtype=np.int64, count=len(values))
+
+
+def _column_sum(values: List[Any], start: Any = 0) -> Any:
+    """Sequential left-to-right sum like builtins.sum, vectorized for numeric columns"""
+    column = np.asarray(values)
+    if column.dtype.kind == "f":
+        # cumsum accumulates in order, so the last element equals Python's float sum
+        return float(np.cumsum(np.concatenate(([start], column)))[-1])
+    if column.dtype.kind in "iu" and type(start) is int:
+        return start + int(column.sum(dtype=object))
+    return sum(values, start)
+
+
+def _calculate_trial_balance_numpy(entries: Iterable[Dict]) -> Tuple[int, int]:
+    """Columnar debit/credit totals in cents"""
+    total_debits = 0
+    total_credits = 0
+    for chunk in _iter_chunks(entries):
+        total_debits += int(_column_cents([entry.get("debit", 0) for entry in chunk]).sum())
+        total_credits += int(_column_cents([entry.get("credit", 0) for entry in chunk]).sum())
+    return total_debits, total_credits
+
+
+def _sum_balances_numpy(items: Iterable[Dict]) -> Any:
+    """Columnar equivalent of sum(item.get("balance", 0) for item in items)"""
+    total = 0
+    for chunk in _iter_chunks(items):
+        total = _column_sum([item.get("balance", 0) for item in chunk], total)
+    return total
+
+
+def _calculate_aging_buckets_numpy(transactions: Iterable[Dict], current_date: float, periods: "PeriodIndex") -> List[int]:
+    """Columnar aging: one searchsorted per chunk assigns buckets, PeriodIndex.totals sums cents per bucket"""
+    totals = [0] * len(periods)
+    if isinstance(transactions, ColumnArray):
+        date_column = transactions.column("date_ms")
+        amount_column = transactions.column("amount_cents")
+        for start in range(0, len(transactions), COLUMN_CHUNK_SIZE):
+            dates = date_column[start:start + COLUMN_CHUNK_SIZE]
+            dates = np.minimum(np.where(np.isnan(dates), current_date, dates), sys.float_info.max)
+            amounts = np.abs(amount_column[start:start + COLUMN_CHUNK_SIZE])
+            for i, cents in enumerate(periods.totals(dates, amounts)):
+                totals[i] += cents
+        return totals
+    for chunk in _iter_chunks(transactions):
+        dates = np.asarray([
+            _aging_date(current_date if transaction.get("date") is None else transaction["date"])
+            for transaction in chunk
+        ], dtype=np.float64)
+        amounts = _column_cents([abs(transaction.get("amount", 0)) for transaction in chunk])
+        for i, cents in enumerate(periods.totals(dates, amounts)):
+            totals[i] += cents
+    return totals
+
+
+def _column_side_totals(entries: "ColumnArray") -> Tuple[int, int]:
+    """Debit and credit cents totals straight from amount_cents/side columns"""
+    amounts = entries.column("amount_cents")
+    sides = entries.column("side")
+    if _backend == "numpy":
+        total = 0
+        credits = 0
+        for start in range(0, len(amounts), COLUMN_CHUNK_SIZE):
+            chunk = amounts[start:start + COLUMN_CHUNK_SIZE]
+            total += int(chunk.sum())
+            credits += int(chunk[sides[start:start + COLUMN_CHUNK_SIZE] == 1].sum())
+    else:
+        total = sum(amounts)
+        credits = sum(compress(amounts, sides))
+    return total - credits, credits
+
+
+def _items_total_cents(items: Iterable[Dict], extra: float = 0) -> int:
+    """Cents total of item balances plus extra, rounding the sum like the reports do"""
+    if isinstance(items, ColumnArray):
+        column = items.column("balance")
+        if _backend == "numpy":
+            total = 0
+            for start in range(0, len(column), COLUMN_CHUNK_SIZE):
+                total = _column_sum(column[start:start + COLUMN_CHUNK_SIZE], total)
+        else:
+            # Sequential float sum over the mapped doubles, same as summing the parsed list
+            total = sum(column)
+        return to_cents(total + extra)
+    if _backend == "numpy":
+        return to_cents(_sum_balances_numpy(items) + extra)
+    return to_cents(sum(item.get("balance", 0) for item in items) + extra)
+
+
+# Profiling is off unless main() installs a ValidationMetrics; hot paths only test this for None
+_metrics = None
+
+
+class ValidationMetrics:
+    """
+    Per-phase and per-function measurements for one validator run.
+
+    Phases record wall and CPU seconds, the process peak RSS high-water mark
+    and, when trace_memory is set, the tracemalloc peak inside the phase.
+    Phases may nest; names are joined with "/" (e.g. "ledger/scan").
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: List[Dict[str, Any]] = []
+        self.functions: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._started = (time.perf_counter(), time.process_time())
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the enclosed block as one phase"""
+        if self._stack:
+            name = f"{self._stack[-1]['name']}/{name}"
+        frame = {"name": name, "traced_peak": 0}
+        if self.trace_memory:
+            if self._stack:
+                # Fold the parent's peak so far in before resetting the shared counter
+                self._stack[-1]["traced_peak"] = max(self._stack[-1]["traced_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "name": name,
+                "wall_s": time.perf_counter() - wall,
+                "cpu_s": time.process_time() - cpu,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(frame["traced_peak"], tracemalloc.get_traced_memory()[1])
+                record["tracemalloc_peak_bytes"] = peak
+                if self._stack:
+                    self._stack[-1]["traced_peak"] = max(self._stack[-1]["traced_peak"], peak)
+            self.phases.append(record)
+
+    def record_call(self, name: str, rows: int, wall: float, cpu: float) -> None:
+        """Accumulate one call of an instrumented function"""
+        stats = self.functions.setdefault(name, {"calls": 0, "rows": 0, "wall_s": 0.0, "cpu_s": 0.0})
+        stats["calls"] += 1
+        stats["rows"] += rows
+        stats["wall_s"] += wall
+        stats["cpu_s"] += cpu
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metrics document; rows_per_s is derived per function"""
+        functions = {}
+        for name, stats in self.functions.items():
+            functions[name] = dict(stats, rows_per_s=stats["rows"] / stats["wall_s"] if stats["wall_s"] > 0 else None)
+        return {
+            "backend": _backend,
+            "wall_s": time.perf_counter() - self._started[0],
+            "cpu_s": time.process_time() - self._started[1],
+            "peak_rss_bytes": peak_rss_bytes(),
+            "tracemalloc_peak_bytes": tracemalloc.get_traced_memory()[1] if self.trace_memory else None,
+            "phases": self.phases,
+            "functions": functions,
+        }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Process peak resident set size in bytes (None where resource is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def enable_metrics(trace_memory: bool = False) -> ValidationMetrics:
+    """Start collecting metrics for this process"""
+    global _metrics
+    _metrics = ValidationMetrics(trace_memory=trace_memory)
+    return _metrics
+
+
+def _phase(name: str):
+    """Metrics phase when profiling is on, otherwise a no-op context"""
+    return _metrics.phase(name) if _metrics is not None else nullcontext()
+
+
+class _CountingIterable:
+    """Pass-through iterable counting the rows a calculator consumes"""
+
+    def __init__(self, iterable: Iterable[Any]):
+        self.iterable = iterable
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for item in self.iterable:
+            self.count += 1
+            yield item
+
+
+def _metered(*row_args: int):
+    """
+    Record calls, time and rows for a calculator when metrics are enabled.
+
+    Args:
+        row_args: Positional argument indexes holding row collections; sized
+                  arguments are counted with len(), others through a counting iterator
+    """
+    def decorate(func):
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _metrics is None:
+                return func(*args, **kwargs)
+            args = list(args)
+            counters = []
+            for index in row_args:
+                if index < len(args):
+                    if hasattr(args[index], "__len__"):
+                        counters.append(len(args[index]))
+                    else:
+                        args[index] = _CountingIterable(args[index])
+                        counters.append(args[index])
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            result = func(*args, **kwargs)
+            rows = sum(counter if isinstance(counter, int) else counter.count for counter in counters)
+            _metrics.record_call(name, rows, time.perf_counter() - wall, time.process_time() - cpu)
+            return result
+        return wrapper
+    return decorate
+
+
+class StackSampler:
+    """
+    Sampling profiler for the main thread writing collapsed stacks.
+
+    Output lines are "outer;...;inner count", the input format of
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._thread_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@_metered()
 def calculate_pnl(revenue: float, expenses: float) -> Dict[str, Any]:
     """Calculate Profit & Loss metrics"""
-    revenue_dec = round_decimal(revenue)
-    expenses_dec = round_decimal(expenses)
-    net_income = revenue_dec - expenses_dec
-    gross_margin = (net_income / revenue_dec * 100) if revenue_dec > 0 else Decimal('0')
+    revenue_cents = to_cents(revenue)
+    expenses_cents = to_cents(expenses)
+    net_income_cents = revenue_cents - expenses_cents
+    gross_margin = (
+        cents_to_decimal(net_income_cents) / cents_to_decimal(revenue_cents) * 100
+    ) if revenue_cents > 0 else Decimal('0')
     
     return {
-        "revenue": float(revenue_dec),
-        "expenses": float(expenses_dec),
-        "net_income": float(net_income),
+        "revenue": revenue_cents / 100,
+        "expenses": expenses_cents / 100,
+        "net_income": net_income_cents / 100,
         "gross_margin": float(gross_margin)
     }
 
 
+@_metered(0, 1, 2)
 def calculate_balance_sheet(assets: List[Dict], liabilities: List[Dict], equity: List[Dict], retained_earnings: float) -> Dict[str, Any]:
     """Calculate Balance Sheet totals and verify balance"""
-    total_assets = round_decimal(sum(item.get("balance", 0) for item in assets))
-    total_liabilities = round_decimal(sum(item.get("balance", 0) for item in liabilities))
-    total_equity = round_decimal(sum(item.get("balance", 0) for item in equity) + retained_earnings)
+    total_assets = _items_total_cents(assets)
+    total_liabilities = _items_total_cents(liabilities)
+    total_equity = _items_total_cents(equity, retained_earnings)
     total_liab_equity = total_liabilities + total_equity
     
     difference = abs(total_assets - total_liab_equity)
-    is_balanced = difference < Decimal('0.01')
+    is_balanced = difference < 1
     
     return {
-        "total_assets": float(total_assets),
-        "total_liabilities": float(total_liabilities),
-        "total_equity": float(total_equity),
-        "total_liabilities_and_equity": float(total_liab_equity),
-        "difference": float(difference),
+        "total_assets": total_assets / 100,
+        "total_liabilities": total_liabilities / 100,
+        "total_equity": total_equity / 100,
+        "total_liabilities_and_equity": total_liab_equity / 100,
+        "difference": difference / 100,
         "is_balanced": is_balanced
     }
 
 
+@_metered()
 def calculate_cash_flow(net_income: float, change_in_assets: float, change_in_liabilities: float) -> Dict[str, Any]:
     """Calculate Cash Flow from Operations (Indirect Method)"""
-    net_income_dec = round_decimal(net_income)
-    change_in_assets_dec = round_decimal(change_in_assets)
-    change_in_liabilities_dec = round_decimal(change_in_liabilities)
+    net_income_cents = to_cents(net_income)
+    change_in_assets_cents = to_cents(change_in_assets)
+    change_in_liabilities_cents = to_cents(change_in_liabilities)
     
-    cash_from_operations = net_income_dec - change_in_assets_dec + change_in_liabilities_dec
+    cash_from_operations = net_income_cents - change_in_assets_cents + change_in_liabilities_cents
     
     return {
-        "net_income": float(net_income_dec),
-        "change_in_current_assets": float(-change_in_assets_dec),
-        "change_in_current_liabilities": float(change_in_liabilities_dec),
-        "cash_from_operations": float(cash_from_operations)
+        "net_income": net_income_cents / 100,
+        # Negate the cents, not the float: -Decimal('0.00') is 0.00, and int zero has no sign
+        "change_in_current_assets": -change_in_assets_cents / 100,
+        "change_in_current_liabilities": change_in_liabilities_cents / 100,
+        "cash_from_operations": cash_from_operations / 100
     }
 
 
+@_metered(0)
 def calculate_trial_balance(entries: List[Dict]) -> Dict[str, Any]:
     """Calculate Trial Balance totals"""
-    total_debits = round_decimal(0)
-    total_credits = round_decimal(0)
-    
-    for entry in entries:
-        total_debits += round_decimal(entry.get("debit", 0))
-        total_credits += round_decimal(entry.get("credit", 0))
+    if isinstance(entries, ColumnArray):
+        total_debits, total_credits = _column_side_totals(entries)
+    elif _backend == "numpy":
+        total_debits, total_credits = _calculate_trial_balance_numpy(entries)
+    else:
+        total_debits = 0
+        total_credits = 0
+        cents = to_cents
+        
+        for entry in entries:
+            total_debits += cents(entry.get("debit", 0))
+            total_credits += cents(entry.get("credit", 0))
     
     difference = abs(total_debits - total_credits)
-    is_balanced = difference < Decimal('0.01')
+    is_balanced = difference < 1
     
     return {
-        "total_debits": float(total_debits),
-        "total_credits": float(total_credits),
-        "difference": float(difference),
+        "total_debits": total_debits / 100,
+        "total_credits": total_credits / 100,
+        "difference": difference / 100,
         "is_balanced": is_balanced
     }
 
 
+@_metered(0)
 def calculate_burn_rate(monthly_burns: List[float], current_balance: float) -> Dict[str, Any]:
     """Calculate burn rate and runway"""
     if not monthly_burns:
@@ -99,64 +1265,73 @@ def calculate_burn_rate(monthly_burns: List[float], current_balance: float) -> D
             "runway_months": None
         }
     
-    burns_dec = [round_decimal(burn) for burn in monthly_burns]
-    average_burn = sum(burns_dec) / len(burns_dec)
-    current_balance_dec = round_decimal(current_balance)
+    burns_cents = [to_cents(burn) for burn in monthly_burns]
+    average_burn = cents_to_decimal(sum(burns_cents)) / len(burns_cents)
+    current_balance_dec = cents_to_decimal(to_cents(current_balance))
     
     runway_months = float(current_balance_dec / average_burn) if average_burn > 0 else None
     
     return {
         "average_monthly_burn": float(average_burn),
-        "current_monthly_burn": float(burns_dec[-1]) if burns_dec else 0.0,
+        "current_monthly_burn": burns_cents[-1] / 100 if burns_cents else 0.0,
         "runway_months": runway_months
     }
 
 
+@_metered()
 def calculate_growth_rate(current: float, previous: float) -> Optional[float]:
     """Calculate percentage growth rate"""
     if previous == 0:
         return None
     growth = ((current - previous) / previous) * 100
-    return float(round_decimal(growth))
+    return to_cents(growth) / 100
 
 
-def calculate_aging_buckets(transactions: List[Dict], current_date: Optional[float] = None) -> Dict[str, float]:
+@_metered(0)
+def calculate_aging_buckets(
+    transactions: List[Dict],
+    current_date: Optional[float] = None,
+    bucket_edges: Sequence[int] = AGING_BUCKET_EDGES
+) -> Dict[str, float]:
     """Calculate aging buckets for receivables/payables"""
     if current_date is None:
         current_date = datetime.now().timestamp() * 1000
     
-    buckets = {
-        "0-30": round_decimal(0),
-        "31-60": round_decimal(0),
-        "61-90": round_decimal(0),
-        "90+": round_decimal(0)
-    }
-    
-    for transaction in transactions:
-        tx_date = transaction.get("date", current_date)
-        days_old = (current_date - tx_date) / (24 * 60 * 60 * 1000)
-        amount = round_decimal(abs(transaction.get("amount", 0)))
-        
-        if days_old <= 30:
-            buckets["0-30"] += amount
-        elif days_old <= 60:
-            buckets["31-60"] += amount
-        elif days_old <= 90:
-            buckets["61-90"] += amount
+    # Buckets are periods bounded by as-of minus each edge, so rows are bisected by date, never divided
+    periods = aging_period_index(current_date, bucket_edges)
+    if _backend == "numpy":
+        buckets = _calculate_aging_buckets_numpy(transactions, current_date, periods)
+    else:
+        buckets = [0] * len(periods)
+        boundaries = periods.boundaries
+        if isinstance(transactions, ColumnArray):
+            for tx_date, amount in transactions.iter_rows("date_ms", "amount_cents"):
+                # NaN marks an undated row in columns
+                tx_date = current_date if tx_date != tx_date else _aging_date(tx_date)
+                buckets[bisect_right(boundaries, tx_date) - 1] += abs(amount)
         else:
-            buckets["90+"] += amount
-    
-    return {k: float(v) for k, v in buckets.items()}
+            for transaction in transactions:
+                tx_date = transaction.get("date")
+                tx_date = _aging_date(current_date if tx_date is None else tx_date)
+                buckets[bisect_right(boundaries, tx_date) - 1] += to_cents(abs(transaction.get("amount", 0)))
+
+    # Periods run oldest first; labels run newest first
+    buckets.reverse()
+    return {label: cents / 100 for label, cents in zip(aging_bucket_labels(bucket_edges), buckets)}
 
 
-def validate_profit_loss(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate Profit & Loss report calculations"""
-    revenue_total = data.get("revenue", {}).get("total", 0)
-    expenses_total = data.get("expenses", {}).get("total", 0)
+def _profit_loss_figures(data: Dict[str, Any]) -> Dict[str, Any]:
+    """calculate_pnl of a P&L report's totals"""
+    return calculate_pnl(data.get("revenue", {}).get("total", 0), data.get("expenses", {}).get("total", 0))
+
+
+def validate_profit_loss(data: Dict[str, Any], calculated: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Validate Profit & Loss report calculations (calculated: precomputed _profit_loss_figures)"""
     reported_net_income = data.get("netIncome", 0)
     reported_gross_margin = data.get("grossMargin", 0)
     
-    calculated = calculate_pnl(revenue_total, expenses_total)
+    if calculated is None:
+        calculated = _profit_loss_figures(data)
     
     net_income_match = abs(calculated["net_income"] - reported_net_income) < 0.01
     margin_match = abs(calculated["gross_margin"] - reported_gross_margin) < 0.1
@@ -175,14 +1350,20 @@ def validate_profit_loss(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def validate_balance_sheet(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate Balance Sheet calculations"""
-    assets = data.get("assets", {}).get("items", [])
-    liabilities = data.get("liabilities", {}).get("items", [])
-    equity = data.get("equity", {}).get("items", [])
-    retained_earnings = data.get("equity", {}).get("retainedEarnings", 0)
-    
-    calculated = calculate_balance_sheet(assets, liabilities, equity, retained_earnings)
+def _balance_sheet_figures(data: Dict[str, Any]) -> Dict[str, Any]:
+    """calculate_balance_sheet of a balance sheet report's items"""
+    return calculate_balance_sheet(
+        data.get("assets", {}).get("items", []),
+        data.get("liabilities", {}).get("items", []),
+        data.get("equity", {}).get("items", []),
+        data.get("equity", {}).get("retainedEarnings", 0),
+    )
+
+
+def validate_balance_sheet(data: Dict[str, Any], calculated: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Validate Balance Sheet calculations (calculated: precomputed _balance_sheet_figures)"""
+    if calculated is None:
+        calculated = _balance_sheet_figures(data)
     
     reported_total_assets = data.get("assets", {}).get("total", 0)
     reported_total_liab_equity = data.get("totalLiabilitiesAndEquity", 0)
@@ -206,13 +1387,13 @@ def validate_balance_sheet(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def validate_trial_balance(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate Trial Balance calculations"""
-    entries = data.get("entries", [])
+def validate_trial_balance(data: Dict[str, Any], calculated: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Validate Trial Balance calculations (calculated: precomputed calculate_trial_balance of its entries)"""
     reported_totals = data.get("totals", {})
     reported_is_balanced = data.get("isBalanced", False)
     
-    calculated = calculate_trial_balance(entries)
+    if calculated is None:
+        calculated = calculate_trial_balance(data.get("entries", []))
     
     debits_match = abs(calculated["total_debits"] - reported_totals.get("debits", 0)) < 0.01
     credits_match = abs(calculated["total_credits"] - reported_totals.get("credits", 0)) < 0.01
@@ -265,23 +1446,535 @@ def validate_burn_rate(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+BURN_WINDOWS = (3, 6, 12)
+
+
+@lru_cache(maxsize=None)
+def _month_ordinal(month: Any) -> Optional[int]:
+    """Months since year 0 for a "YYYY-MM" key, or None when the key does not parse (cached per key)"""
+    try:
+        year, month_number = str(month).split("-")[:2]
+        ordinal = int(year) * 12 + int(month_number) - 1
+    except ValueError:
+        return None
+    return ordinal if 1 <= int(month_number) <= 12 else None
+
+
+def _ordinal_month(ordinal: int) -> str:
+    """Inverse of _month_ordinal"""
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+class BurnMatrix:
+    """
+    Monthly burns of many orgs on one (org x month) calendar grid.
+
+    Each org's reported months are placed by their "YYYY-MM" key; months
+    missing inside an org's first..last span count as zero burn, cells
+    outside it are inactive (None in every series). Orgs whose months do
+    not parse are still summarized, but get no series.
+
+    Cents are summed exactly (int64 prefix sums on the numpy backend), so a
+    trailing average is the correctly rounded float of sum / (100 * n) —
+    the same value as float() of the Decimal quotient calculate_burn_rate
+    computes. Runways divide per org in Decimal, exactly like
+    calculate_burn_rate.
+    """
+
+    def __init__(self, reports: Dict[str, Dict[str, Any]]):
+        self.orgs = list(reports)
+        self.reported = [reports[org] for org in self.orgs]
+        burn_rows = [data.get("monthlyBurns", []) for data in self.reported]
+        raw = [row.get("burn", 0) for rows in burn_rows for row in rows]
+        self.offsets = [0]
+        self.offsets.extend(accumulate(len(rows) for rows in burn_rows))
+        self.balances = [to_cents(data.get("endingBalance", 0)) for data in self.reported]
+
+        self.raw = raw
+        if _backend == "numpy":
+            self.cents = _column_cents(raw) if raw else np.zeros(0, dtype=np.int64)
+            self.prefix = np.concatenate(([0], np.cumsum(self.cents)))
+        else:
+            self.cents = [to_cents(burn) for burn in raw]
+            self.prefix = [0]
+            self.prefix.extend(accumulate(self.cents))
+        # The calendar grid is only needed for series; validation alone never builds it
+        self.grid = None
+
+    def _place(self) -> None:
+        """Place every reported month on the calendar grid; an org with any unparseable month is left off it"""
+        if self.grid is not None:
+            return
+        burn_rows = [data.get("monthlyBurns", []) for data in self.reported]
+        ordinals = [[_month_ordinal(row.get("month")) for row in rows] for rows in burn_rows]
+        placed = [bool(keys) and None not in keys for keys in ordinals]
+        spans = [(min(keys), max(keys)) if ok else None for keys, ok in zip(ordinals, placed)]
+        starts = [span[0] for span in spans if span]
+        self.start = min(starts) if starts else 0
+        self.width = max(span[1] for span in spans if span) - self.start + 1 if starts else 0
+        self.first = [span[0] - self.start if span else -1 for span in spans]
+        self.last = [span[1] - self.start if span else -2 for span in spans]
+        self.months = [_ordinal_month(self.start + column) for column in range(self.width)]
+
+        if _backend == "numpy":
+            org_index = np.repeat(np.arange(len(self.orgs)), [len(rows) for rows in burn_rows])
+            columns = np.array([
+                ordinal - self.start if ok else -1
+                for keys, ok in zip(ordinals, placed) for ordinal in keys
+            ], dtype=np.int64)
+            on_grid = columns >= 0
+            self.grid = np.zeros((len(self.orgs), self.width), dtype=np.int64)
+            self.values = np.zeros((len(self.orgs), self.width), dtype=np.float64)
+            # add.at so a month reported twice accumulates instead of overwriting
+            np.add.at(self.grid, (org_index[on_grid], columns[on_grid]), self.cents[on_grid])
+            np.add.at(self.values, (org_index[on_grid], columns[on_grid]),
+                      np.asarray(self.raw, dtype=np.float64)[on_grid])
+        else:
+            self.grid = []
+            self.values = []
+            position = 0
+            for keys, ok, first, last in zip(ordinals, placed, self.first, self.last):
+                grid = [0] * (last - first + 1)
+                values = [0.0] * (last - first + 1)
+                for ordinal in keys:
+                    if ok:
+                        column = ordinal - self.start - first
+                        grid[column] += self.cents[position]
+                        values[column] += float(self.raw[position])
+                    position += 1
+                # Python rows cover only the org's own span, offset by self.first
+                self.grid.append(grid)
+                self.values.append(values)
+
+    def __len__(self) -> int:
+        return len(self.orgs)
+
+    def _runway(self, balance_cents: int, burn_cents: int, months: int) -> Optional[float]:
+        """calculate_burn_rate's Decimal runway for a burn total over months"""
+        if months <= 0 or burn_cents <= 0:
+            return None
+        return float(cents_to_decimal(balance_cents) / (cents_to_decimal(burn_cents) / months))
+
+    def summary(self, index: int) -> Dict[str, Any]:
+        """Whole-history figures for one org, equal to calculate_burn_rate on its monthlyBurns"""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if start == end:
+            return {"average_monthly_burn": 0.0, "runway_months": None}
+        total = int(self.prefix[end] - self.prefix[start])
+        return {
+            "average_monthly_burn": float(cents_to_decimal(total) / (end - start)),
+            "current_monthly_burn": int(self.cents[end - 1]) / 100,
+            "runway_months": self._runway(self.balances[index], total, end - start),
+        }
+
+    def trailing(self, window: int) -> Tuple[List[List[Optional[float]]], List[Optional[float]]]:
+        """
+        Trailing window-month average burn per org and active month, and the
+        runway at each org's last month from that average.
+
+        Windows are calendar months clipped at the org's first month, so the
+        first window - 1 averages cover fewer months.
+        """
+        self._place()
+        averages = []
+        runways = []
+        if _backend == "numpy":
+            first = np.asarray(self.first, dtype=np.int64)[:, None]
+            columns = np.arange(self.width, dtype=np.int64)[None, :]
+            prefix = np.zeros((len(self.orgs), self.width + 1), dtype=np.int64)
+            np.cumsum(self.grid, axis=1, out=prefix[:, 1:])
+            lower = np.clip(np.maximum(first, columns - window + 1), 0, None)
+            sums = prefix[:, 1:] - np.take_along_axis(prefix, lower, axis=1)
+            counts = columns - lower + 1
+            # Cells before an org's first month have counts <= 0; they are never read
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = sums / (counts * 100.0)
+            for index in range(len(self.orgs)):
+                if self.first[index] < 0:
+                    averages.append([])
+                    runways.append(None)
+                    continue
+                row_end = self.last[index]
+                averages.append(matrix[index, self.first[index]:row_end + 1].tolist())
+                runways.append(self._runway(self.balances[index], int(sums[index, row_end]),
+                                            int(counts[index, row_end])))
+        else:
+            for index, grid in enumerate(self.grid):
+                if not grid:
+                    averages.append([])
+                    runways.append(None)
+                    continue
+                prefix = [0]
+                prefix.extend(accumulate(grid))
+                # Windows clipped at the first month, then full windows as prefix differences
+                row = [prefix[column] / (column * 100) for column in range(1, min(window, len(grid)) + 1)]
+                scale = window * 100
+                row.extend((upper - lower) / scale for upper, lower in zip(prefix[window + 1:], prefix[1:]))
+                averages.append(row)
+                lower = max(0, len(grid) - window)
+                runways.append(self._runway(self.balances[index], prefix[-1] - prefix[lower], len(grid) - lower))
+        return averages, runways
+
+    def growth(self) -> List[List[Optional[float]]]:
+        """
+        Month-over-month burn growth per org and active month, equal to
+        calculate_growth_rate(burn, previous burn); None for each org's first
+        month and after a zero-burn month.
+        """
+        self._place()
+        if _backend != "numpy":
+            return [
+                [None] + [
+                    to_cents(((current - previous) / previous) * 100) / 100 if previous != 0 else None
+                    for previous, current in zip(values, values[1:])
+                ]
+                if values else []
+                for values in self.values
+            ]
+        previous = self.values[:, :-1]
+        current = self.values[:, 1:]
+        columns = np.arange(1, self.width, dtype=np.int64)[None, :]
+        defined = (
+            (columns - 1 >= np.asarray(self.first)[:, None])
+            & (columns <= np.asarray(self.last)[:, None])
+            & (previous != 0)
+        )
+        rates = np.full(previous.shape, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw = ((current[defined] - previous[defined]) / previous[defined]) * 100
+        rates[defined] = _column_cents(raw) / 100 if raw.size else raw
+        series = []
+        for index in range(len(self.orgs)):
+            if self.first[index] < 0:
+                series.append([])
+                continue
+            row = rates[index, self.first[index]:self.last[index]].tolist()
+            series.append([None] + [None if rate != rate else rate for rate in row])
+        return series
+
+    def series(self, windows: Sequence[int] = BURN_WINDOWS) -> Dict[str, Dict[str, Any]]:
+        """Per-org calendar months, burns, growth and trailing averages/runways for each window"""
+        self._place()
+        trailing = {window: self.trailing(window) for window in windows}
+        growth = self.growth()
+        result = {}
+        for index, org in enumerate(self.orgs):
+            if self.first[index] < 0:
+                result[org] = None
+                continue
+            first, last = self.first[index], self.last[index]
+            if _backend == "numpy":
+                burns = (self.grid[index, first:last + 1] / 100).tolist()
+            else:
+                burns = [cents / 100 for cents in self.grid[index]]
+            result[org] = {
+                "months": self.months[first:last + 1],
+                "burn": burns,
+                "growth": growth[index],
+                "trailing": {
+                    str(window): {"average_burn": averages[index], "runway_months": runways[index]}
+                    for window, (averages, runways) in trailing.items()
+                },
+            }
+        return result
+
+    def monthly_mismatches(self) -> List[List[str]]:
+        """Per org, months whose reported burn differs from expenses - revenue, where both are reported"""
+        checked = [
+            (index, position, row)
+            for index, data in enumerate(self.reported)
+            for position, row in enumerate(data.get("monthlyBurns", []))
+            if "revenue" in row and "expenses" in row
+        ]
+        positions = [self.offsets[index] + position for index, position, _ in checked]
+        if _backend == "numpy" and checked:
+            differences = (
+                _column_cents([row["expenses"] for _, _, row in checked])
+                - _column_cents([row["revenue"] for _, _, row in checked])
+                - self.cents[np.asarray(positions, dtype=np.int64)]
+            )
+            flagged = np.flatnonzero(differences).tolist()
+        else:
+            flagged = [
+                i for i, ((_, _, row), position) in enumerate(zip(checked, positions))
+                if to_cents(row["expenses"]) - to_cents(row["revenue"]) != self.cents[position]
+            ]
+        mismatched = [[] for _ in self.orgs]
+        for i in flagged:
+            index, position, row = checked[i]
+            mismatched[index].append(row.get("month", str(position)))
+        return mismatched
+
+
+@_metered(0)
+def validate_burn_rates(
+    reports: Dict[str, Dict[str, Any]],
+    windows: Optional[Sequence[int]] = None
+) -> Dict[str, Any]:
+    """
+    Validate many burn_rate reports in one pass over a shared BurnMatrix.
+
+    Args:
+        reports: burn_rate report data keyed by org
+        windows: Trailing windows in months; when given, each org's series
+                 (trailing averages, runways and growth) is included
+
+    Returns:
+        Summary plus per-org results shaped like validate_burn_rate, whose
+        discrepancies also list months where burn != expenses - revenue
+    """
+    matrix = BurnMatrix(reports)
+    mismatches = matrix.monthly_mismatches()
+    results = {}
+    passed = 0
+    for index, org in enumerate(matrix.orgs):
+        data = matrix.reported[index]
+        calculated = matrix.summary(index)
+        reported_avg_burn = data.get("averageMonthlyBurn", 0)
+        reported_runway = data.get("runwayMonths")
+        avg_burn_match = abs(calculated["average_monthly_burn"] - reported_avg_burn) < 0.01
+        runway_match = (
+            calculated["runway_months"] is None and reported_runway is None
+        ) or (
+            calculated["runway_months"] is not None and reported_runway is not None and
+            abs(calculated["runway_months"] - reported_runway) < 0.1
+        )
+        mismatched = mismatches[index]
+        valid = avg_burn_match and runway_match and not mismatched
+        passed += valid
+        results[org] = {
+            "valid": valid,
+            "calculated": calculated,
+            "reported": {
+                "average_monthly_burn": reported_avg_burn,
+                "runway_months": reported_runway
+            },
+            "discrepancies": {
+                "average_burn": abs(calculated["average_monthly_burn"] - reported_avg_burn) if not avg_burn_match else 0,
+                "runway": abs(calculated["runway_months"] - reported_runway) if not runway_match and calculated["runway_months"] and reported_runway else 0,
+                "monthly_burns": mismatched,
+            }
+        }
+    summary = {
+        "valid": passed == len(results),
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "reports": results,
+    }
+    if windows:
+        for org, series in matrix.series(windows).items():
+            results[org]["series"] = series
+        summary["months"] = matrix.months
+    return summary
+
+
+def load_burn_reports(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read burn_rate reports keyed by org from a JSON object ({org: data}) or
+    an NDJSON export of {orgId, report_type, data} lines; other report types
+    are skipped.
+    """
+    with open(path, 'r') as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == "{":
+            try:
+                document = json.load(f)
+            except json.JSONDecodeError:
+                # One-object-per-line exports also start with "{"
+                document = None
+            if document is not None and "orgId" not in document:
+                return document
+    reports = {}
+    for record in _iter_ndjson(path):
+        if record.get("report_type", "burn_rate") == "burn_rate" and "data" in record:
+            reports[str(record.get("orgId", UNKNOWN_ORG))] = record["data"]
+    return reports
+
+
+class AgingIndex:
+    """
+    Per-party sorted invoice dates with cents prefix sums.
+
+    Built once, then bucketed for any as-of date and bucket edges with one
+    bisection per edge per party, instead of re-scanning every invoice.
+    """
+
+    def __init__(self, invoices: Iterable[Dict], party_key: str = "customer", default_party: str = "Unknown"):
+        grouped: Dict[str, List[Tuple[float, int]]] = {}
+        undated: Dict[str, int] = {}
+        count = 0
+        if isinstance(invoices, ColumnArray):
+            # Columnized invoices carry their own party dictionary and cents; NaN marks undated
+            keys = invoices.keys
+            rows = (
+                (keys[code], None if date != date else _aging_date(date), abs(amount))
+                for code, date, amount in invoices.iter_rows("account_id", "date_ms", "amount_cents")
+            )
+        else:
+            rows = (
+                (
+                    invoice.get(party_key),
+                    None if invoice.get("date") is None else _aging_date(invoice["date"]),
+                    to_cents(abs(invoice.get("amount", 0))),
+                )
+                for invoice in invoices
+            )
+        for party, date, amount in rows:
+            count += 1
+            party = party or default_party
+            if date is None:
+                # Undated rows age from the as-of date, like calculate_aging_buckets
+                undated[party] = undated.get(party, 0) + amount
+            else:
+                grouped.setdefault(party, []).append((date, amount))
+
+        self.count = count
+        self.undated = undated
+        self.parties: Dict[str, Tuple[List[float], List[int]]] = {}
+        for party, rows in grouped.items():
+            rows.sort()
+            prefix = [0]
+            prefix.extend(accumulate(amount for _, amount in rows))
+            self.parties[party] = ([date for date, _ in rows], prefix)
+
+    @staticmethod
+    def _bucket_cents(dates: List[float], prefix: List[int], thresholds: List[float]) -> List[int]:
+        """Split one party's cents by date thresholds (newest bucket first)"""
+        buckets = []
+        upper = len(dates)
+        for threshold in thresholds:
+            lower = bisect_left(dates, threshold)
+            buckets.append(prefix[upper] - prefix[lower])
+            upper = lower
+        buckets.append(prefix[upper])
+        return buckets
+
+    def buckets(self, as_of: float, bucket_edges: Sequence[int] = AGING_BUCKET_EDGES) -> Dict[str, Any]:
+        """
+        Aging buckets per party and in total.
+
+        An invoice falls in the first bucket whose edge is >= its age in days,
+        so an invoice exactly 30 days old is in 0-30.
+        """
+        labels = aging_bucket_labels(bucket_edges)
+        # The same boundaries calculate_aging_buckets bisects by, newest first
+        thresholds = aging_period_index(as_of, bucket_edges).boundaries[-2:0:-1]
+        totals = [0] * len(labels)
+        by_party = {}
+        for party in sorted(set(self.parties) | set(self.undated), key=str):
+            if party in self.parties:
+                party_buckets = self._bucket_cents(*self.parties[party], thresholds)
+            else:
+                party_buckets = [0] * len(labels)
+            party_buckets[0] += self.undated.get(party, 0)
+            for i, cents in enumerate(party_buckets):
+                totals[i] += cents
+            by_party[party] = {
+                "buckets": {label: cents / 100 for label, cents in zip(labels, party_buckets)},
+                "total": sum(party_buckets) / 100,
+            }
+        return {
+            "as_of": as_of,
+            "invoices": self.count,
+            "buckets": {label: cents / 100 for label, cents in zip(labels, totals)},
+            "total": sum(totals) / 100,
+            "by_party": by_party,
+        }
+
+
+@_metered(0)
+def age_invoices(
+    invoices: Iterable[Dict],
+    as_of: Optional[float] = None,
+    bucket_edges: Sequence[int] = AGING_BUCKET_EDGES,
+    party_key: str = "customer"
+) -> Dict[str, Any]:
+    """
+    Age per-invoice rows into buckets per party and in total.
+
+    Args:
+        invoices: Rows with date (ms), amount and a party field
+        as_of: Aging date in ms (default: now)
+        bucket_edges: Ascending bucket edges in days
+        party_key: Field naming the customer or vendor
+
+    Returns:
+        Total and per-party bucket breakdowns
+    """
+    if as_of is None:
+        as_of = datetime.now().timestamp() * 1000
+    return AgingIndex(invoices, party_key=party_key).buckets(as_of, bucket_edges)
+
+
+def _compare_aging(aging: Dict[str, Any], reported_buckets: Dict[str, float], reported_total: float) -> Dict[str, Any]:
+    """Compare engine buckets and total with reported values"""
+    total_match = abs(aging["total"] - reported_total) < 0.01
+    bucket_discrepancies = {
+        label: abs(aging["buckets"].get(label, 0) - amount)
+        for label, amount in reported_buckets.items()
+        if abs(aging["buckets"].get(label, 0) - amount) >= 0.01
+    }
+    return {
+        "valid": total_match and not bucket_discrepancies,
+        "discrepancies": {
+            "total": abs(aging["total"] - reported_total) if not total_match else 0,
+            "buckets": bucket_discrepancies,
+        },
+    }
+
+
 def validate_accounts_receivable(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate Accounts Receivable aging buckets"""
     customers = data.get("customers", [])
     reported_buckets = data.get("agingBuckets", {})
     reported_total = data.get("totalOutstanding", 0)
     
-    # Reconstruct transactions from customers
-    transactions = []
-    for customer in customers:
-        # Use oldest transaction date as proxy
-        oldest_date = customer.get("oldestTransaction", 0)
-        transactions.append({
-            "date": oldest_date,
+    if "invoices" in data:
+        # Per-invoice export: age every open invoice instead of one proxy row per customer
+        aging = age_invoices(
+            data["invoices"],
+            as_of=data.get("asOfDate"),
+            bucket_edges=data.get("agingBucketEdges") or AGING_BUCKET_EDGES,
+            party_key="customer",
+        )
+        comparison = _compare_aging(aging, reported_buckets, reported_total)
+        customer_discrepancies = {}
+        for customer in customers:
+            name = customer.get("customer")
+            calculated_owed = aging["by_party"].get(name, {}).get("total", 0)
+            if abs(calculated_owed - customer.get("totalOwed", 0)) >= 0.01:
+                customer_discrepancies[name] = abs(calculated_owed - customer.get("totalOwed", 0))
+        comparison["discrepancies"]["customers"] = customer_discrepancies
+        return {
+            "valid": comparison["valid"] and not customer_discrepancies,
+            "calculated": {
+                "aging_buckets": aging["buckets"],
+                "total_outstanding": aging["total"],
+                "customers": aging["by_party"],
+                "as_of": aging["as_of"]
+            },
+            "reported": {
+                "aging_buckets": reported_buckets,
+                "total_outstanding": reported_total
+            },
+            "discrepancies": comparison["discrepancies"]
+        }
+    
+    # Reconstruct transactions from customers, lazily so streamed input stays bounded
+    transactions = (
+        {
+            # Use oldest transaction date as proxy
+            "date": customer.get("oldestTransaction", 0),
             "amount": customer.get("totalOwed", 0)
-        })
+        }
+        for customer in customers
+    )
     
-    calculated_buckets = calculate_aging_buckets(transactions)
+    calculated_buckets = calculate_aging_buckets(transactions, data.get("asOfDate"))
     calculated_total = sum(calculated_buckets.values())
     
     total_match = abs(calculated_total - reported_total) < 0.01
@@ -302,43 +1995,2196 @@ def validate_accounts_receivable(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def validate_accounts_payable(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate Accounts Payable outstanding bills and aging buckets"""
+    reported_buckets = data.get("agingBuckets", {})
+    reported_total = data.get("totalOutstanding", 0)
+    
+    aging = age_invoices(
+        data.get("outstandingBills", []),
+        as_of=data.get("asOfDate"),
+        bucket_edges=data.get("agingBucketEdges") or AGING_BUCKET_EDGES,
+        party_key="vendor",
+    )
+    comparison = _compare_aging(aging, reported_buckets, reported_total)
+    
+    return {
+        "valid": comparison["valid"],
+        "calculated": {
+            "aging_buckets": aging["buckets"],
+            "total_outstanding": aging["total"],
+            "vendors": aging["by_party"],
+            "as_of": aging["as_of"]
+        },
+        "reported": {
+            "aging_buckets": reported_buckets,
+            "total_outstanding": reported_total
+        },
+        "discrepancies": comparison["discrepancies"]
+    }
+
+
+validators = {
+    "pnl": validate_profit_loss,
+    "profit_loss": validate_profit_loss,
+    "balance_sheet": validate_balance_sheet,
+    "trial_balance": validate_trial_balance,
+    "burn_rate": validate_burn_rate,
+    "ar": validate_accounts_receivable,
+    "accounts_receivable": validate_accounts_receivable,
+    "ap": validate_accounts_payable,
+    "accounts_payable": validate_accounts_payable,
+}
+
+AGING_REPORT_TYPES = ("ar", "accounts_receivable", "ap", "accounts_payable")
+
+
+# Report types that can be rebuilt from entries_final + entry_lines
+LEDGER_REPORT_TYPES = {
+    "pnl": "pnl",
+    "profit_loss": "pnl",
+    "balance_sheet": "balance_sheet",
+    "trial_balance": "trial_balance",
+    "burn_rate": "burn_rate",
+}
+
+# Debit-normal account types; liability, equity and income are credit-normal
+DEBIT_NORMAL_TYPES = ("asset", "expense")
+
+
+def _month_key(timestamp: float) -> str:
+    """UTC "YYYY-MM" month key, matching the Convex runtime's Date month buckets"""
+    return period_index("month").key_of(timestamp)
+
+
+def _ledger_cutoffs(reports: Dict[str, Dict[str, Any]], as_of: float) -> List[float]:
+    """Date cutoffs (inclusive upper bounds) needed to rebuild the requested reports"""
+    cutoffs = {as_of}
+    for report_type, data in reports.items():
+        if report_type in ("trial_balance", "balance_sheet") and data.get("asOfDate") is not None:
+            cutoffs.add(data["asOfDate"])
+        elif report_type == "pnl":
+            date_range = data.get("dateRange") or {}
+            if date_range.get("start") is not None:
+                # Entry dates are integer ms, so "date < start" is "date <= start - 1"
+                cutoffs.add(date_range["start"] - 1)
+            if date_range.get("end") is not None:
+                cutoffs.add(date_range["end"])
+    return sorted(cutoffs)
+
+
+@_metered(1)
+def scan_ledger(
+    accounts: Iterable[Dict],
+    entry_lines: Iterable[Dict],
+    entries: Optional[Iterable[Dict]] = None,
+    cutoffs: Sequence[float] = (),
+    periods: Optional[PeriodIndex] = None
+) -> Dict[str, Any]:
+    """
+    Aggregate raw entry lines in a single pass.
+
+    Args:
+        accounts: Account rows with _id and type
+        entry_lines: Entry line rows (entryId, accountId, side, amount, date)
+        entries: entries_final rows (or an entryId -> date dict), only read if
+                 a line lacks its denormalized date
+        cutoffs: Sorted inclusive date cutoffs; each account gets one signed
+                 (debit - credit) cents total per segment between them
+        periods: Calendar PeriodIndex the per-account totals are keyed by
+                 (default: UTC months, like the Convex reports)
+
+    Returns:
+        Per-account segment totals, per-account cents per period (under
+        "account_months", whatever the period) and the entryIds whose
+        entries_final dates placed undated lines
+    """
+    cutoffs = list(cutoffs)
+    segment_count = len(cutoffs) + 1
+    segments: Dict[str, List[int]] = {}
+    account_months: Dict[str, Dict[str, int]] = {}
+    periods = periods or period_index("month")
+    boundaries = periods.boundaries
+    # Lines usually arrive in date order, so the last period is checked before bisecting
+    period_start = period_end = 0
+    month = None
+    entry_dates = None
+    undated_entries = set()
+    line_count = 0
+    min_date = None
+    max_date = None
+    cents = to_cents
+
+    for line in entry_lines:
+        line_count += 1
+        account_id = line.get("accountId")
+
+        date = line.get("date")
+        if date is None:
+            if entry_dates is None:
+                entry_dates = entries if isinstance(entries, dict) else {
+                    entry["_id"]: entry.get("date", 0) for entry in (entries or ())
+                }
+            entry_id = line.get("entryId")
+            undated_entries.add(entry_id)
+            date = entry_dates.get(entry_id, 0)
+        if min_date is None or date < min_date:
+            min_date = date
+        if max_date is None or date > max_date:
+            max_date = date
+
+        amount = cents(line.get("amount", 0))
+        signed = amount if line.get("side") == "debit" else -amount
+
+        account_segments = segments.get(account_id)
+        if account_segments is None:
+            account_segments = segments[account_id] = [0] * segment_count
+            account_months[account_id] = {}
+        account_segments[bisect_left(cutoffs, date)] += signed
+
+        if not period_start <= date < period_end:
+            period = periods.period_id(date)
+            if period >= 0:
+                month = periods.keys[period]
+                period_start, period_end = boundaries[period], boundaries[period + 1]
+            else:
+                month = periods.key_of(date)
+                period_start = period_end = 0
+        monthly = account_months[account_id]
+        monthly[month] = monthly.get(month, 0) + signed
+
+    return {
+        "account_types": {account["_id"]: account.get("type") for account in accounts},
+        "cutoffs": cutoffs,
+        "segments": segments,
+        "account_months": account_months,
+        "periods": periods.kind,
+        "lines": line_count,
+        "min_date": min_date,
+        "max_date": max_date,
+        "undated_entries": undated_entries,
+    }
+
+
+def _ledger_balances(scan: Dict[str, Any], start: Optional[float], end: float) -> Iterator[Tuple[str, str, int]]:
+    """Yield (account_id, type, debit - credit cents) for start < date <= end"""
+    cutoffs = scan["cutoffs"]
+    account_types = scan["account_types"]
+    end_index = bisect_left(cutoffs, end)
+    start_index = bisect_left(cutoffs, start) if start is not None else -1
+    for account_id, account_segments in scan["segments"].items():
+        account_type = account_types.get(account_id)
+        # Lines posted to accounts missing from the export are ignored, as in the reports
+        if account_type is not None:
+            yield account_id, account_type, sum(account_segments[start_index + 1:end_index + 1])
+
+
+def _ledger_month_totals(scan: Dict[str, Any]) -> Dict[str, List[int]]:
+    """Per-month [revenue, expenses] cents from income and expense accounts"""
+    months: Dict[str, List[int]] = {}
+    account_types = scan["account_types"]
+    for account_id, monthly in scan["account_months"].items():
+        account_type = account_types.get(account_id)
+        if account_type not in ("income", "expense"):
+            continue
+        for month, signed in monthly.items():
+            totals = months.setdefault(month, [0, 0])
+            if account_type == "income":
+                totals[0] -= signed
+            else:
+                totals[1] += signed
+    return months
+
+
+def rebuild_trial_balance(scan: Dict[str, Any], as_of: float) -> Dict[str, Any]:
+    """Trial balance totals from ledger aggregates"""
+    total_debits = 0
+    total_credits = 0
+    for _, _, balance in _ledger_balances(scan, None, as_of):
+        # Each account lands on whichever side its net balance falls
+        if balance > 0:
+            total_debits += balance
+        else:
+            total_credits -= balance
+    return {
+        "asOfDate": as_of,
+        "totals": {"debits": total_debits / 100, "credits": total_credits / 100},
+        "isBalanced": total_debits == total_credits,
+        "difference": (total_debits - total_credits) / 100,
+    }
+
+
+def rebuild_balance_sheet(scan: Dict[str, Any], as_of: float) -> Dict[str, Any]:
+    """Balance sheet totals and retained earnings from ledger aggregates"""
+    totals = {"asset": 0, "liability": 0, "equity": 0, "income": 0, "expense": 0}
+    for _, account_type, balance in _ledger_balances(scan, None, as_of):
+        if account_type == "liability":
+            totals["liability"] += abs(balance)
+        elif account_type in DEBIT_NORMAL_TYPES:
+            totals[account_type] += balance
+        elif account_type in totals:
+            totals[account_type] -= balance
+    retained_earnings = totals["income"] - totals["expense"]
+    total_liab_equity = totals["liability"] + totals["equity"] + retained_earnings
+    return {
+        "asOfDate": as_of,
+        "assets": {"total": totals["asset"] / 100},
+        "liabilities": {"total": totals["liability"] / 100},
+        "equity": {"total": totals["equity"] / 100, "retainedEarnings": retained_earnings / 100},
+        "totalLiabilitiesAndEquity": total_liab_equity / 100,
+        "isBalanced": totals["asset"] == total_liab_equity,
+    }
+
+
+def rebuild_profit_loss(scan: Dict[str, Any], start: Optional[float], end: float) -> Dict[str, Any]:
+    """P&L totals; like the report, only accounts with positive activity count"""
+    total_revenue = 0
+    total_expenses = 0
+    for _, account_type, balance in _ledger_balances(scan, start, end):
+        if account_type == "income" and balance < 0:
+            total_revenue -= balance
+        elif account_type == "expense" and balance > 0:
+            total_expenses += balance
+    net_income = total_revenue - total_expenses
+    calculated = calculate_pnl(total_revenue / 100, total_expenses / 100)
+    return {
+        "revenue": {"total": total_revenue / 100},
+        "expenses": {"total": total_expenses / 100},
+        "netIncome": net_income / 100,
+        "grossMargin": calculated["gross_margin"],
+    }
+
+
+def rebuild_burn_rate(scan: Dict[str, Any], as_of: float, months: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Monthly burn (expenses - revenue) and runway from ledger aggregates"""
+    month_totals = _ledger_month_totals(scan)
+    months = months if months is not None else sorted(month_totals)
+    monthly_burns = []
+    for month in months:
+        revenue, expenses = month_totals.get(month, (0, 0))
+        monthly_burns.append({
+            "month": month,
+            "revenue": revenue / 100,
+            "expenses": expenses / 100,
+            "burn": (expenses - revenue) / 100,
+        })
+    ending_balance = sum(
+        balance for _, account_type, balance in _ledger_balances(scan, None, as_of) if account_type == "asset"
+    )
+    calculated = calculate_burn_rate([month["burn"] for month in monthly_burns], ending_balance / 100)
+    return {
+        "endingBalance": ending_balance / 100,
+        "monthlyBurns": monthly_burns,
+        "averageMonthlyBurn": calculated["average_monthly_burn"],
+        "runwayMonths": calculated["runway_months"],
+    }
+
+
+def rebuild_profit_loss_by_period(scan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Revenue, expenses and net income per scanned period (UTC months unless scan_ledger got other periods)"""
+    return [
+        {
+            "period": period,
+            "revenue": revenue / 100,
+            "expenses": expenses / 100,
+            "netIncome": (revenue - expenses) / 100,
+        }
+        for period, (revenue, expenses) in sorted(_ledger_month_totals(scan).items(), key=lambda item: str(item[0]))
+    ]
+
+
+# (label, path) pairs compared between the rebuilt and the reported report
+LEDGER_COMPARED_FIELDS = {
+    "trial_balance": [
+        ("debits", ("totals", "debits")),
+        ("credits", ("totals", "credits")),
+        ("is_balanced", ("isBalanced",)),
+    ],
+    "balance_sheet": [
+        ("total_assets", ("assets", "total")),
+        ("total_liabilities", ("liabilities", "total")),
+        ("total_equity", ("equity", "total")),
+        ("retained_earnings", ("equity", "retainedEarnings")),
+        ("total_liabilities_and_equity", ("totalLiabilitiesAndEquity",)),
+    ],
+    "pnl": [
+        ("revenue", ("revenue", "total")),
+        ("expenses", ("expenses", "total")),
+        ("net_income", ("netIncome",)),
+    ],
+    "burn_rate": [
+        ("ending_balance", ("endingBalance",)),
+        ("average_monthly_burn", ("averageMonthlyBurn",)),
+    ],
+}
+
+
+def _field(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        data = (data or {}).get(key)
+    return data
+
+
+def _compare_rebuilt(report_type: str, rebuilt: Dict[str, Any], reported: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare a rebuilt report with the reported one, field by field"""
+    calculated = {}
+    reported_values = {}
+    discrepancies = {}
+    for label, path in LEDGER_COMPARED_FIELDS[report_type]:
+        calc_value = _field(rebuilt, path)
+        reported_value = _field(reported, path)
+        calculated[label] = calc_value
+        reported_values[label] = reported_value
+        if isinstance(calc_value, bool) or reported_value is None:
+            matches = calc_value == reported_value
+            discrepancies[label] = 0 if matches else True
+        else:
+            matches = abs(calc_value - reported_value) < 0.01
+            discrepancies[label] = 0 if matches else abs(calc_value - reported_value)
+
+    if report_type == "burn_rate":
+        # Monthly P&L: burn always, revenue and expenses when the report carries them
+        rebuilt_months = {month["month"]: month for month in rebuilt["monthlyBurns"]}
+        for month in reported.get("monthlyBurns", []):
+            rebuilt_month = rebuilt_months.get(month.get("month"), {})
+            for field in ("burn", "revenue", "expenses"):
+                if field != "burn" and field not in month:
+                    continue
+                delta = abs(rebuilt_month.get(field, 0) - month.get(field, 0))
+                if delta >= 0.01:
+                    discrepancies[f"{field}[{month.get('month')}]"] = delta
+
+    return {
+        "valid": not any(discrepancies.values()),
+        "calculated": calculated,
+        "reported": reported_values,
+        "discrepancies": discrepancies,
+    }
+
+
+def _compare_ledger_reports(scan: Dict[str, Any], reports: Dict[str, Dict[str, Any]], as_of: float) -> Dict[str, Any]:
+    """Rebuild each reported report from scan aggregates and compare"""
+    results = {}
+    for report_type, data in reports.items():
+        if report_type == "trial_balance":
+            rebuilt = rebuild_trial_balance(scan, data.get("asOfDate") or as_of)
+        elif report_type == "balance_sheet":
+            rebuilt = rebuild_balance_sheet(scan, data.get("asOfDate") or as_of)
+        elif report_type == "pnl":
+            date_range = data.get("dateRange") or {}
+            start = date_range.get("start")
+            rebuilt = rebuild_profit_loss(scan, start - 1 if start is not None else None, date_range.get("end") or as_of)
+        else:
+            months = [month.get("month") for month in data.get("monthlyBurns", [])]
+            rebuilt = rebuild_burn_rate(scan, as_of, months)
+        results[report_type] = _compare_rebuilt(report_type, rebuilt, data)
+
+    return {
+        "valid": all(result["valid"] for result in results.values()),
+        "lines_scanned": scan["lines"],
+        "unknown_accounts": sorted(set(scan["segments"]) - set(scan["account_types"]), key=str),
+        "reports": results,
+    }
+
+
+def validate_against_ledger(
+    ledger: Dict[str, Any],
+    reports: Dict[str, Dict[str, Any]],
+    periods: Optional[PeriodIndex] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild reports from a raw ledger export and compare them with reported JSON.
+
+    Args:
+        ledger: Export with accounts, entries_final and entry_lines (optionally asOfDate)
+        reports: Reported JSON keyed by report type (pnl, balance_sheet, trial_balance, burn_rate)
+        periods: Calendar PeriodIndex to also rebuild P&L per period by ("by_period");
+                 burn_rate months are then bucketed in its timezone
+
+    Returns:
+        Per-report comparisons plus scan statistics; all reports share one pass over entry_lines
+    """
+    reports = {LEDGER_REPORT_TYPES[report_type]: data for report_type, data in reports.items()}
+    if periods is not None and periods.kind != "month" and "burn_rate" in reports:
+        raise ValueError("burn_rate is validated by month; use month periods")
+    as_of = ledger.get("asOfDate") or datetime.now().timestamp() * 1000
+    with _phase("scan"):
+        scan = scan_ledger(
+            ledger.get("accounts", []),
+            ledger.get("entry_lines", []),
+            ledger.get("entries_final", []),
+            cutoffs=_ledger_cutoffs(reports, as_of),
+            periods=periods,
+        )
+    with _phase("compare"):
+        result = _compare_ledger_reports(scan, reports, as_of)
+    if periods is not None:
+        result["by_period"] = rebuild_profit_loss_by_period(scan)
+    return result
+
+
+CHECKPOINT_SCHEMA_VERSION = "3"
+# A file modified this close to when its checkpoint was verified may be rewritten again within the
+# same mtime tick (2 s on FAT, 1 s on HFS+), so its stat cannot prove it unchanged and it is hashed
+CHECKPOINT_RACY_NS = 2_000_000_000
+# Marks a SQLite file as one of these checkpoint stores, so nothing else is ever rebuilt over
+CHECKPOINT_FORMAT = "report-validation-checkpoint"
+_CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS slices (
+    org_id TEXT NOT NULL,
+    slice TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    entry_ids TEXT NOT NULL,
+    entries_digest TEXT NOT NULL,
+    entries_stat TEXT NOT NULL,
+    checked_ns INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    min_date REAL,
+    max_date REAL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (org_id, slice)
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    org_id TEXT NOT NULL,
+    slice TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    cents INTEGER NOT NULL,
+    PRIMARY KEY (org_id, slice, account_id, month)
+);
+"""
+
+
+def _aggregates_digest(account_months: Dict[str, Dict[str, int]]) -> str:
+    """Order-independent digest of per-account monthly cents, used to detect corrupt checkpoints"""
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    for account_id in sorted(account_months, key=str):
+        for month, cents in sorted(account_months[account_id].items()):
+            digest.update(f"{account_id}\x1f{month}\x1f{cents}\x1e".encode())
+    return digest.hexdigest()
+
+
+def _entries_digest(entry_ids: Iterable[Any], entry_dates: Dict[Any, float]) -> str:
+    """Digest of the entries_final dates a slice's undated lines were placed by"""
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    for entry_id in sorted(entry_ids, key=str):
+        digest.update(f"{entry_id}\x1f{entry_dates.get(entry_id, 0)!r}\x1e".encode())
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    """Content hash of a ledger slice file"""
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    """(size, mtime_ns): the cheap key checked before a file is hashed"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class CheckpointStore:
+    """
+    SQLite store of per-org, per-slice, per-account monthly ledger aggregates.
+
+    A slice is keyed by its file's size and mtime, falling back to its content
+    hash when those change, plus a digest of the entries_final dates its
+    undated lines used. A store that fails its schema or integrity check is
+    rebuilt; a file that is not a checkpoint store is never touched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = self._open()
+
+    def _create(self):
+        import sqlite3
+
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_CHECKPOINT_SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            (("format", CHECKPOINT_FORMAT), ("schema_version", CHECKPOINT_SCHEMA_VERSION)),
+        )
+        conn.commit()
+        return conn
+
+    def _open(self):
+        import sqlite3
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return self._create()
+        conn = sqlite3.connect(self.path)
+        try:
+            tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            meta = dict(conn.execute("SELECT key, value FROM meta")) if "meta" in tables else {}
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise ValueError(f"{self.path} is not a readable checkpoint store; refusing to overwrite it")
+        # Stores written before the format marker are recognized by their tables
+        if meta.get("format") != CHECKPOINT_FORMAT and not (
+            "schema_version" in meta and {"slices", "aggregates"} <= tables
+        ):
+            conn.close()
+            raise ValueError(f"{self.path} is not a checkpoint store; refusing to overwrite it")
+        try:
+            healthy = (
+                meta.get("schema_version") == CHECKPOINT_SCHEMA_VERSION
+                and conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+            )
+        except sqlite3.DatabaseError:
+            healthy = False
+        if healthy:
+            return conn
+        print(f"Warning: Checkpoint store {self.path} is corrupt or outdated. Rebuilding.", file=sys.stderr)
+        conn.close()
+        os.remove(self.path)
+        return self._create()
+
+    def load(self, org_id: str, slice_name: str) -> Optional[Dict[str, Any]]:
+        """A slice's fingerprint and cached aggregates, or None when missing or corrupt"""
+        row = self.conn.execute(
+            "SELECT content_hash, size, mtime_ns, entry_ids, entries_digest, entries_stat, checked_ns, lines, "
+            "min_date, max_date, digest FROM slices WHERE org_id = ? AND slice = ?",
+            (org_id, slice_name),
+        ).fetchone()
+        if row is None:
+            return None
+        account_months: Dict[str, Dict[str, int]] = {}
+        for account_id, month, cents in self.conn.execute(
+            "SELECT account_id, month, cents FROM aggregates WHERE org_id = ? AND slice = ?",
+            (org_id, slice_name),
+        ):
+            account_months.setdefault(account_id, {})[month] = cents
+        if _aggregates_digest(account_months) != row[10]:
+            print(f"Warning: Checkpoint for {org_id}/{slice_name} is corrupt. Rescanning.", file=sys.stderr)
+            return None
+        return {
+            "content_hash": row[0],
+            "stat": (row[1], row[2]),
+            "entry_ids": json.loads(row[3]),
+            "entries_digest": row[4],
+            "entries_stat": row[5],
+            "checked_ns": row[6],
+            "lines": row[7],
+            "min_date": row[8],
+            "max_date": row[9],
+            "account_months": account_months,
+        }
+
+    def save(self, org_id: str, slice_name: str, fingerprint: Dict[str, Any], scan: Dict[str, Any]) -> None:
+        """Replace a slice's checkpoint with fresh aggregates"""
+        size, mtime_ns = fingerprint["stat"]
+        with self.conn:
+            self.conn.execute("DELETE FROM aggregates WHERE org_id = ? AND slice = ?", (org_id, slice_name))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO slices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (org_id, slice_name, fingerprint["content_hash"], size, mtime_ns,
+                 json.dumps(fingerprint["entry_ids"]), fingerprint["entries_digest"], fingerprint["entries_stat"],
+                 time.time_ns(), scan["lines"], scan["min_date"], scan["max_date"], _aggregates_digest(scan["account_months"])),
+            )
+            self.conn.executemany(
+                "INSERT INTO aggregates VALUES (?, ?, ?, ?, ?)",
+                (
+                    (org_id, slice_name, account_id, month, cents)
+                    for account_id, monthly in scan["account_months"].items()
+                    for month, cents in monthly.items()
+                ),
+            )
+
+    def touch(self, org_id: str, slice_name: str, stat: Tuple[int, int], entries_stat: str) -> None:
+        """Record new stat keys for a slice whose content and entry dates were verified unchanged"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE slices SET size = ?, mtime_ns = ?, entries_stat = ?, checked_ns = ? "
+                "WHERE org_id = ? AND slice = ?",
+                (stat[0], stat[1], entries_stat, time.time_ns(), org_id, slice_name),
+            )
+
+    def prune(self, org_id: str, keep: Iterable[str]) -> None:
+        """Drop checkpoints for slices that no longer exist"""
+        keep = set(keep)
+        stale = [
+            (org_id, name) for (name,) in self.conn.execute("SELECT slice FROM slices WHERE org_id = ?", (org_id,))
+            if name not in keep
+        ]
+        with self.conn:
+            self.conn.executemany("DELETE FROM slices WHERE org_id = ? AND slice = ?", stale)
+            self.conn.executemany("DELETE FROM aggregates WHERE org_id = ? AND slice = ?", stale)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield one object per non-empty line"""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class _EntryDates(dict):
+    """entryId -> date map of a ledger directory's entries_final files, parsed on the first lookup"""
+
+    def __init__(self, paths: List[str]):
+        super().__init__()
+        self.paths = paths
+        self.loaded = False
+
+    def get(self, entry_id, default=None):
+        if not self.loaded:
+            self.loaded = True
+            for path in self.paths:
+                self.update((entry["_id"], entry.get("date", 0)) for entry in _iter_ndjson(path))
+        return super().get(entry_id, default)
+
+
+def _merge_cached_slice(scan: Dict[str, Any], cached: Dict[str, Any]) -> None:
+    """Fold a cached slice into scan; its lines all sit in one cutoff segment"""
+    segment = bisect_left(scan["cutoffs"], cached["max_date"]) if cached["max_date"] is not None else 0
+    segment_count = len(scan["cutoffs"]) + 1
+    for account_id, monthly in cached["account_months"].items():
+        account_segments = scan["segments"].setdefault(account_id, [0] * segment_count)
+        account_segments[segment] += sum(monthly.values())
+        merged = scan["account_months"].setdefault(account_id, {})
+        for month, cents in monthly.items():
+            merged[month] = merged.get(month, 0) + cents
+    scan["lines"] += cached["lines"]
+
+
+def _merge_scanned_slice(scan: Dict[str, Any], part: Dict[str, Any]) -> None:
+    """Fold a freshly scanned slice into scan"""
+    for account_id, part_segments in part["segments"].items():
+        account_segments = scan["segments"].get(account_id)
+        if account_segments is None:
+            scan["segments"][account_id] = list(part_segments)
+        else:
+            for i, cents in enumerate(part_segments):
+                account_segments[i] += cents
+    for account_id, monthly in part["account_months"].items():
+        merged = scan["account_months"].setdefault(account_id, {})
+        for month, cents in monthly.items():
+            merged[month] = merged.get(month, 0) + cents
+    scan["lines"] += part["lines"]
+
+
+def _load_ledger_dir_meta(ledger_dir: str) -> Dict[str, Any]:
+    """accounts.json metadata of a sliced ledger directory"""
+    with open(os.path.join(ledger_dir, "accounts.json"), 'r') as f:
+        meta = json.load(f)
+    if isinstance(meta, list):
+        meta = {"accounts": meta}
+    return meta
+
+
+def _ledger_slice_paths(ledger_dir: str, table: str = "entry_lines") -> List[str]:
+    return sorted(
+        glob.glob(os.path.join(ledger_dir, table, "*.ndjson"))
+        + glob.glob(os.path.join(ledger_dir, table, "*.jsonl"))
+    )
+
+
+def _ledger_entries_paths(ledger_dir: str) -> List[str]:
+    """entries_final.ndjson and/or entries_final/*.ndjson slices (as generate-mock-data.py --ledger writes)"""
+    single = os.path.join(ledger_dir, "entries_final.ndjson")
+    return ([single] if os.path.exists(single) else []) + _ledger_slice_paths(ledger_dir, "entries_final")
+
+
+def _cached_slice_current(
+    cached: Dict[str, Any],
+    fingerprint: Dict[str, Any],
+    path: str,
+    entry_dates: Dict[Any, float]
+) -> bool:
+    """
+    Whether a checkpointed slice still matches its file and entries_final dates.
+
+    The file is only hashed when its size or mtime moved, or when its mtime
+    is within CHECKPOINT_RACY_NS of the last check and a same-size rewrite
+    could have kept it. entries_final is only parsed under the same rules,
+    and only when the slice has undated lines. Sets fingerprint["verified"]
+    when it had to look past the stat keys (and content_hash when it hashed).
+    """
+    racy_after = cached["checked_ns"] - CHECKPOINT_RACY_NS
+    if cached["stat"] != fingerprint["stat"] or fingerprint["stat"][1] >= racy_after:
+        fingerprint["verified"] = True
+        fingerprint["content_hash"] = _file_digest(path)
+        if fingerprint["content_hash"] != cached["content_hash"]:
+            return False
+    if cached["entry_ids"] and (
+        cached["entries_stat"] != fingerprint["entries_stat"] or fingerprint["entries_mtime_ns"] >= racy_after
+    ):
+        fingerprint["verified"] = True
+        return _entries_digest(cached["entry_ids"], entry_dates) == cached["entries_digest"]
+    return True
+
+
+def validate_ledger_dir(
+    ledger_dir: str,
+    reports: Dict[str, Dict[str, Any]],
+    store: Optional[CheckpointStore] = None,
+    org_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Validate reports against a ledger export split into slice files.
+
+    Layout: accounts.json (a list, or {"orgId", "asOfDate", "accounts"}),
+    optional entries_final.ndjson or entries_final/*.ndjson slices, and
+    entry_lines/*.ndjson slices (usually one per month). With a checkpoint store only new or changed slices are
+    parsed, and entries_final only when one of them has undated lines;
+    slices a report cutoff falls inside are rescanned.
+
+    Returns:
+        Same document as validate_against_ledger plus checkpoint statistics
+    """
+    meta = _load_ledger_dir_meta(ledger_dir)
+    org_id = org_id or meta.get("orgId") or os.path.basename(os.path.normpath(ledger_dir))
+    as_of = meta.get("asOfDate") or datetime.now().timestamp() * 1000
+    reports = {LEDGER_REPORT_TYPES[report_type]: data for report_type, data in reports.items()}
+    cutoffs = _ledger_cutoffs(reports, as_of)
+
+    entries_paths = _ledger_entries_paths(ledger_dir)
+    # Only needed for lines exported before dates were denormalized onto entry_lines
+    entry_dates = _EntryDates(entries_paths)
+    entries_stats = [_file_stat(path) for path in entries_paths]
+    entries_stat = ",".join(
+        "{}:{}:{}".format(os.path.relpath(path, ledger_dir), *stat) for path, stat in zip(entries_paths, entries_stats)
+    )
+    entries_mtime_ns = max((stat[1] for stat in entries_stats), default=0)
+
+    scan = scan_ledger(meta.get("accounts", []), (), cutoffs=cutoffs)
+    slice_paths = _ledger_slice_paths(ledger_dir)
+    reused = 0
+    with _phase("scan"):
+        for path in slice_paths:
+            slice_name = os.path.basename(path)
+            fingerprint = {
+                "stat": _file_stat(path),
+                "content_hash": None,
+                "entries_stat": entries_stat,
+                "entries_mtime_ns": entries_mtime_ns,
+            }
+            cached = store.load(org_id, slice_name) if store else None
+            if cached is not None:
+                if _cached_slice_current(cached, fingerprint, path, entry_dates):
+                    if fingerprint.get("verified"):
+                        store.touch(org_id, slice_name, fingerprint["stat"], entries_stat)
+                else:
+                    cached = None
+            if cached is not None and (
+                cached["min_date"] is None
+                or bisect_left(cutoffs, cached["min_date"]) == bisect_left(cutoffs, cached["max_date"])
+            ):
+                _merge_cached_slice(scan, cached)
+                reused += 1
+                continue
+            part = scan_ledger((), _iter_ndjson(path), entry_dates, cutoffs=cutoffs)
+            if store and cached is None:
+                entry_ids = sorted(part["undated_entries"], key=str)
+                fingerprint["content_hash"] = fingerprint["content_hash"] or _file_digest(path)
+                fingerprint["entry_ids"] = entry_ids
+                fingerprint["entries_digest"] = _entries_digest(entry_ids, entry_dates) if entry_ids else ""
+                store.save(org_id, slice_name, fingerprint, part)
+            _merge_scanned_slice(scan, part)
+
+        if store:
+            store.prune(org_id, (os.path.basename(path) for path in slice_paths))
+
+    with _phase("compare"):
+        result = _compare_ledger_reports(scan, reports, as_of)
+    result["checkpoint"] = {
+        "org_id": org_id,
+        "slices": len(slice_paths),
+        "reused": reused,
+        "rescanned": len(slice_paths) - reused,
+    }
+    return result
+
+LOCALIZABLE_REPORT_TYPES = ("trial_balance", "balance_sheet")
+# Partition key for income and expense lines, which balance sheets report as retained earnings
+RETAINED_EARNINGS_KEY = "(retained earnings)"
+DEFAULT_MAX_CULPRITS = 50
+_HASH_MASK = (1 << 64) - 1
+
+
+class _LedgerSlices:
+    """Re-iterable entry lines across sliced NDJSON files"""
+
+    def __init__(self, paths: List[str]):
+        self.paths = paths
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in self.paths:
+            yield from _iter_ndjson(path)
+
+
+def load_ledger_dir(ledger_dir: str) -> Dict[str, Any]:
+    """Present a sliced ledger directory as a ledger export whose entry_lines are read lazily"""
+    ledger = dict(_load_ledger_dir_meta(ledger_dir))
+    ledger["entries_final"] = {
+        entry["_id"]: entry.get("date", 0) for entry in _LedgerSlices(_ledger_entries_paths(ledger_dir))
+    }
+    ledger["entry_lines"] = _LedgerSlices(_ledger_slice_paths(ledger_dir))
+    return ledger
+
+
+def _partition_digests(rows: Iterable[Tuple[Any, Optional[str], Optional[str], int]], key_of) -> Dict[Any, List[int]]:
+    """
+    Digest rows per partition: [cents, rows, dated rows, keyed rows, multiset hash].
+
+    The hash is a sum of per-row hashes, so it ignores row order and a parent's
+    digest is the sum of its children's, like the nodes of a Merkle tree.
+    """
+    digests: Dict[Any, List[int]] = {}
+    for row in rows:
+        key = key_of(row)
+        digest = digests.get(key)
+        if digest is None:
+            digest = digests[key] = [0, 0, 0, 0, 0]
+        _, month, entry, cents = row
+        digest[0] += cents
+        digest[1] += 1
+        if month is not None:
+            digest[2] += 1
+        if entry is not None:
+            digest[3] += 1
+        digest[4] = (digest[4] + hash((month, entry, cents))) & _HASH_MASK
+    return digests
+
+
+_EMPTY_DIGEST = (0, 0, 0, 0, 0)
+
+
+def _digests_differ(expected: Sequence[int], reported: Sequence[int]) -> bool:
+    """Totals differ, or both sides list the same kind of rows and their hashes differ"""
+    if expected[0] != reported[0]:
+        return True
+    detailed = expected[1] == expected[3] and reported[1] == reported[3]
+    return detailed and expected[4] != reported[4]
+
+
+def _detailed(expected: Sequence[int], reported: Sequence[int], field: int) -> bool:
+    """Whether every row on both sides carries the next level's key (2 = month, 3 = entry)"""
+    return expected[1] == expected[field] and reported[1] == reported[field]
+
+
+def _culprit(level: str, key: Tuple[Any, ...], expected: int, reported: int) -> Dict[str, Any]:
+    culprit = {"level": level, "account": key[0]}
+    if len(key) > 1:
+        culprit["month"] = key[1]
+    if len(key) > 2:
+        culprit["entry"] = key[2]
+    culprit.update(expected=expected / 100, reported=reported / 100, delta=(reported - expected) / 100)
+    return culprit
+
+
+def localize_discrepancies(
+    expected_rows,
+    reported_rows,
+    max_culprits: int = DEFAULT_MAX_CULPRITS,
+    magnitude_accounts: Iterable[Any] = ()
+) -> Dict[str, Any]:
+    """
+    Pinpoint where two row sets disagree by descending account -> month -> entry.
+
+    Each level is one streaming pass that only digests rows inside partitions
+    that disagreed at the level above, so memory and hashing follow the
+    disagreeing partitions rather than the ledger size. A partition is a leaf
+    culprit when the data below it lacks months or entry ids on either side.
+
+    Args:
+        expected_rows: Callable taking an optional set of accounts (None for all)
+                       and returning an iterable of (account, month, entry,
+                       debit-positive cents) rows rebuilt from the ledger
+        reported_rows: Same for the report's rows
+        max_culprits: Maximum culprits (and candidate lines per culprit) returned
+        magnitude_accounts: Accounts reported as absolute values (balance sheet
+                            liabilities); their reported sign follows the ledger
+
+    Returns:
+        Disagreeing accounts and culprits ranked by absolute delta
+    """
+    def account_of(row):
+        return row[0]
+
+    def month_of(row):
+        return row[0], row[1]
+
+    expected_accounts = _partition_digests(expected_rows(None), account_of)
+    reported_accounts = _partition_digests(reported_rows(None), account_of)
+    for account in magnitude_accounts:
+        reported = reported_accounts.get(account)
+        if reported is not None:
+            reported[0] = -abs(reported[0]) if expected_accounts.get(account, _EMPTY_DIGEST)[0] < 0 else abs(reported[0])
+    accounts = []
+    for account in set(expected_accounts) | set(reported_accounts):
+        expected = expected_accounts.get(account, _EMPTY_DIGEST)
+        reported = reported_accounts.get(account, _EMPTY_DIGEST)
+        if _digests_differ(expected, reported):
+            accounts.append((account, expected, reported))
+
+    culprits = []
+    by_month = [account for account, expected, reported in accounts if _detailed(expected, reported, 2)]
+    leaf_accounts = {
+        account: reported[0] - expected[0]
+        for account, expected, reported in accounts
+        if not _detailed(expected, reported, 2) and reported[0] != expected[0]
+    }
+
+    months = []
+    if by_month:
+        selected = set(by_month)
+        expected_months = _partition_digests(expected_rows(selected), month_of)
+        reported_months = _partition_digests(reported_rows(selected), month_of)
+        for key in set(expected_months) | set(reported_months):
+            expected = expected_months.get(key, _EMPTY_DIGEST)
+            reported = reported_months.get(key, _EMPTY_DIGEST)
+            if not _digests_differ(expected, reported):
+                continue
+            if _detailed(expected, reported, 3):
+                months.append(key)
+            elif expected[0] != reported[0]:
+                culprits.append(_culprit("month", key, expected[0], reported[0]))
+
+    if months:
+        selected = set(months)
+        selected_accounts = {account for account, _ in months}
+        entry_totals: Dict[Tuple[Any, ...], List[int]] = {}
+        for side, rows in ((0, expected_rows(selected_accounts)), (1, reported_rows(selected_accounts))):
+            for account, month, entry, cents in rows:
+                if (account, month) in selected:
+                    totals = entry_totals.setdefault((account, month, entry), [0, 0])
+                    totals[side] += cents
+        for key, (expected, reported) in entry_totals.items():
+            if expected != reported:
+                culprits.append(_culprit("entry", key, expected, reported))
+
+    # Accounts reported without month detail: list ledger lines that alone explain the delta
+    candidates: Dict[Any, List[Dict[str, Any]]] = {account: [] for account in leaf_accounts}
+    if leaf_accounts:
+        for account, month, entry, cents in expected_rows(set(leaf_accounts)):
+            delta = leaf_accounts.get(account)
+            if delta is not None and abs(cents) == abs(delta) and len(candidates[account]) < max_culprits:
+                candidates[account].append({
+                    "month": month,
+                    "entry": entry,
+                    "amount": cents / 100,
+                    # Positive delta: the report has this line once more than the ledger
+                    "explains": "extra_in_report" if cents == delta else "missing_from_report",
+                })
+    for account, expected, reported in accounts:
+        if account in leaf_accounts:
+            culprit = _culprit("account", (account,), expected[0], reported[0])
+            culprit["candidates"] = candidates[account]
+            culprits.append(culprit)
+
+    culprits.sort(key=lambda culprit: (-abs(culprit["delta"]), str(culprit["account"])))
+    mismatched = sorted(
+        ({
+            "account": account,
+            "expected": expected[0] / 100,
+            "reported": reported[0] / 100,
+            "delta": (reported[0] - expected[0]) / 100,
+        } for account, expected, reported in accounts),
+        key=lambda item: (-abs(item["delta"]), str(item["account"])),
+    )
+    return {
+        "valid": not culprits,
+        "accounts_compared": len(set(expected_accounts) | set(reported_accounts)),
+        "mismatched_accounts": mismatched,
+        "culprits": culprits[:max_culprits],
+        "total_culprits": len(culprits),
+    }
+
+
+def _report_key_field(rows: Iterable[Dict[str, Any]]) -> str:
+    """Field identifying accounts in report rows: accountId when present, else the account name"""
+    for row in rows:
+        for field in ("accountId", "account", "name"):
+            if field in row:
+                return field
+        break
+    return "accountId"
+
+
+def _ledger_rows(ledger: Dict[str, Any], as_of: float, key_of):
+    """Row factory over ledger lines dated <= as_of; key_of maps (account, type) to a partition or None"""
+    keys = {account["_id"]: key_of(account) for account in ledger.get("accounts", [])}
+
+    def rows(selected=None):
+        entries = ledger.get("entries_final") or {}
+        entry_dates = None
+        for line in ledger.get("entry_lines", []):
+            date = line.get("date")
+            if date is None:
+                if entry_dates is None:
+                    entry_dates = entries if isinstance(entries, dict) else {
+                        entry["_id"]: entry.get("date", 0) for entry in entries
+                    }
+                date = entry_dates.get(line.get("entryId"), 0)
+            if date > as_of:
+                continue
+            account_id = line.get("accountId")
+            key = keys.get(account_id)
+            # Lines posted to accounts missing from the export are ignored, as in the reports
+            if key is None or (selected is not None and key not in selected):
+                continue
+            amount = to_cents(line.get("amount", 0))
+            yield key, _day_month_key(int(date // DAY_MS)), line.get("entryId"), amount if line.get("side") == "debit" else -amount
+    return rows
+
+
+@lru_cache(maxsize=1 << 12)
+def _day_month_key(day: int) -> str:
+    """UTC "YYYY-MM" for a day number since the epoch"""
+    return _month_key(day * DAY_MS)
+
+
+def _report_row_detail(row: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """(month, entry id) for report rows that carry line detail"""
+    date = row.get("date")
+    return (_day_month_key(int(date // DAY_MS)) if date is not None else None), row.get("entryId")
+
+
+def localize_report(
+    ledger: Dict[str, Any],
+    report_type: str,
+    data: Dict[str, Any],
+    max_culprits: int = DEFAULT_MAX_CULPRITS
+) -> Dict[str, Any]:
+    """
+    Localize a trial balance or balance sheet mismatch against a raw ledger.
+
+    Per-account report rows are compared with ledger balances keyed the same
+    way (accountId, or account name). Report rows that carry date and entryId
+    allow descending to months and entries; otherwise mismatched accounts list
+    the ledger lines whose amount alone explains the delta.
+    """
+    report_type = LEDGER_REPORT_TYPES.get(report_type, report_type)
+    as_of = data.get("asOfDate") or ledger.get("asOfDate") or datetime.now().timestamp() * 1000
+    magnitude_accounts = set()
+
+    if report_type == "trial_balance":
+        key_field = _report_key_field(data.get("entries", []))
+
+        def key_of(account):
+            if account.get("type") is None:
+                return None
+            return account["_id"] if key_field == "accountId" else account.get("name", account["_id"])
+
+        def reported_rows(selected=None):
+            for entry in data.get("entries", []):
+                key = entry.get(key_field)
+                if selected is None or key in selected:
+                    month, entry_id = _report_row_detail(entry)
+                    yield key, month, entry_id, to_cents(entry.get("debit", 0)) - to_cents(entry.get("credit", 0))
+    elif report_type == "balance_sheet":
+        sections = (("assets", 1), ("liabilities", -1), ("equity", -1))
+        key_field = "accountId"
+        for section, _ in sections:
+            items = (data.get(section) or {}).get("items", [])
+            if items:
+                key_field = _report_key_field(items)
+                break
+
+        def key_of(account):
+            account_type = account.get("type")
+            if account_type in ("income", "expense"):
+                return RETAINED_EARNINGS_KEY
+            if account_type not in ("asset", "liability", "equity"):
+                return None
+            return account["_id"] if key_field == "accountId" else account.get("name", account["_id"])
+
+        magnitude_accounts = {item.get(key_field) for item in (data.get("liabilities") or {}).get("items", [])}
+
+        def reported_rows(selected=None):
+            for section, sign in sections:
+                for item in (data.get(section) or {}).get("items", []):
+                    key = item.get(key_field)
+                    if selected is None or key in selected:
+                        month, entry_id = _report_row_detail(item)
+                        yield key, month, entry_id, sign * to_cents(item.get("balance", 0))
+            retained_earnings = (data.get("equity") or {}).get("retainedEarnings")
+            if retained_earnings is not None and (selected is None or RETAINED_EARNINGS_KEY in selected):
+                # Retained earnings are credit-normal: income - expenses
+                yield RETAINED_EARNINGS_KEY, None, None, -to_cents(retained_earnings)
+    else:
+        raise ValueError(f"Report type '{report_type}' cannot be localized; use one of {', '.join(LOCALIZABLE_REPORT_TYPES)}")
+
+    result = localize_discrepancies(
+        _ledger_rows(ledger, as_of, key_of),
+        reported_rows,
+        max_culprits=max_culprits,
+        magnitude_accounts=magnitude_accounts,
+    )
+    result["as_of"] = as_of
+    result["key_field"] = key_field
+    return result
+
+
+def _bundle_report_types(bundle: Dict[str, Any]) -> List[str]:
+    """Keys of a bundle that name a validator, in bundle order"""
+    return [key for key in bundle if key in validators]
+
+
+def _first_report(reports: Dict[str, Dict[str, Any]], *report_types: str) -> Optional[Dict[str, Any]]:
+    for report_type in report_types:
+        if report_type in reports:
+            return reports[report_type]
+    return None
+
+
+def _cross_check(left: Optional[float], right: Optional[float], tolerance: float = 0.01, **values) -> Dict[str, Any]:
+    """Equality check between two figures drawn from different reports"""
+    if left is None or right is None:
+        return {"skipped": "required reports or fields missing from bundle"}
+    difference = abs(left - right)
+    return {"valid": difference < tolerance, "difference": difference, **values}
+
+
+# Calculated figures validators accept precomputed, so a bundle computes each once for them and the cross-checks
+_SHARED_FIGURES = {
+    "pnl": _profit_loss_figures,
+    "profit_loss": _profit_loss_figures,
+    "balance_sheet": _balance_sheet_figures,
+    "trial_balance": lambda data: calculate_trial_balance(data.get("entries", [])),
+}
+
+
+def bundle_intermediates(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Figures a bundle's validators and cross-report checks share, each computed once.
+
+    Returns:
+        "calculated" (per report type, for the validators) plus net_income,
+        retained earnings (closing and opening), total assets, balance flags,
+        the burn report's ending balance and the as-of dates they are taken at
+    """
+    calculated = {
+        report_type: _SHARED_FIGURES[report_type](bundle[report_type])
+        for report_type in _bundle_report_types(bundle)
+        if report_type in _SHARED_FIGURES
+    }
+    pnl = _first_report(calculated, "pnl", "profit_loss")
+    balance_sheet = calculated.get("balance_sheet")
+    trial_balance = calculated.get("trial_balance")
+    burn_rate = bundle.get("burn_rate")
+
+    opening = bundle.get("openingRetainedEarnings")
+    if opening is None:
+        opening = _field(bundle, ("balance_sheet_prior", "equity", "retainedEarnings"))
+    return {
+        "calculated": calculated,
+        "net_income": pnl["net_income"] if pnl else None,
+        "retained_earnings": _field(bundle, ("balance_sheet", "equity", "retainedEarnings")),
+        "opening_retained_earnings": opening,
+        "total_assets": balance_sheet["total_assets"] if balance_sheet else None,
+        "balance_sheet_balanced": balance_sheet["is_balanced"] if balance_sheet else None,
+        "trial_balance_balanced": trial_balance["is_balanced"] if trial_balance else None,
+        "ending_balance": burn_rate.get("endingBalance") if burn_rate else None,
+        "balance_sheet_as_of": _field(bundle, ("balance_sheet", "asOfDate")),
+        "burn_rate_as_of": burn_rate.get("asOfDate") if burn_rate else None,
+    }
+
+
+def cross_check_reports(shared: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Consistency checks across reports of one bundle, from bundle_intermediates.
+
+    Net income is compared with the change in retained earnings when the
+    bundle carries openingRetainedEarnings or a balance_sheet_prior. The burn
+    report's ending balance is only compared with total assets when both
+    reports state the same asOfDate.
+    """
+    checks = {}
+
+    net_income = shared["net_income"]
+    retained_earnings = shared["retained_earnings"]
+    opening = shared["opening_retained_earnings"]
+    change = retained_earnings - opening if retained_earnings is not None and opening is not None else None
+    checks["net_income_vs_retained_earnings_change"] = _cross_check(
+        net_income, change, net_income=net_income, retained_earnings_change=change
+    )
+
+    tb_balanced = shared["trial_balance_balanced"]
+    bs_balanced = shared["balance_sheet_balanced"]
+    if tb_balanced is not None and bs_balanced is not None:
+        checks["trial_balance_vs_balance_sheet_balanced"] = {
+            "valid": tb_balanced == bs_balanced,
+            "trial_balance": tb_balanced,
+            "balance_sheet": bs_balanced,
+        }
+    else:
+        checks["trial_balance_vs_balance_sheet_balanced"] = {"skipped": "required reports or fields missing from bundle"}
+
+    ending_balance = shared["ending_balance"]
+    total_assets = shared["total_assets"]
+    as_of = shared["balance_sheet_as_of"]
+    if ending_balance is not None and total_assets is not None and (
+        as_of is None or shared["burn_rate_as_of"] != as_of
+    ):
+        # Burn reports are taken at run time; a balance at another date is no check at all
+        checks["burn_ending_balance_vs_total_assets"] = {
+            "skipped": "burn_rate and balance_sheet asOfDate missing or different"
+        }
+    else:
+        checks["burn_ending_balance_vs_total_assets"] = _cross_check(
+            ending_balance, total_assets, ending_balance=ending_balance, total_assets=total_assets
+        )
+    return checks
+
+
+def validate_bundle(
+    bundle: Dict[str, Any],
+    ledger: Optional[Dict[str, Any]] = None,
+    ledger_dir: Optional[str] = None,
+    store: Optional["CheckpointStore"] = None,
+    org_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Validate every report in a bundle parsed once.
+
+    Args:
+        bundle: Reports keyed by report type (pnl, balance_sheet, trial_balance,
+                burn_rate, ar, ...), optionally with openingRetainedEarnings or
+                balance_sheet_prior for the retained-earnings check
+        ledger: Optional raw ledger export; ledger-rebuildable reports are also
+                compared against it in one shared scan
+        ledger_dir: Optional sliced ledger directory, used instead of ledger
+                    (with store and org_id as in validate_ledger_dir)
+
+    Returns:
+        One document with per-report results and cross-report checks
+    """
+    with _phase("intermediates"):
+        shared = bundle_intermediates(bundle)
+    results = {}
+    for report_type in _bundle_report_types(bundle):
+        with _phase(f"validate:{report_type}"):
+            if report_type in shared["calculated"]:
+                results[report_type] = validators[report_type](
+                    bundle[report_type], calculated=shared["calculated"][report_type]
+                )
+            else:
+                results[report_type] = validators[report_type](bundle[report_type])
+    with _phase("cross_checks"):
+        checks = cross_check_reports(shared)
+    document = {
+        "valid": all(result["valid"] for result in results.values())
+        and all(check.get("valid", True) for check in checks.values()),
+        "reports": results,
+        "cross_checks": checks,
+    }
+    if ledger is not None or ledger_dir is not None:
+        rebuildable = {report_type: bundle[report_type] for report_type in results if report_type in LEDGER_REPORT_TYPES}
+        with _phase("ledger"):
+            if ledger_dir is not None:
+                document["ledger"] = validate_ledger_dir(ledger_dir, rebuildable, store=store, org_id=org_id)
+            else:
+                document["ledger"] = validate_against_ledger(ledger, rebuildable)
+        document["valid"] = document["valid"] and document["ledger"]["valid"]
+    return document
+
+
+def load_bundle(json_file: str, stream: bool = False) -> Dict[str, Any]:
+    """Load a report bundle; in streaming mode each report's large arrays stay on disk"""
+    if not stream:
+        return load_report(json_file)
+    report_types = list(validators) + ["balance_sheet_prior"]
+    streamed = [(report_type,) + path for report_type in report_types for path in STREAMED_ARRAYS]
+    return load_report_streaming(json_file, streamed=streamed)
+
+
+def _available_cores() -> int:
+    """Number of cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _infer_report_type(json_file: str) -> Optional[str]:
+    """Infer report type from a file name such as org123.trial_balance.json"""
+    stem = os.path.splitext(os.path.basename(json_file))[0].lower()
+    for report_type in sorted(validators, key=len, reverse=True):
+        if stem == report_type or any(stem.endswith(sep + report_type) for sep in "._-"):
+            return report_type
+    return None
+
+
+def collect_batch_jobs(source: str, default_type: Optional[str] = None) -> List[Tuple[Optional[str], str]]:
+    """
+    Collect (report_type, json_file) pairs for batch validation.
+
+    Args:
+        source: Directory of report files, glob pattern, or NDJSON manifest
+                with one {"report_type": ..., "file": ...} object per line
+        default_type: Report type for files whose name does not identify one
+
+    Returns:
+        List of (report_type, json_file) pairs; report_type is None when unknown
+    """
+    if os.path.isdir(source):
+        files = sorted(glob.glob(os.path.join(source, "*.json")))
+    elif os.path.isfile(source) and source.endswith((".ndjson", ".jsonl")):
+        base_dir = os.path.dirname(source)
+        jobs = []
+        with open(source, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                json_file = entry.get("file", "")
+                if not os.path.isabs(json_file):
+                    json_file = os.path.join(base_dir, json_file)
+                jobs.append((entry.get("report_type") or default_type, json_file))
+        return jobs
+    else:
+        files = sorted(glob.glob(source))
+    return [(_infer_report_type(path) or default_type, path) for path in files]
+
+
+def _validate_file(job: Tuple[Optional[str], str, bool, str]) -> Dict[str, Any]:
+    """Validate one report file; runs inside batch worker processes"""
+    report_type, json_file, stream, backend = job
+    if backend != _backend:
+        set_backend(backend)
+    outcome = {"report_type": report_type, "file": json_file}
+    if report_type is None:
+        outcome.update(valid=False, error="Cannot determine report type from file name")
+        return outcome
+    if report_type not in validators:
+        outcome.update(valid=False, error=f"Unknown report type '{report_type}'")
+        return outcome
+    try:
+        result = validators[report_type](load_report(json_file, stream=stream))
+    except FileNotFoundError:
+        outcome.update(valid=False, error=f"File {json_file} not found")
+    except json.JSONDecodeError as e:
+        outcome.update(valid=False, error=f"Invalid JSON in {json_file}: {e}")
+    except Exception as e:
+        outcome.update(valid=False, error=f"{type(e).__name__}: {e}")
+    else:
+        outcome.update(valid=bool(result["valid"]), result=result)
+    return outcome
+
+
+def run_batch(
+    jobs: List[Tuple[Optional[str], str]],
+    workers: Optional[int] = None,
+    stream: bool = False,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Validate many reports across a process pool.
+
+    Args:
+        jobs: (report_type, json_file) pairs from collect_batch_jobs
+        workers: Worker processes (default: available cores)
+        stream: Use streaming ingestion in each worker
+        backend: Aggregation backend for each worker (default: current backend)
+
+    Returns:
+        Aggregated summary with per-report results and overall validity
+    """
+    workers = max(1, min(workers or _available_cores(), len(jobs) or 1))
+    tasks = [(report_type, json_file, stream, backend or _backend) for report_type, json_file in jobs]
+
+    if workers == 1:
+        reports = [_validate_file(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(_validate_file, tasks, chunksize=chunksize))
+
+    errors = sum(1 for report in reports if "error" in report)
+    passed = sum(1 for report in reports if report["valid"])
+    return {
+        "valid": passed == len(reports),
+        "total": len(reports),
+        "passed": passed,
+        "failed": len(reports) - passed - errors,
+        "errors": errors,
+        "workers": workers,
+        "reports": reports,
+    }
+
+
+# Per-worker memory budget for multi-org validation; bigger orgs are split, bigger lines spilled
+DEFAULT_SHARD_BYTES = 64 << 20
+# Exports write orgId first; anchored to the line's opening brace, a match is always the top-level key
+_ORG_ID_PATTERN = re.compile(rb'\s*\{\s*"orgId"\s*:\s*"((?:[^"\\]|\\.)*)"')
+UNKNOWN_ORG = "unknown"
+
+
+def _export_line_refs(line: bytes) -> Tuple[str, Optional[str]]:
+    """
+    orgId and referenced report file of one export line.
+
+    Only top-level keys count; other values (the report data) are skipped
+    without being decoded, so nested orgId or file keys are never picked up.
+    """
+    match = _ORG_ID_PATTERN.match(line)
+    if match and b'"file"' not in line:
+        return json.loads(b'"' + match.group(1) + b'"'), None
+    found = {}
+    try:
+        reader = _JsonStreamReader(io.StringIO(line.decode("utf-8")))
+        if reader.peek() == "{":
+            for key in reader.iter_object():
+                if key in ("orgId", "file"):
+                    found[key] = reader.value()
+                else:
+                    reader.skip()
+    except ValueError:
+        # Malformed lines are indexed as they stand and reported by the worker that parses them
+        pass
+    org_id = found.get("orgId")
+    file_ref = found.get("file")
+    return str(org_id) if org_id is not None else UNKNOWN_ORG, file_ref if isinstance(file_ref, str) else None
+
+
+def index_org_export(export_path: str) -> Dict[str, List[Tuple[int, int, int, int]]]:
+    """
+    Index a multi-org NDJSON export by orgId without keeping any report in memory.
+
+    Each line is {"orgId", "report_type", "data"} or {"orgId", "report_type", "file"};
+    relative files resolve against the export's directory, like --batch manifests.
+
+    Returns:
+        orgId -> [(line_number, byte_offset, byte_length, cost)] in file order,
+        where cost adds the size of a referenced file to the line's length
+    """
+    index: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    base_dir = os.path.dirname(export_path)
+    offset = 0
+    with open(export_path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            length = len(line)
+            if line.strip():
+                org_id, file_ref = _export_line_refs(line)
+                cost = length
+                if file_ref is not None:
+                    try:
+                        cost += os.path.getsize(os.path.join(base_dir, file_ref))
+                    except OSError:
+                        # Missing files are reported when the line is validated
+                        pass
+                index.setdefault(org_id, []).append((line_number, offset, length, cost))
+            offset += length
+    return index
+
+
+def plan_org_shards(
+    index: Dict[str, List[Tuple[int, int, int, int]]],
+    max_shard_bytes: int = DEFAULT_SHARD_BYTES
+) -> List[Dict[str, Any]]:
+    """
+    Split indexed orgs into shards, largest first.
+
+    Orgs within max_shard_bytes become one shard; larger orgs are chunked so
+    no worker holds more than the budget and one giant org spreads across the
+    pool instead of stalling it. Longest-first ordering keeps the tail short.
+    Lines are weighed by cost, so referenced report files count too.
+    """
+    shards = []
+    for org_id, refs in index.items():
+        chunks: List[List[Tuple[int, int, int, int]]] = [[]]
+        chunk_bytes = 0
+        for ref in refs:
+            if chunks[-1] and chunk_bytes + ref[3] > max_shard_bytes:
+                chunks.append([])
+                chunk_bytes = 0
+            chunks[-1].append(ref)
+            chunk_bytes += ref[3]
+        for number, chunk in enumerate(chunks):
+            shards.append({
+                "org_id": org_id,
+                "refs": chunk,
+                "bytes": sum(ref[3] for ref in chunk),
+                "chunk": number,
+                "chunks": len(chunks),
+            })
+    shards.sort(key=lambda shard: shard["bytes"], reverse=True)
+    return shards
+
+
+def _spill_line(f, offset: int, length: int) -> str:
+    """Copy one oversized export line to a temporary file for streaming ingestion"""
+    import tempfile
+
+    f.seek(offset)
+    fd, path = tempfile.mkstemp(suffix=".json", prefix="org-shard-")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            remaining = length
+            while remaining:
+                block = f.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not block:
+                    break
+                out.write(block)
+                remaining -= len(block)
+    except OSError:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _validate_org_shard(task: Tuple[str, str, List[Tuple[int, int, int, int]], int, str]) -> Dict[str, Any]:
+    """Validate one shard of an org's export lines; runs inside worker processes"""
+    export_path, org_id, refs, max_line_bytes, backend = task
+    if backend != _backend:
+        set_backend(backend)
+    base_dir = os.path.dirname(export_path)
+    reports = []
+    spilled = 0
+    with open(export_path, 'rb') as f:
+        for line_number, offset, length, cost in refs:
+            spill_path = None
+            try:
+                if length > max_line_bytes:
+                    # Streamed arrays stay in the spill file, bounding memory by the stream buffer
+                    spill_path = _spill_line(f, offset, length)
+                    spilled += 1
+                    streamed = [("data",) + path for path in STREAMED_ARRAYS]
+                    request = load_report_streaming(spill_path, streamed=streamed)
+                else:
+                    f.seek(offset)
+                    request = json.loads(f.read(length))
+                if isinstance(request.get("file"), str):
+                    request["file"] = os.path.join(base_dir, request["file"])
+                    # A referenced report over the budget is streamed like a spilled line
+                    request["stream"] = request.get("stream") or cost - length > max_line_bytes
+                outcome = handle_request(request)
+            except (ValueError, AttributeError) as e:
+                outcome = {"report_type": None, "valid": False, "error": f"Invalid JSON: {e}"}
+            except OSError as e:
+                # A full or unwritable temp dir fails this line, not the whole run
+                outcome = {"report_type": None, "valid": False, "error": f"Cannot spill line: {e}"}
+            finally:
+                if spill_path:
+                    os.unlink(spill_path)
+            outcome.pop("id", None)
+            outcome["line"] = line_number
+            # Passing reports keep only their verdict so thousands of orgs merge in bounded memory
+            if outcome["valid"]:
+                outcome.pop("result", None)
+            reports.append(outcome)
+    return {"org_id": org_id, "reports": reports, "spilled_lines": spilled}
+
+
+def run_org_shards(
+    export_path: str,
+    workers: Optional[int] = None,
+    max_shard_bytes: int = DEFAULT_SHARD_BYTES,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Validate a multi-org NDJSON export sharded by orgId across a process pool.
+
+    Args:
+        export_path: NDJSON with one {"orgId", "report_type", "data"|"file"} per line
+        workers: Worker processes (default: available cores)
+        max_shard_bytes: Per-shard byte budget, counting referenced files; larger
+                         orgs are chunked, larger lines are spilled to disk and
+                         streamed, and larger referenced files are streamed
+        backend: Aggregation backend for each worker (default: current backend)
+
+    Returns:
+        Summary with per-org counts, failing reports and overall validity
+    """
+    shards = plan_org_shards(index_org_export(export_path), max_shard_bytes)
+    workers = max(1, min(workers or _available_cores(), len(shards) or 1))
+    tasks = [
+        (export_path, shard["org_id"], shard["refs"], max_shard_bytes, backend or _backend)
+        for shard in shards
+    ]
+
+    organizations: Dict[str, Dict[str, Any]] = {}
+    for shard in shards:
+        org = organizations.setdefault(shard["org_id"], {"bytes": 0, "chunks": shard["chunks"], "reports": []})
+        org["bytes"] += shard["bytes"]
+
+    def merge(part: Dict[str, Any]) -> None:
+        org = organizations[part["org_id"]]
+        org["reports"].extend(part["reports"])
+        org["spilled_lines"] = org.get("spilled_lines", 0) + part["spilled_lines"]
+
+    if workers == 1:
+        for task in tasks:
+            merge(_validate_org_shard(task))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Submitted largest first; results merge as they finish
+            futures = [executor.submit(_validate_org_shard, task) for task in tasks]
+            for future in as_completed(futures):
+                merge(future.result())
+
+    totals = {"total": 0, "passed": 0, "failed": 0, "errors": 0}
+    for org in organizations.values():
+        reports = org.pop("reports")
+        reports.sort(key=lambda report: report["line"])
+        errors = sum(1 for report in reports if "error" in report)
+        passed = sum(1 for report in reports if report["valid"])
+        org.update(
+            valid=passed == len(reports),
+            total=len(reports),
+            passed=passed,
+            failed=len(reports) - passed - errors,
+            errors=errors,
+            problems=[report for report in reports if not report["valid"]],
+        )
+        for key in totals:
+            totals[key] += org[key]
+
+    return {
+        "valid": totals["passed"] == totals["total"],
+        "orgs": len(organizations),
+        **totals,
+        "workers": workers,
+        "shards": len(shards),
+        "organizations": organizations,
+    }
+
+
+class _ServerShutdown(Exception):
+    """Raised by the SIGTERM/SIGINT handler to stop accepting requests"""
+
+
+def _raise_server_shutdown(signum, frame):
+    raise _ServerShutdown()
+
+
+def _init_server_worker(backend: str) -> None:
+    """Worker process setup: the parent handles Ctrl-C and drains, so workers ignore it"""
+    import signal
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    set_backend(backend)
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate one daemon request.
+
+    Args:
+        request: {"id", "report_type", "data"} or {"id", "report_type", "file"}
+
+    Returns:
+        Response echoing id and report_type with valid plus result or error
+    """
+    report_type = request.get("report_type")
+    response = {"id": request.get("id"), "report_type": report_type}
+    if report_type not in validators:
+        response.update(valid=False, error=f"Unknown report type '{report_type}'")
+        return response
+    try:
+        if "data" in request:
+            data = request["data"]
+        else:
+            data = load_report(request["file"], stream=bool(request.get("stream")))
+        result = validators[report_type](data)
+    except Exception as e:
+        response.update(valid=False, error=f"{type(e).__name__}: {e}")
+    else:
+        response.update(valid=bool(result["valid"]), result=result)
+    return response
+
+
+class ValidationServer:
+    """
+    Resident validator accepting newline-delimited JSON requests.
+
+    Requests run concurrently on a worker pool and responses are written as
+    they complete, tagged with the request id. {"op": "shutdown"} or end of
+    input stops intake; close() drains in-flight work.
+    """
+
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        self.workers = max(1, workers or _available_cores())
+        if self.workers == 1:
+            # A single worker gains nothing from a process hop
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_server_worker,
+                initargs=(backend or _backend,),
+            )
+
+    def submit(self, line: str, write) -> Any:
+        """
+        Dispatch one request line.
+
+        Returns:
+            The pending future, None for blank or invalid lines, or False for a shutdown request
+        """
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            write({"id": None, "valid": False, "error": f"Invalid request: {e}"})
+            return None
+        if request.get("op") == "shutdown":
+            return False
+        future = self.executor.submit(handle_request, request)
+        future.add_done_callback(lambda done: write(self._response(done, request)))
+        return future
+
+    @staticmethod
+    def _response(future, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            return {"id": request.get("id"), "report_type": request.get("report_type"),
+                    "valid": False, "error": f"{type(e).__name__}: {e}"}
+
+    def close(self) -> None:
+        """Wait for in-flight requests, then stop the pool"""
+        self.executor.shutdown(wait=True)
+
+
+def serve_stdin(server: ValidationServer, stdin=None, stdout=None) -> None:
+    """Serve NDJSON requests from stdin, streaming responses to stdout"""
+    import signal
+    import threading
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    lock = threading.Lock()
+
+    def write(response: Dict[str, Any]) -> None:
+        with lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+    signal.signal(signal.SIGTERM, _raise_server_shutdown)
+    signal.signal(signal.SIGINT, _raise_server_shutdown)
+    try:
+        for line in stdin:
+            if server.submit(line, write) is False:
+                break
+    except _ServerShutdown:
+        pass
+    finally:
+        server.close()
+
+
+def serve_socket(server: ValidationServer, socket_path: str) -> None:
+    """Serve NDJSON requests on a local Unix socket; one response stream per connection"""
+    import signal
+    import socket
+    import socketserver
+    import stat
+    import threading
+    from concurrent.futures import wait
+
+    connections = set()
+    connections_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            with connections_lock:
+                connections.add(self.connection)
+            write_lock = threading.Lock()
+            pending = []
+
+            def write(response: Dict[str, Any]) -> None:
+                with write_lock:
+                    try:
+                        self.wfile.write((json.dumps(response) + "\n").encode())
+                        self.wfile.flush()
+                    except OSError:
+                        # Client went away; its remaining responses are dropped
+                        pass
+
+            try:
+                for raw in self.rfile:
+                    future = server.submit(raw.decode(), write)
+                    if future is False:
+                        threading.Thread(target=unix_server.shutdown).start()
+                        break
+                    if future is not None:
+                        pending.append(future)
+            except OSError:
+                pass
+            finally:
+                wait(pending)
+                with connections_lock:
+                    connections.discard(self.connection)
+
+    if os.path.exists(socket_path):
+        if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            raise FileExistsError(f"{socket_path} exists and is not a socket")
+        os.remove(socket_path)
+
+    unix_server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    unix_server.daemon_threads = False
+
+    def request_shutdown(signum, frame):
+        threading.Thread(target=unix_server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+    try:
+        unix_server.serve_forever()
+    finally:
+        # Stop reading from open connections so their handlers drain and return
+        with connections_lock:
+            for connection in connections:
+                try:
+                    connection.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+        unix_server.server_close()
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def _parse_bucket_edges(value: str) -> List[int]:
+    """Parse "30,60,90" into ascending bucket edges"""
+    import argparse
+
+    try:
+        edges = [int(edge) for edge in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid bucket edges '{value}'")
+    if not edges or edges != sorted(set(edges)) or edges[0] < 0:
+        raise argparse.ArgumentTypeError(f"bucket edges must be ascending non-negative days, got '{value}'")
+    return edges
+
+
+def _parse_burn_windows(value: str) -> List[int]:
+    """Parse "3,6,12" into distinct positive trailing windows in months"""
+    import argparse
+
+    try:
+        windows = [int(window) for window in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid burn windows '{value}'")
+    if not windows or min(windows) < 1 or len(set(windows)) != len(windows):
+        raise argparse.ArgumentTypeError(f"burn windows must be distinct positive months, got '{value}'")
+    return windows
+
+
+def _start_profiling(args) -> None:
+    """Enable metrics and stack sampling for this run; results are written at exit"""
+    metrics = enable_metrics(trace_memory=args.profile)
+    sampler = StackSampler(args.profile_interval / 1000).start() if args.profile_stacks else None
+
+    def finish():
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(args.profile_stacks)
+        document = metrics.to_dict()
+        if args.metrics_out:
+            with open(args.metrics_out, 'w') as f:
+                json.dump(document, f, indent=2)
+        elif args.profile:
+            print(json.dumps(document, indent=2), file=sys.stderr)
+
+    # Every mode ends in sys.exit, which still runs atexit hooks
+    atexit.register(finish)
+
+
 def main():
     """Main validation function"""
-    if len(sys.argv) < 3:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Validate report calculations",
+        usage="python validate_report_calculations.py [options] <report_type> <json_file>",
+        epilog="Report types: pnl, balance_sheet, cash_flow, trial_balance, burn_rate, ar, ap",
+    )
+    parser.add_argument("report_type", nargs="?", help="Report type to validate")
+    parser.add_argument("json_file", nargs="?", help="Report JSON file")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream large arrays (entries, items, customers) instead of loading them into memory")
+    parser.add_argument("--backend", type=str, default="python", choices=BACKENDS,
+                        help="Aggregation backend; numpy falls back to python when NumPy is missing")
+    parser.add_argument("--to-columns", type=str, default=None, metavar="OUT_DIR",
+                        help="Convert json_file to a memory-mapped columnar report directory and exit; "
+                             "pass OUT_DIR in place of a JSON file to validate without parsing")
+    parser.add_argument("--all", type=str, default=None, metavar="BUNDLE",
+                        help="Validate every report in a bundle JSON keyed by report type, "
+                             "plus cross-report consistency checks")
+    parser.add_argument("--batch", type=str, default=None, metavar="SOURCE",
+                        help="Validate a directory, glob, or NDJSON manifest of reports; "
+                             "report_type (optional) is used for files whose name does not identify one")
+    parser.add_argument("--orgs", type=str, default=None, metavar="EXPORT",
+                        help="Validate a multi-org NDJSON export of {orgId, report_type, data|file} lines "
+                             "(files relative to the export), sharded by org across worker processes")
+    parser.add_argument("--max-shard-bytes", type=int, default=DEFAULT_SHARD_BYTES, metavar="BYTES",
+                        help="With --orgs, per-worker byte budget counting referenced files; larger orgs "
+                             "are chunked and larger lines or files streamed from disk (default: 64 MiB)")
+    parser.add_argument("--burn-rates", type=str, default=None, metavar="SOURCE",
+                        help="Validate many burn_rate reports at once from a JSON object keyed by org "
+                             "or a multi-org NDJSON export")
+    parser.add_argument("--burn-windows", type=_parse_burn_windows, default=None, metavar="MONTHS",
+                        help="With --burn-rates, add per-org trailing burn/runway and month-over-month "
+                             "growth series for these windows (e.g. 3,6,12)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Batch, org-shard or server worker processes (default: available cores)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Stay resident and validate NDJSON {report_type, data|file} requests from stdin")
+    parser.add_argument("--socket", type=str, default=None, metavar="PATH",
+                        help="With --serve, listen on this local Unix socket instead of stdin")
+    parser.add_argument("--summary-out", type=str, default=None,
+                        help="Write the batch, org or burn-rate summary JSON to this file instead of stdout")
+
+    parser.add_argument("--as-of", type=float, default=None, metavar="MS",
+                        help="Aging as-of date in epoch milliseconds for ar/ap (default: now)")
+    parser.add_argument("--aging-buckets", type=_parse_bucket_edges, default=None, metavar="EDGES",
+                        help="Comma-separated aging bucket edges in days (default: 30,60,90)")
+    parser.add_argument("--ledger", type=str, default=None, metavar="LEDGER",
+                        help="Rebuild the report from a raw accounts/entries_final/entry_lines export "
+                             "(JSON file or sliced ledger directory) and compare it with json_file")
+    parser.add_argument("--checkpoint", type=str, default=None, metavar="DB",
+                        help="SQLite checkpoint store; with a ledger directory only new or changed slices are parsed")
+    parser.add_argument("--localize", action="store_true",
+                        help="With --ledger, when a trial_balance or balance_sheet mismatches, descend "
+                             "account -> month -> entry and rank the culprits")
+    parser.add_argument("--max-culprits", type=int, default=DEFAULT_MAX_CULPRITS,
+                        help="With --localize, maximum culprits reported (default: 50)")
+    parser.add_argument("--periods", choices=PERIOD_KINDS, default=None,
+                        help="With a --ledger JSON file, also rebuild P&L per period into by_period")
+    parser.add_argument("--timezone", type=str, default=None,
+                        help="With --periods, IANA timezone whose local midnights bound the periods (default: UTC)")
+    parser.add_argument("--fiscal-year-start", type=int, default=FISCAL_YEAR_START, metavar="MONTH",
+                        help="With --periods fiscal_year, month (1-12) fiscal years start in (default: 1)")
+    parser.add_argument("--org", type=str, default=None,
+                        help="Organization key for checkpoints (default: orgId in accounts.json or directory name)")
+    parser.add_argument("--metrics-out", type=str, default=None, metavar="PATH",
+                        help="Write per-phase and per-calculator metrics (wall/CPU time, peak RSS, rows) as JSON")
+    parser.add_argument("--profile", action="store_true",
+                        help="Collect metrics with tracemalloc peaks; printed to stderr unless --metrics-out is given")
+    parser.add_argument("--profile-stacks", type=str, default=None, metavar="PATH",
+                        help="Sample the main thread and write collapsed stacks (flamegraph input) to PATH")
+    parser.add_argument("--profile-interval", type=float, default=5.0, metavar="MS",
+                        help="Stack sampling interval in milliseconds (default: 5)")
+
+    args = parser.parse_args()
+    set_backend(args.backend)
+    if args.metrics_out or args.profile or args.profile_stacks:
+        _start_profiling(args)
+
+    if args.serve:
+        server = ValidationServer(workers=args.workers, backend=_backend)
+        if args.socket:
+            serve_socket(server, args.socket)
+        else:
+            serve_stdin(server)
+        sys.exit(0)
+
+    if args.all:
+        current_file = args.all
+        try:
+            with _phase("load"):
+                bundle = load_bundle(args.all, stream=args.stream)
+            ledger = None
+            ledger_dir = None
+            if args.ledger:
+                current_file = args.ledger
+                if os.path.isdir(args.ledger) and not is_column_dir(args.ledger):
+                    if args.checkpoint:
+                        ledger_dir = args.ledger
+                    else:
+                        ledger = load_ledger_dir(args.ledger)
+                else:
+                    with _phase("load"):
+                        ledger = load_report(args.ledger, stream=args.stream)
+            try:
+                store = CheckpointStore(args.checkpoint) if ledger_dir else None
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            try:
+                result = validate_bundle(bundle, ledger=ledger, ledger_dir=ledger_dir, store=store, org_id=args.org)
+            finally:
+                if store:
+                    store.close()
+        except FileNotFoundError:
+            print(f"Error: File {current_file} not found")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON in {current_file}: {e}")
+            sys.exit(1)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["valid"] else 1)
+
+    if args.orgs:
+        try:
+            summary = run_org_shards(args.orgs, workers=args.workers, max_shard_bytes=args.max_shard_bytes,
+                                     backend=_backend)
+        except OSError as e:
+            print(f"Error: Cannot read org export {args.orgs}: {e}")
+            sys.exit(1)
+        if args.summary_out:
+            with open(args.summary_out, 'w') as f:
+                json.dump(summary, f, indent=2)
+            print(f"Validated {summary['total']} reports across {summary['orgs']} orgs: {summary['passed']} passed, "
+                  f"{summary['failed']} failed, {summary['errors']} errors")
+        else:
+            print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary["valid"] else 1)
+
+    if args.burn_rates:
+        try:
+            with _phase("load"):
+                reports = load_burn_reports(args.burn_rates)
+            with _phase("validate:burn_rates"):
+                summary = validate_burn_rates(reports, windows=args.burn_windows)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Cannot read burn rate reports {args.burn_rates}: {e}")
+            sys.exit(1)
+        if args.summary_out:
+            with open(args.summary_out, 'w') as f:
+                json.dump(summary, f, indent=2)
+            print(f"Validated {summary['total']} burn_rate reports: {summary['passed']} passed, "
+                  f"{summary['failed']} failed")
+        else:
+            print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary["valid"] else 1)
+
+    if args.batch:
+        try:
+            jobs = collect_batch_jobs(args.batch, default_type=args.report_type)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Cannot read batch source {args.batch}: {e}")
+            sys.exit(1)
+        summary = run_batch(jobs, workers=args.workers, stream=args.stream, backend=_backend)
+        if args.summary_out:
+            with open(args.summary_out, 'w') as f:
+                json.dump(summary, f, indent=2)
+            print(f"Validated {summary['total']} reports: {summary['passed']} passed, "
+                  f"{summary['failed']} failed, {summary['errors']} errors")
+        else:
+            print(json.dumps(summary, indent=2))
+        sys.exit(0 if summary["valid"] else 1)
+
+    if args.to_columns:
+        # report_type is optional here, so a single positional is the source file
+        source = args.json_file or args.report_type
+        if not source:
+            print("Usage: python validate_report_calculations.py --to-columns <out_dir> [report_type] <json_file>")
+            sys.exit(1)
+        try:
+            meta = convert_report_to_columns(source, args.to_columns)
+        except FileNotFoundError:
+            print(f"Error: File {source} not found")
+            sys.exit(1)
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError
+            print(f"Error: Cannot convert {source}: {e}")
+            sys.exit(1)
+        print(json.dumps({name: spec["rows"] for name, spec in meta["arrays"].items()}, indent=2))
+        sys.exit(0)
+
+    if not args.report_type or not args.json_file:
         print("Usage: python validate_report_calculations.py <report_type> <json_file>")
         print("Report types: pnl, balance_sheet, cash_flow, trial_balance, burn_rate, ar, ap")
         sys.exit(1)
     
-    report_type = sys.argv[1]
-    json_file = sys.argv[2]
+    report_type = args.report_type
+    json_file = args.json_file
     
-    try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File {json_file} not found")
+    if args.ledger and report_type not in LEDGER_REPORT_TYPES:
+        print(f"Error: Report type '{report_type}' cannot be rebuilt from a ledger")
+        print(f"Available types: {', '.join(LEDGER_REPORT_TYPES.keys())}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in {json_file}: {e}")
+    if args.localize and (not args.ledger or LEDGER_REPORT_TYPES.get(report_type) not in LOCALIZABLE_REPORT_TYPES):
+        print("Error: --localize needs --ledger and a trial_balance or balance_sheet report")
         sys.exit(1)
-    
-    validators = {
-        "pnl": validate_profit_loss,
-        "profit_loss": validate_profit_loss,
-        "balance_sheet": validate_balance_sheet,
-        "trial_balance": validate_trial_balance,
-        "burn_rate": validate_burn_rate,
-        "ar": validate_accounts_receivable,
-        "accounts_receivable": validate_accounts_receivable,
-    }
-    
+    periods = None
+    if args.periods or args.timezone:
+        if not args.ledger or os.path.isdir(args.ledger):
+            # Checkpointed ledger slices are aggregated by UTC month
+            print("Error: --periods and --timezone need --ledger with a ledger JSON file")
+            sys.exit(1)
+        try:
+            periods = period_index(args.periods or "month", args.timezone or "UTC", args.fiscal_year_start)
+            if LEDGER_REPORT_TYPES[report_type] == "burn_rate" and periods.kind != "month":
+                raise ValueError("burn_rate is validated by month; use --periods month")
+        except (ValueError, ImportError) as e:
+            # ImportError: time_core.TimezoneSupportError, no zoneinfo or pytz for the zone
+            print(f"Error: {e}")
+            sys.exit(1)
     if report_type not in validators:
         print(f"Error: Unknown report type '{report_type}'")
         print(f"Available types: {', '.join(validators.keys())}")
         sys.exit(1)
     
-    validator = validators[report_type]
-    result = validator(data)
+    current_file = json_file
+    try:
+        with _phase("load"):
+            data = load_report(json_file, stream=args.stream)
+        if report_type in AGING_REPORT_TYPES:
+            if args.as_of is not None:
+                data["asOfDate"] = args.as_of
+            if args.aging_buckets:
+                data["agingBucketEdges"] = args.aging_buckets
+        if args.ledger:
+            current_file = args.ledger
+            ledger = None
+            with _phase(f"ledger:{report_type}"):
+                if os.path.isdir(args.ledger) and not is_column_dir(args.ledger):
+                    try:
+                        store = CheckpointStore(args.checkpoint) if args.checkpoint else None
+                    except ValueError as e:
+                        print(f"Error: {e}")
+                        sys.exit(1)
+                    try:
+                        result = validate_ledger_dir(args.ledger, {report_type: data}, store=store, org_id=args.org)
+                    finally:
+                        if store:
+                            store.close()
+                else:
+                    ledger = load_report(args.ledger, stream=args.stream)
+                    result = validate_against_ledger(ledger, {report_type: data}, periods=periods)
+            if args.localize and not result["valid"]:
+                with _phase("localize"):
+                    if ledger is None:
+                        ledger = load_ledger_dir(args.ledger)
+                    result["localization"] = localize_report(ledger, report_type, data, max_culprits=args.max_culprits)
+        else:
+            # Streamed arrays are parsed while the validator runs, so decode errors surface here too
+            with _phase(f"validate:{report_type}"):
+                result = validators[report_type](data)
+    except FileNotFoundError:
+        print(f"Error: File {current_file} not found")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in {current_file}: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: Invalid data in {current_file}: {e}")
+        sys.exit(1)
     
     print(json.dumps(result, indent=2))
     
@@ -348,4 +4194,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-